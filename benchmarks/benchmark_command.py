@@ -0,0 +1,118 @@
+"""
+Command line interface for the render benchmarks.
+
+The BenchmarkCommand class parses the arguments of the 'benchmark'
+command, builds the grid of synthetic cases from the requested
+layer counts, modifier counts, resolutions and keyframe densities,
+runs them headlessly, writes the results to a JSON file, and
+optionally compares them with a baseline, failing on regressions.
+"""
+
+from pathlib import Path
+import argparse
+import itertools
+
+from benchmarks.benchmark_runner import BenchmarkRunner
+from benchmarks.synthetic_project import BenchmarkCase, SyntheticProject
+from core.entities.gl_context import GLContext
+from core.services.modifier_service import ModifierService
+
+
+class BenchmarkCommand:
+    """Command line interface for the render benchmarks."""
+
+    @staticmethod
+    def _integer_list(text: str) -> list[int]:
+        """Parse comma separated integers, such as '1,8,32'."""
+        return [int(_item) for _item in text.split(",") if _item]
+
+    @staticmethod
+    def _resolution_list(text: str) -> list[tuple[int, int]]:
+        """Parse comma separated resolutions, such as '640x360'."""
+        _resolutions = []
+        for _item in text.split(","):
+            if not _item:
+                continue
+            _width, _, _height = _item.lower().partition("x")
+            _resolutions.append((int(_width), int(_height)))
+        return _resolutions
+
+    @classmethod
+    def get_parser(cls) -> argparse.ArgumentParser:
+        """Return the parser of the command arguments."""
+        _parser = argparse.ArgumentParser(
+            prog="main.py benchmark",
+            description="Render synthetic sequences without the GUI, "
+                        "and report their performance.")
+        _parser.add_argument("--layers", type=cls._integer_list,
+                             default=[1, 8, 32],
+                             help="comma separated numbers of layers")
+        _parser.add_argument("--modifiers", type=cls._integer_list,
+                             default=[0, 4],
+                             help="comma separated numbers of "
+                                  "modifiers per layer")
+        _parser.add_argument("--resolutions", type=cls._resolution_list,
+                             default=[(1280, 720), (1920, 1080)],
+                             help="comma separated resolutions, "
+                                  "such as '1920x1080'")
+        _parser.add_argument("--keyframes", type=cls._integer_list,
+                             default=[0, 10],
+                             help="comma separated numbers of keyframes "
+                                  "per animated parameter")
+        _parser.add_argument("--frames", type=int, default=60,
+                             help="number of frames rendered per case")
+        _parser.add_argument("--modifier-cycle", type=str, default=None,
+                             help="comma separated modifiers applied in "
+                                  "turn to the layers")
+        _parser.add_argument("--output", type=Path,
+                             default=Path("benchmark.json"),
+                             help="JSON file in which to write results")
+        _parser.add_argument("--compare", type=Path, default=None,
+                             help="JSON file of baseline results")
+        _parser.add_argument("--threshold", type=float, default=.1,
+                             help="relative growth of frame times "
+                                  "considered a regression")
+        _parser.add_argument("--backend", type=str, default=None,
+                             help="moderngl backend, such as 'egl'")
+        return _parser
+
+    @classmethod
+    def run(cls, arguments: list[str]) -> int:
+        """Run the command and return its exit code.
+
+        The exit code is 2 when results regress against the baseline.
+        """
+        _arguments = cls.get_parser().parse_args(arguments)
+        if _arguments.backend is not None:
+            GLContext.set_backend(_arguments.backend)
+
+        ModifierService.load_modifiers_from_directory()
+        _name_ids = None
+        if _arguments.modifier_cycle is not None:
+            _name_ids = tuple(_arguments.modifier_cycle.split(","))
+        _modifier_cycle = SyntheticProject.get_modifier_cycle(_name_ids)
+        if not _modifier_cycle and max(_arguments.modifiers) > 0:
+            print("No usable modifier loaded, layers get no modifiers")
+
+        _cases = [BenchmarkCase(_layers, _modifiers, _width, _height,
+                                _keyframes, _arguments.frames)
+                  for (_layers, _modifiers, (_width, _height),
+                       _keyframes) in itertools.product(
+                      _arguments.layers, _arguments.modifiers,
+                      _arguments.resolutions, _arguments.keyframes)]
+        _results = BenchmarkRunner.run_cases(_cases, _modifier_cycle)
+        BenchmarkRunner.save_results(_results, _arguments.output)
+        print(f"Wrote results of {len(_cases)} cases "
+              f"to '{_arguments.output}'")
+
+        if _arguments.compare is None:
+            return 0
+        _baseline = BenchmarkRunner.load_results(_arguments.compare)
+        _regressions = BenchmarkRunner.compare_results(
+            _results, _baseline, _arguments.threshold)
+        for _regression in _regressions:
+            print(f"Regression {_regression}")
+        if _regressions:
+            return 2
+        print(f"No regression against '{_arguments.compare}'")
+        return 0
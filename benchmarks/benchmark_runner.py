@@ -0,0 +1,153 @@
+"""
+Runner of the render benchmarks.
+
+The BenchmarkRunner class renders the frames of synthetic sequences
+on the standalone moderngl context of the calling thread, waiting
+for the GPU after each frame, and reports the throughput, the
+percentiles of the frame times, and the peak memory of the texture
+pool. Results are saved to JSON files, and compared against a
+baseline to flag the cases whose frame times regressed.
+"""
+
+from typing import Callable
+from pathlib import Path
+import json
+import platform
+import time
+
+from benchmarks.synthetic_project import BenchmarkCase, SyntheticProject
+from core.entities.gl_context import GLContext
+from core.services.modifier_service import ModifierService
+from core.services.render_service import RenderService
+
+
+class BenchmarkRunner:
+    """Runner of the render benchmarks."""
+
+    COMPARED_METRICS: tuple[str, ...] = ("ms_p50", "ms_p90")
+
+    @staticmethod
+    def get_percentile(sorted_values: list[float],
+                       percentile: float) -> float:
+        """Return a percentile of sorted values, interpolating."""
+        if not sorted_values:
+            return 0.
+        _position = (len(sorted_values)-1)*percentile/100
+        _index = int(_position)
+        _next_index = min(_index+1, len(sorted_values)-1)
+        _t = _position - _index
+        return ((1-_t)*sorted_values[_index]
+                + _t*sorted_values[_next_index])
+
+    @classmethod
+    def run_case(cls,
+                 case: BenchmarkCase,
+                 modifier_cycle: list[str],
+                 warm_up_frames: int = 2) -> dict:
+        """Render the frames of a case and return its measures.
+
+        The first frames compile shaders and fill the texture pool,
+        so they are rendered again but not measured.
+        """
+        _sequence = SyntheticProject.build_sequence(case, modifier_cycle)
+        _gl_context = GLContext.get_context()
+        ModifierService.warm_up_all_shaders(_sequence.get_image_format())
+        _texture_pool = GLContext.get_texture_pool()
+
+        _frames = range(case.get_frame_count())
+        for _frame in _frames[:warm_up_frames]:
+            RenderService.release_texture(
+                RenderService.render_sequence_frame(_sequence, _frame))
+        _gl_context.finish()
+        _texture_pool.reset_stats()
+
+        _frame_times = []
+        _start_time = time.perf_counter()
+        for _frame in _frames:
+            _frame_start = time.perf_counter()
+            _texture = RenderService.render_sequence_frame(_sequence,
+                                                           _frame)
+            _gl_context.finish()
+            _frame_times.append(time.perf_counter() - _frame_start)
+            RenderService.release_texture(_texture)
+        _elapsed = time.perf_counter() - _start_time
+        _pool_stats = _texture_pool.get_stats()
+
+        RenderService.clear_layer_cache()
+        _texture_pool.clear()
+        _milliseconds = sorted(1000*_time for _time in _frame_times)
+        return {"case": case.to_dict(),
+                "fps": len(_frame_times)/_elapsed if _elapsed > 0 else 0.,
+                "ms_mean": sum(_milliseconds)/max(1, len(_milliseconds)),
+                "ms_p50": cls.get_percentile(_milliseconds, 50),
+                "ms_p90": cls.get_percentile(_milliseconds, 90),
+                "ms_p99": cls.get_percentile(_milliseconds, 99),
+                "ms_max": _milliseconds[-1] if _milliseconds else 0.,
+                "peak_texture_bytes": _pool_stats["peak_bytes"],
+                "texture_allocations": _pool_stats["allocation_count"]}
+
+    @classmethod
+    def run_cases(cls,
+                  cases: list[BenchmarkCase],
+                  modifier_cycle: list[str],
+                  report: Callable[[str], None] = print) -> dict:
+        """Run each case and return the results of the whole run."""
+        _gl_context = GLContext.get_context()
+        _results = {"machine": {"platform": platform.platform(),
+                                "python": platform.python_version(),
+                                "renderer": _gl_context.info.get(
+                                    "GL_RENDERER", "unknown")},
+                    "modifiers": modifier_cycle,
+                    "cases": dict()}
+        for _case in cases:
+            _result = cls.run_case(_case, modifier_cycle)
+            _results["cases"][_case.get_name()] = _result
+            report(f"{_case.get_name():<32}{_result['fps']:>9.1f} fps"
+                   f"{_result['ms_p50']:>9.2f} ms p50"
+                   f"{_result['ms_p99']:>9.2f} ms p99"
+                   f"{_result['peak_texture_bytes']/1024**2:>9.1f} MB")
+        return _results
+
+    @staticmethod
+    def save_results(results: dict, path: Path):
+        """Write results to a JSON file."""
+        with open(path, "w") as _file:
+            json.dump(results, _file, indent=2)
+
+    @staticmethod
+    def load_results(path: Path) -> dict:
+        """Read results from a JSON file."""
+        with open(path) as _file:
+            return json.load(_file)
+
+    @classmethod
+    def compare_results(cls,
+                        results: dict,
+                        baseline: dict,
+                        threshold: float = .1) -> list[str]:
+        """Return the regressions of results against a baseline.
+
+        A case regresses when one of its compared frame times grows by
+        more than the threshold, relative to the baseline, or when its
+        peak texture memory grows. Cases missing from either side are
+        ignored.
+        """
+        _regressions = []
+        for _name, _result in results["cases"].items():
+            _reference = baseline["cases"].get(_name)
+            if _reference is None:
+                continue
+            for _metric in cls.COMPARED_METRICS:
+                _before = _reference[_metric]
+                _after = _result[_metric]
+                if _before > 0 and _after > _before*(1+threshold):
+                    _regressions.append(
+                        f"{_name}: {_metric} {_before:.2f} -> "
+                        f"{_after:.2f} ms (+{100*(_after/_before-1):.0f}%)")
+            _before = _reference["peak_texture_bytes"]
+            _after = _result["peak_texture_bytes"]
+            if _after > _before:
+                _regressions.append(
+                    f"{_name}: peak texture memory "
+                    f"{_before/1024**2:.1f} -> {_after/1024**2:.1f} MB")
+        return _regressions
@@ -0,0 +1,179 @@
+"""
+Synthetic projects rendered by the benchmarks.
+
+The BenchmarkCase class describes a synthetic sequence by its number
+of layers, its number of modifiers per layer, its resolution and its
+keyframe density, and the SyntheticProject class builds it through
+the services of the core package, as a project script would. Built
+sequences are deterministic, such that results of different runs of
+the same case can be compared.
+"""
+
+from core.entities.sequence import Sequence
+from core.entities.solid_layer import SolidLayer
+from core.entities.keyframe import Keyframe
+from core.entities.modifier_template import ModifierFlag
+from core.entities.modifier_repository import ModifierRepository
+from core.entities.parameter import Parameter
+from core.services.animation_service import AnimationService
+from core.services.layer_service import LayerService
+from core.services.modifier_service import ModifierService
+from data_types.color import Color
+from data_types.integer import Integer
+from data_types.ndarray import NDArray
+from data_types.number import Number
+from data_types.vector2 import Vector2
+
+
+class BenchmarkCase:
+    """Description of a synthetic sequence to benchmark."""
+
+    _layer_count: int
+    _modifier_count: int
+    _width: int
+    _height: int
+    _keyframe_count: int
+    _frame_count: int
+
+    def __init__(self,
+                 layer_count: int,
+                 modifier_count: int,
+                 width: int,
+                 height: int,
+                 keyframe_count: int,
+                 frame_count: int):
+        self._layer_count = layer_count
+        self._modifier_count = modifier_count
+        self._width = width
+        self._height = height
+        self._keyframe_count = keyframe_count
+        self._frame_count = frame_count
+
+    def get_name(self) -> str:
+        """Return the name identifying the case in results."""
+        return (f"{self._layer_count}L_{self._modifier_count}M_"
+                f"{self._width}x{self._height}_{self._keyframe_count}K")
+
+    def get_layer_count(self) -> int:
+        """Return the number of layers."""
+        return self._layer_count
+
+    def get_modifier_count(self) -> int:
+        """Return the number of modifiers of each layer."""
+        return self._modifier_count
+
+    def get_width(self) -> int:
+        """Return the width of the sequence."""
+        return self._width
+
+    def get_height(self) -> int:
+        """Return the height of the sequence."""
+        return self._height
+
+    def get_keyframe_count(self) -> int:
+        """Return the number of keyframes of each animated parameter.
+
+        Below 2, parameters are not animated, and layers are rendered
+        once then reused from the layer cache.
+        """
+        return self._keyframe_count
+
+    def get_frame_count(self) -> int:
+        """Return the number of frames to render."""
+        return self._frame_count
+
+    def to_dict(self) -> dict:
+        """Return the description of the case, such as for JSON."""
+        return {"layers": self._layer_count,
+                "modifiers": self._modifier_count,
+                "width": self._width,
+                "height": self._height,
+                "keyframes": self._keyframe_count,
+                "frames": self._frame_count}
+
+
+class SyntheticProject:
+    """Builder of the synthetic projects rendered by the benchmarks."""
+
+    DEFAULT_MODIFIERS: tuple[str, ...] = ("exposure", "box_blur",
+                                          "simple_noise", "unmultiply")
+
+    @classmethod
+    def get_modifier_cycle(cls,
+                           name_ids: tuple[str, ...] = None
+                           ) -> list[str]:
+        """Return the modifiers applied in turn to the layers.
+
+        Unloaded modifiers are left out, as are WRITEONLY ones, which
+        would discard the modifiers before them.
+        """
+        if name_ids is None:
+            name_ids = cls.DEFAULT_MODIFIERS
+        _repository = ModifierRepository.get_repository()
+        return [_name_id for _name_id in name_ids
+                if _name_id in _repository
+                and ModifierFlag.WRITEONLY
+                not in _repository[_name_id].get_flags()]
+
+    @classmethod
+    def build_sequence(cls,
+                       case: BenchmarkCase,
+                       modifier_cycle: list[str]) -> Sequence:
+        """Build the sequence of a benchmark case.
+
+        Layers are stacked over the whole duration, each smaller and
+        more transparent than the one below, such that all of them
+        are visible and composited.
+        """
+        _duration = case.get_frame_count()
+        _sequence = Sequence(case.get_name(), case.get_width(),
+                             case.get_height(), _duration, 60)
+        _modifier_index = 0
+        for _index in range(case.get_layer_count()):
+            _shrink = 1 - .5*_index/max(1, case.get_layer_count())
+            _layer = SolidLayer(
+                f"Layer {_index}", 0, _duration,
+                Integer(round(case.get_width()*_shrink)),
+                Integer(round(case.get_height()*_shrink)),
+                Color(float(_index % 3 == 0), float(_index % 3 == 1),
+                      float(_index % 3 == 2), .5 + .5/(_index+1)))
+            LayerService.add_layer_to_sequence(_layer, _sequence)
+            for _ in range(case.get_modifier_count()):
+                if not modifier_cycle:
+                    break
+                _modifier = ModifierService.modifier_from_template(
+                    modifier_cycle[_modifier_index % len(modifier_cycle)])
+                ModifierService.add_modifier_to_layer(_modifier, _layer)
+                _modifier_index += 1
+                for _parameter in _modifier.get_parameter_list():
+                    cls.animate_parameter(_parameter, case)
+            cls.animate_parameter(_layer.get_property_parameter("position"),
+                                  case, Vector2(.05, -.05))
+            cls.animate_parameter(_layer.get_property_parameter("rotation"),
+                                  case, Number(10))
+        return _sequence
+
+    @staticmethod
+    def animate_parameter(parameter: Parameter,
+                          case: BenchmarkCase,
+                          offset: NDArray = None):
+        """Spread the keyframes of a case over a numeric parameter.
+
+        Keyframes alternate between the current value and a scaled or
+        offset one, within the bounds of the parameter.
+        """
+        _keyframe_count = case.get_keyframe_count()
+        _value = parameter.get_current_value()
+        if _keyframe_count < 2 or not isinstance(_value, NDArray):
+            return
+        _last_frame = max(1, case.get_frame_count() - 1)
+        for _index in range(_keyframe_count):
+            _frame = round(_index*_last_frame/(_keyframe_count-1))
+            _keyframe_value = _value
+            if _index % 2 == 1:
+                _keyframe_value = (_value*.5 if offset is None
+                                   else _value + offset)
+                _keyframe_value = _keyframe_value.clip(
+                    parameter.get_min_value(), parameter.get_max_value())
+            AnimationService.add_keyframe(
+                parameter, Keyframe(_frame, _keyframe_value))
@@ -0,0 +1,134 @@
+"""
+Command line interface for rendering without the GUI.
+
+The RenderCommand class parses the arguments of the 'render'
+command, loads the modifiers and a project script, and renders
+a range of frames of a sequence to image files on a standalone
+moderngl context, reporting progress and throughput, and optionally
+the time spent in each step of the renders and the OpenGL objects
+left alive.
+"""
+
+from pathlib import Path
+import argparse
+import time
+
+from core.entities.gl_context import GLContext
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from core.entities.render_profiler import RenderProfiler
+from core.services.export_service import ExportService
+from core.services.modifier_service import ModifierService
+from core.services.project_service import ProjectService
+
+
+class RenderCommand:
+    """Command line interface for rendering without the GUI."""
+
+    @staticmethod
+    def get_parser() -> argparse.ArgumentParser:
+        """Return the parser of the command arguments."""
+        _parser = argparse.ArgumentParser(
+            prog="main.py render",
+            description="Render a range of frames of a sequence "
+                        "to PNG files, without the GUI.")
+        _parser.add_argument("project", type=Path,
+                             help="python script building the project")
+        _parser.add_argument("--sequence", type=int, default=0,
+                             help="id of the sequence to render")
+        _parser.add_argument("--start", type=int, default=0,
+                             help="first frame to render")
+        _parser.add_argument("--end", type=int, default=None,
+                             help="frame at which to stop, excluded "
+                                  "(defaults to the sequence duration)")
+        _parser.add_argument("--step", type=int, default=1,
+                             help="number of frames between renders")
+        _parser.add_argument("--threads", type=int, default=1,
+                             help="number of threads writing files")
+        _parser.add_argument("--processes", type=int, default=1,
+                             help="number of processes rendering frames")
+        _parser.add_argument("--output", type=Path, default=Path("render"),
+                             help="directory in which to write frames")
+        _parser.add_argument("--prefix", type=str, default="frame_",
+                             help="prefix of the frame file names")
+        _parser.add_argument("--backend", type=str, default=None,
+                             help="moderngl backend, such as 'egl'")
+        _parser.add_argument("--profile", action="store_true",
+                             help="report the time spent in each step "
+                                  "of the renders, in a single process")
+        _parser.add_argument("--track-gpu", action="store_true",
+                             help="report leaked and remaining OpenGL "
+                                  "objects, in a single process")
+        return _parser
+
+    @staticmethod
+    def print_profile():
+        """Print the time spent in each step of the renders."""
+        _summary = RenderProfiler.get_step_summary()
+        if not _summary:
+            return
+        print(f"{'Step':<48}{'Calls':>8}{'CPU ms':>10}{'GPU ms':>10}")
+        for _entry in _summary:
+            print(f"{_entry['name'][:47]:<48}{_entry['calls']:>8}"
+                  f"{_entry['cpu_ms']:>10.2f}{_entry['gpu_ms']:>10.2f}")
+
+    @staticmethod
+    def print_gpu_resources():
+        """Print the number and memory of the live OpenGL objects."""
+        for _kind, _total in GPUResourceTracker.get_totals().items():
+            print(f"{_kind:<16}{_total['count']:>8} objects"
+                  f"{_total['bytes']/1024**2:>10.1f} MB")
+
+    @classmethod
+    def run(cls, arguments: list[str]) -> int:
+        """Run the command and return its exit code."""
+        _arguments = cls.get_parser().parse_args(arguments)
+        if _arguments.backend is not None:
+            GLContext.set_backend(_arguments.backend)
+
+        ModifierService.load_modifiers_from_directory()
+        ProjectService.load_project_from_file(_arguments.project)
+        _sequence = ProjectService.get_sequence_by_id(_arguments.sequence)
+        if _sequence is None:
+            print(f"No sequence with id {_arguments.sequence} in project")
+            return 1
+
+        _start_time = time.perf_counter()
+
+        def _report_progress(written: int, total: int):
+            _elapsed = time.perf_counter() - _start_time
+            print(f"\rRendered {written}/{total} frames "
+                  f"({written/_elapsed:.2f} fps)", end="", flush=True)
+
+        if _arguments.profile:
+            if _arguments.processes > 1:
+                print("Profiling requires a single process, ignored")
+            else:
+                RenderProfiler.set_enabled()
+                RenderProfiler.clear()
+
+        if _arguments.track_gpu:
+            GPUResourceTracker.set_enabled()
+
+        if _arguments.processes > 1:
+            _frame_count = ExportService.export_frame_range_in_processes(
+                _arguments.project, _arguments.sequence, _arguments.output,
+                _arguments.start, _arguments.end, _arguments.step,
+                _arguments.processes, _arguments.threads, _arguments.prefix,
+                _report_progress)
+        else:
+            ModifierService.warm_up_all_shaders(_sequence.get_image_format())
+            _frame_count = ExportService.export_frame_range(
+                _sequence, _arguments.output, _arguments.start,
+                _arguments.end, _arguments.step, _arguments.threads,
+                _arguments.prefix, _report_progress)
+        _elapsed = time.perf_counter() - _start_time
+        print()
+        if _frame_count > 0:
+            print(f"Rendered {_frame_count} frames in {_elapsed:.2f} s, "
+                  f"{_frame_count/_elapsed:.2f} fps, "
+                  f"{1000*_elapsed/_frame_count:.1f} ms per frame")
+        if RenderProfiler.is_enabled():
+            cls.print_profile()
+        if _arguments.track_gpu and _arguments.processes == 1:
+            cls.print_gpu_resources()
+        return 0
@@ -0,0 +1,270 @@
+"""
+Compiled form of the keyframes of a Parameter.
+
+An AnimationCurve holds what evaluating an animated Parameter would
+otherwise work out again at every frame: the sorted frames of its
+keyframes, searched by bisection, and a segment between each pair of
+consecutive keyframes, whose interpolation type is resolved once.
+Segments keep the raw values of their keyframes as float arrays.
+A Bezier segment also keeps the coefficients of its cubic polynomial
+of values, and the terms of the cubic equation mapping a normalized
+time to the Bezier parameter, which only depend on the influences of
+its handles. Segments evaluate a single time, or whole arrays of
+times at once, such that a curve returns its values over a range of
+frames without a Python call per frame. A curve only stays valid as
+long as the keyframes of its parameter do not change.
+"""
+
+from typing import Type, Union
+from bisect import bisect_right
+import math
+
+import numpy as np
+
+from core.entities.keyframe import Keyframe, KeyframeType
+from data_types.data_type import DataType
+
+
+class CurveSegment:
+    """A segment holding the value of its first keyframe."""
+
+    _start_value: DataType
+    _data_type: Type[DataType]
+    _raw_a: np.ndarray
+
+    def __init__(self, keyframe_a: Keyframe, keyframe_b: Keyframe):
+        self._start_value = keyframe_a.get_value()
+        self._data_type = type(self._start_value)
+        self._raw_a = self.get_raw_array(self._start_value)
+
+    @staticmethod
+    def get_raw_array(value: DataType) -> np.ndarray:
+        """Return the raw value of a DataType as a float array."""
+        return np.asarray(value.get_raw_value(), dtype=np.float64)
+
+    def evaluate(self, t: float) -> DataType:
+        """Return the value at normalized time 0 < t < 1."""
+        return self._start_value
+
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Return the raw values at normalized times, as (T, *shape)."""
+        return np.broadcast_to(self._raw_a, t.shape + self._raw_a.shape)
+
+    def _to_column(self, t: np.ndarray) -> np.ndarray:
+        """Reshape times to broadcast against raw values."""
+        return t.reshape(t.shape + (1,)*self._raw_a.ndim)
+
+
+class LinearSegment(CurveSegment):
+    """A segment interpolating linearly between its keyframes."""
+
+    _raw_b: np.ndarray
+
+    def __init__(self, keyframe_a: Keyframe, keyframe_b: Keyframe):
+        super().__init__(keyframe_a, keyframe_b)
+        self._raw_b = self.get_raw_array(keyframe_b.get_value())
+
+    def evaluate(self, t: float) -> DataType:
+        """Return the value at normalized time 0 < t < 1."""
+        return self._data_type.from_raw_value(
+            self._raw_a*(1-t) + self._raw_b*t)
+
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Return the raw values at normalized times, as (T, *shape)."""
+        _t = self._to_column(t)
+        return self._raw_a*(1-_t) + self._raw_b*_t
+
+
+class BezierSegment(CurveSegment):
+    """A segment following the Bezier handles of its keyframes.
+
+    The Bezier parameter T of a normalized time t is the root within
+    [0, 1] of a*T**3 + 3*b*T**2 + 3*t1*T - t, as solved by
+    Interpolate.cubic_bezier_2d_handles.
+    """
+
+    _coefficients: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    # Values are c0 + c1*T + c2*T**2 + c3*T**3.
+    _t1: float
+    _a: float
+    _b: float
+    _d: float
+    _f0: float
+    _root_d: float
+
+    def __init__(self, keyframe_a: Keyframe, keyframe_b: Keyframe):
+        super().__init__(keyframe_a, keyframe_b)
+        _value_handle_a, _value_handle_b, _t1, _t2 = (
+            keyframe_a.get_bezier_controls_to(keyframe_b))
+        _y0 = self._raw_a
+        _y1 = self.get_raw_array(_value_handle_a)
+        _y2 = self.get_raw_array(_value_handle_b)
+        _y3 = self.get_raw_array(keyframe_b.get_value())
+        self._coefficients = (_y0, 3*(_y1-_y0), 3*(_y0-2*_y1+_y2),
+                              _y3-_y0+3*(_y1-_y2))
+
+        self._t1 = min(max(0, _t1), 1)
+        _t2 = min(max(0, _t2), 1)
+        self._a = 1 + 3*(self._t1-_t2)
+        self._b = _t2 - 2*self._t1
+        self._d = self._b**2 - self._a*self._t1
+        self._f0 = 2*self._b**3 - 3*self._a*self._b*self._t1
+        self._root_d = math.sqrt(self._d) if self._d > 0 else 0.
+
+    @staticmethod
+    def _cube_root(x: float) -> float:
+        """Return the real cube root of x."""
+        return math.copysign(abs(x)**(1/3), x)
+
+    def get_bezier_parameter(self, t: float) -> float:
+        """Return the Bezier parameter T at normalized time t."""
+        _a, _b, _d, _t1 = self._a, self._b, self._d, self._t1
+        if _a == 0:
+            if _b == 0:
+                return 0. if _t1 == 0 else t/3/_t1
+            _discriminant = _t1**2 + 4*_b*t/3
+            if _discriminant < 0:
+                return 0.
+            return (-_t1 + math.sqrt(_discriminant))/2/_b
+
+        _f = self._f0 - _a**2*t
+        if _d == 0:
+            return -(_b + self._cube_root(_f))/_a
+        if _f**2 >= 4*_d**3:
+            # The root of the sign of f avoids cancelling out to 0.
+            _g = self._cube_root(
+                (_f + math.copysign(math.sqrt(_f**2 - 4*_d**3), _f))/2)
+            return -(_b + _g + _d/_g)/_a
+        _angle = math.acos(_f/2/_d**1.5)/3
+        for _offset in (0, 2*math.pi/3, 4*math.pi/3):
+            _T = -(_b + 2*self._root_d*math.cos(_offset + _angle))/_a
+            if 0 <= _T <= 1:
+                break
+        return _T
+
+    def get_bezier_parameters(self, t: np.ndarray) -> np.ndarray:
+        """Return the Bezier parameters at an array of times.
+
+        Each branch of get_bezier_parameter which depends on t is
+        computed over the whole array, then selected per time.
+        """
+        _a, _b, _d, _t1 = self._a, self._b, self._d, self._t1
+        if _a == 0:
+            if _b == 0:
+                return np.zeros_like(t) if _t1 == 0 else t/3/_t1
+            _discriminant = _t1**2 + 4*_b*t/3
+            return np.where(
+                _discriminant < 0, 0.,
+                (-_t1 + np.sqrt(np.maximum(_discriminant, 0)))/2/_b)
+
+        _f = self._f0 - _a**2*t
+        if _d == 0:
+            return -(_b + np.cbrt(_f))/_a
+        _square = _f**2 - 4*_d**3
+        _g = np.cbrt((_f + np.copysign(np.sqrt(np.maximum(_square, 0)),
+                                       _f))/2)
+        _T = -(_b + _g + _d/np.where(_g == 0, 1, _g))/_a
+        if _d < 0:
+            # Then the square is always positive.
+            return _T
+        _angle = np.arccos(np.clip(_f/2/_d**1.5, -1, 1))/3
+        _roots = [-(_b + 2*self._root_d*np.cos(_offset + _angle))/_a
+                  for _offset in (0, 2*np.pi/3, 4*np.pi/3)]
+        _trigonometric_T = np.where(
+            (_roots[0] >= 0) & (_roots[0] <= 1), _roots[0],
+            np.where((_roots[1] >= 0) & (_roots[1] <= 1), _roots[1],
+                     _roots[2]))
+        return np.where(_square >= 0, _T, _trigonometric_T)
+
+    def evaluate(self, t: float) -> DataType:
+        """Return the value at normalized time 0 < t < 1."""
+        _T = min(max(0., self.get_bezier_parameter(t)), 1.)
+        _c0, _c1, _c2, _c3 = self._coefficients
+        return self._data_type.from_raw_value(
+            _c0 + (_c1 + (_c2 + _c3*_T)*_T)*_T)
+
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Return the raw values at normalized times, as (T, *shape)."""
+        _T = self._to_column(np.clip(self.get_bezier_parameters(t), 0, 1))
+        _c0, _c1, _c2, _c3 = self._coefficients
+        return _c0 + (_c1 + (_c2 + _c3*_T)*_T)*_T
+
+
+class AnimationCurve:
+    """Compiled form of the keyframes of a Parameter."""
+
+    SEGMENT_CLASSES: dict[KeyframeType, Type[CurveSegment]] = {
+        KeyframeType.CONSTANT: CurveSegment,
+        KeyframeType.LINEAR: LinearSegment,
+        KeyframeType.BEZIER: BezierSegment}
+
+    _revision: int
+    _frames: list[Union[int, float]]
+    _frame_array: np.ndarray
+    _values: list[DataType]
+    _raw_values: np.ndarray
+    _segments: list[CurveSegment]
+    # list(index => segment from keyframe index to index+1)
+
+    def __init__(self, revision: int, keyframe_list: list[Keyframe]):
+        """Compile keyframes, which must be sorted by frame."""
+        self._revision = revision
+        self._frames = [_keyframe.get_frame() for _keyframe in keyframe_list]
+        self._values = [_keyframe.get_value() for _keyframe in keyframe_list]
+        self._frame_array = np.array(self._frames, dtype=np.float64)
+        self._raw_values = np.array([CurveSegment.get_raw_array(_value)
+                                     for _value in self._values])
+        self._segments = []
+        for _keyframe_a, _keyframe_b in zip(keyframe_list,
+                                            keyframe_list[1:]):
+            _segment_class = self.SEGMENT_CLASSES[
+                _keyframe_a.get_interpolation_to(_keyframe_b)]
+            self._segments.append(_segment_class(_keyframe_a, _keyframe_b))
+
+    def get_revision(self) -> int:
+        """Return the revision of the parameter when compiled."""
+        return self._revision
+
+    def get_frames(self) -> list[Union[int, float]]:
+        """Return the sorted frames of the keyframes."""
+        return self._frames
+
+    def get_value_at_frame(self, frame: Union[int, float]) -> DataType:
+        """Return the value at a frame, given at least one keyframe."""
+        _index = bisect_right(self._frames, frame)
+        if _index == 0:
+            # The frame is before the first keyframe.
+            return self._values[0]
+        _frame_a = self._frames[_index-1]
+        if _frame_a == frame:
+            # The frame has a keyframe.
+            return self._values[_index-1]
+        if _index == len(self._frames):
+            # The frame is after the last keyframe.
+            return self._values[-1]
+
+        # The frame is between two keyframes.
+        _t = (frame-_frame_a)/(self._frames[_index]-_frame_a)
+        return self._segments[_index-1].evaluate(_t)
+
+    def get_values_at_frames(self, frames: np.ndarray) -> np.ndarray:
+        """Return the raw values at a 1D array of frames.
+
+        The result is a float array of shape (T, *shape), given at
+        least one keyframe. Each segment evaluates all of its frames
+        at once.
+        """
+        _frames = np.asarray(frames, dtype=np.float64)
+        _indices = np.searchsorted(self._frame_array, _frames, "right")
+        # Frames on or outside the keyframes take the value of one.
+        _keyframe_indices = np.maximum(_indices-1, 0)
+        _values = self._raw_values[_keyframe_indices]
+        _between = ((_indices > 0) & (_indices < len(self._frames))
+                    & (self._frame_array[_keyframe_indices] != _frames))
+        for _index in np.unique(_keyframe_indices[_between]):
+            _mask = _between & (_keyframe_indices == _index)
+            _frame_a = self._frame_array[_index]
+            _t = ((_frames[_mask]-_frame_a)
+                  / (self._frame_array[_index+1]-_frame_a))
+            _values[_mask] = self._segments[_index].evaluate_array(_t)
+        return _values
@@ -0,0 +1,120 @@
+"""
+Cache of rendered frames within a memory budget.
+
+The FrameCache class stores rendered frames, either as moderngl
+textures on the GPU or as Image objects in host memory, so that
+frames that were already seen don't need to be rendered again.
+When the byte budget is exceeded, frames are evicted according
+to the GreedyDual-Size policy: each frame has a priority equal to
+the cache clock plus its rendering cost per byte, and the clock
+rises to the priority of each evicted frame. Expensive frames
+thus outlive cheap ones, while frames that are not used anymore
+eventually get evicted. Each moderngl context has its own cache,
+whose textures come from the texture pool of that context.
+"""
+
+from typing import Union, Hashable, Callable
+
+import moderngl
+
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from core.entities.texture_pool import TexturePool
+from utils.image import Image
+
+
+class FrameCache:
+    """Cache of rendered frames within a memory budget."""
+
+    _texture_pool: TexturePool
+    _budget: int    # in bytes
+    _used: int    # in bytes
+    _clock: float
+    _entries: dict[Hashable, tuple[Union[moderngl.Texture, Image],
+                                   int, float, float]]
+    # dict(key => tuple[content, size, cost, priority])
+
+    def __init__(self, texture_pool: TexturePool, budget: int):
+        self._texture_pool = texture_pool
+        self._budget = budget
+        self._used = 0
+        self._clock = 0
+        self._entries = dict()
+
+    @staticmethod
+    def content_size(content: Union[moderngl.Texture, Image]) -> int:
+        """Return the size of a frame in bytes."""
+        if isinstance(content, Image):
+            return content.get_data_array().nbytes
+        _item_size = int(content.dtype[1:])
+        return (content.width * content.height
+                * content.components * _item_size)
+
+    def get(self, key: Hashable) -> Union[moderngl.Texture, Image]:
+        """Return a cached frame, or None if it is not in the cache."""
+        _entry = self._entries.get(key)
+        if _entry is None:
+            return None
+        _content, _size, _cost, _priority = _entry
+        self._entries[key] = (_content, _size, _cost,
+                              self._clock + _cost/_size)
+        return _content
+
+    def put(self,
+            key: Hashable,
+            content: Union[moderngl.Texture, Image],
+            cost: float):
+        """Store a frame along with the time it took to render it.
+
+        The cache takes ownership of the content, which is
+        released if it cannot fit within the budget.
+        """
+        self.remove(key)
+        if not isinstance(content, Image):
+            GPUResourceTracker.adopt(content, "FrameCache")
+        _size = max(1, self.content_size(content))
+        if _size > self._budget:
+            self._release_content(content)
+            return
+        while self._used + _size > self._budget:
+            self._evict()
+        self._entries[key] = (content, _size, cost,
+                              self._clock + cost/_size)
+        self._used += _size
+
+    def remove(self, key: Hashable):
+        """Remove a frame from the cache."""
+        _entry = self._entries.pop(key, None)
+        if _entry is not None:
+            self._used -= _entry[1]
+            self._release_content(_entry[0])
+
+    def remove_if(self, predicate: Callable[[Hashable], bool]):
+        """Remove all the frames whose key satisfies a predicate."""
+        for _key in [_key for _key in self._entries if predicate(_key)]:
+            self.remove(_key)
+
+    def clear(self):
+        """Remove all the frames from the cache."""
+        for _key in list(self._entries):
+            self.remove(_key)
+
+    def set_budget(self, budget: int):
+        """Change the byte budget, evicting frames if needed."""
+        self._budget = budget
+        while self._used > self._budget:
+            self._evict()
+
+    def get_used_bytes(self) -> int:
+        """Return the number of bytes used by cached frames."""
+        return self._used
+
+    def _evict(self):
+        """Evict the frame with the lowest priority."""
+        _key = min(self._entries, key=lambda _key: self._entries[_key][3])
+        self._clock = self._entries[_key][3]
+        self.remove(_key)
+
+    def _release_content(self, content: Union[moderngl.Texture, Image]):
+        """Release the GPU memory held by a frame, if any."""
+        if not isinstance(content, Image):
+            self._texture_pool.release(content)
@@ -2,20 +2,206 @@
 ModernGL context.
 
 The GLContext class provides the app
-with a centralised moderngl context.
+with a centralised moderngl context,
+along with a cache of compiled shaders,
+their vertex arrays, a pool of
+reusable textures, and the caches of
+rendered layers and frames.
+A moderngl context can only be used
+by the thread that created it, so each
+thread gets its own context, caches and
+pool, created on demand.
 """
 
+import threading
+
+import numpy as np
 import moderngl
 
+from core.entities.gpu_resource_tracker import (GPUResourceTracker,
+                                                TrackedContext)
+from core.entities.frame_cache import FrameCache
+from core.entities.layer_cache import LayerCache
+from core.entities.texture_pool import TexturePool
+from utils.config import Config
+from utils.trace import Trace
+
 
 class GLContext:
     """ModernGL context."""
 
-    _context: moderngl.Context = None
+    _backend: str = None
+    _thread_data: threading.local = threading.local()
+
+    @classmethod
+    def _get_thread_data(cls) -> threading.local:
+        """Return the state belonging to the calling thread."""
+        _data = cls._thread_data
+        if not hasattr(_data, "context"):
+            _data.context = None
+            _data.program_cache = dict()
+            _data.vertex_array_cache = dict()
+            _data.texture_pool = None
+            _data.layer_cache = None
+            _data.frame_cache = None
+        return _data
 
     @classmethod
     def get_context(cls) -> moderngl.Context:
-        """Return moderngl context."""
-        if cls._context is None:
-            cls._context = moderngl.create_context(standalone=True)
-        return cls._context
+        """Return moderngl context of the calling thread."""
+        _data = cls._get_thread_data()
+        if _data.context is None:
+            _settings = dict()
+            if cls._backend is not None:
+                _settings["backend"] = cls._backend
+            _data.context = moderngl.create_context(standalone=True,
+                                                    **_settings)
+            if GPUResourceTracker.is_enabled():
+                _data.context = TrackedContext(_data.context)
+        return _data.context
+
+    @classmethod
+    def has_context(cls) -> bool:
+        """Return whether the calling thread has created a context."""
+        return cls._get_thread_data().context is not None
+
+    @classmethod
+    def set_backend(cls, backend: str):
+        """Choose the backend of the contexts, such as 'egl'.
+
+        This must be called before any context is created.
+        """
+        if cls.has_context():
+            raise RuntimeError("The moderngl context is already created.")
+        cls._backend = backend
+
+    @classmethod
+    def get_backend(cls) -> str:
+        """Return the chosen backend, or None for the default one."""
+        return cls._backend
+
+    @classmethod
+    def get_texture_pool(cls) -> TexturePool:
+        """Return the pool of reusable textures."""
+        _data = cls._get_thread_data()
+        if _data.texture_pool is None:
+            _data.texture_pool = TexturePool(
+                cls.get_context(), Config.render.texture_pool_size)
+        return _data.texture_pool
+
+    @classmethod
+    def get_layer_cache(cls) -> LayerCache:
+        """Return the cache of time-invariant layer textures."""
+        _data = cls._get_thread_data()
+        if _data.layer_cache is None:
+            _data.layer_cache = LayerCache(cls.get_texture_pool())
+        return _data.layer_cache
+
+    @classmethod
+    def get_frame_cache(cls) -> FrameCache:
+        """Return the cache of rendered frames."""
+        _data = cls._get_thread_data()
+        if _data.frame_cache is None:
+            _data.frame_cache = FrameCache(
+                cls.get_texture_pool(),
+                Config.cache.frame_cache_budget * 1024**2)
+        return _data.frame_cache
+
+    @staticmethod
+    def _insert_defines(glsl_code: str, defines: dict[str, str]) -> str:
+        """Insert preprocessor macros right after the version line."""
+        if not defines:
+            return glsl_code
+        _lines = [f"#define {_name} {_value}"
+                  for _name, _value in defines.items()]
+        _head, _separator, _tail = glsl_code.partition("#version")
+        if not _separator:
+            return "\n".join(_lines) + "\n" + glsl_code
+        _version, _newline, _tail = _tail.partition("\n")
+        return (_head + _separator + _version + "\n"
+                + "\n".join(_lines) + "\n" + _tail)
+
+    @classmethod
+    def compute_shader_once(cls,
+                            name_id: str,
+                            glsl_code: str,
+                            defines: dict[str, str] = None
+                            ) -> moderngl.ComputeShader:
+        """Return a compute shader, compiling it only the first time.
+
+        The shader is cached by name id and source code, such that
+        editing the source of a shader compiles a new program. The
+        given preprocessor macros, such as the image format, are part
+        of the source code.
+        """
+        glsl_code = cls._insert_defines(glsl_code, defines)
+        _program_cache = cls._get_thread_data().program_cache
+        _key = (name_id, glsl_code)
+        _shader = _program_cache.get(_key)
+        if _shader is None:
+            with Trace.span("compile compute shader", "shader",
+                            name_id=name_id):
+                _shader = cls.get_context().compute_shader(glsl_code)
+            GPUResourceTracker.adopt(_shader, "GLContext")
+            _program_cache[_key] = _shader
+        return _shader
+
+    @classmethod
+    def program_once(cls,
+                     name_id: str,
+                     vertex_code: str,
+                     fragment_code: str
+                     ) -> moderngl.Program:
+        """Return a program, compiling it only the first time."""
+        _program_cache = cls._get_thread_data().program_cache
+        _key = (name_id, vertex_code, fragment_code)
+        _program = _program_cache.get(_key)
+        if _program is None:
+            with Trace.span("compile program", "shader", name_id=name_id):
+                _program = cls.get_context().program(
+                    vertex_shader=vertex_code,
+                    fragment_shader=fragment_code)
+            GPUResourceTracker.adopt(_program, "GLContext")
+            _program_cache[_key] = _program
+        return _program
+
+    @classmethod
+    def quad_vertex_array_once(cls,
+                               name_id: str,
+                               program: moderngl.Program
+                               ) -> moderngl.VertexArray:
+        """Return a unit quad vertex array for a program, made once.
+
+        The quad is a triangle strip whose 'in_uv' attribute spans
+        from (0, 0) to (1, 1). A vertex array made for a previous
+        program is released along with its buffer.
+        """
+        _vertex_array_cache = cls._get_thread_data().vertex_array_cache
+        _entry = _vertex_array_cache.get(name_id)
+        if _entry is not None and _entry[0].program == program:
+            return _entry[0]
+        if _entry is not None:
+            GPUResourceTracker.release(_entry[0])
+            GPUResourceTracker.release(_entry[1])
+        _gl_context = cls.get_context()
+        _vertices = np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32)
+        _vertex_buffer = _gl_context.buffer(_vertices.tobytes())
+        _vertex_array = _gl_context.vertex_array(
+            program, _vertex_buffer, "in_uv")
+        GPUResourceTracker.adopt(_vertex_buffer, "GLContext")
+        GPUResourceTracker.adopt(_vertex_array, "GLContext")
+        _vertex_array_cache[name_id] = (_vertex_array, _vertex_buffer)
+        return _vertex_array
+
+    @classmethod
+    def release_programs(cls):
+        """Release all the cached programs of the calling thread."""
+        _program_cache = cls._get_thread_data().program_cache
+        _vertex_array_cache = cls._get_thread_data().vertex_array_cache
+        for _vertex_array, _vertex_buffer in _vertex_array_cache.values():
+            GPUResourceTracker.release(_vertex_array)
+            GPUResourceTracker.release(_vertex_buffer)
+        _vertex_array_cache.clear()
+        for _program in _program_cache.values():
+            GPUResourceTracker.release(_program)
+        _program_cache.clear()
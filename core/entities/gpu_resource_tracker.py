@@ -0,0 +1,298 @@
+"""
+Tracking of the OpenGL objects created by the render pipeline.
+
+The GPUResourceTracker class records every live moderngl object
+created through the contexts of GLContext, with its kind, its size
+in bytes, the call site which created it and its owner, and exposes
+live totals. Objects are created through a TrackedContext, which
+wraps a moderngl context, and released through the tracker. An
+object created while a frame renders belongs to that frame, unless
+a long-lived owner, such as the texture pool or a shader cache,
+adopts it. Those still alive when the frame ends are reported as
+leaks, or raise an error in strict mode, such as within tests.
+
+Tracking is disabled by default, as it inspects the call stack of
+every created object.
+"""
+
+from typing import Any
+from collections import Counter
+import threading
+import sys
+
+import moderngl
+
+from utils.config import Config
+
+
+class GPUResourceLeakError(RuntimeError):
+    """Raised in strict mode when a frame leaks OpenGL objects."""
+
+
+class GPUResource:
+    """A live OpenGL object, as recorded by the tracker."""
+
+    _kind: str
+    _size: int
+    _call_site: str
+    _thread_name: str
+    _owner: str
+
+    def __init__(self,
+                 kind: str,
+                 size: int,
+                 call_site: str,
+                 thread_name: str):
+        self._kind = kind
+        self._size = size
+        self._call_site = call_site
+        self._thread_name = thread_name
+        self._owner = None
+
+    def get_kind(self) -> str:
+        """Return the kind of object, such as 'texture' or 'buffer'."""
+        return self._kind
+
+    def get_size(self) -> int:
+        """Return the memory of the object in bytes, 0 if unknown."""
+        return self._size
+
+    def get_call_site(self) -> str:
+        """Return the file, line and function which created it."""
+        return self._call_site
+
+    def get_thread_name(self) -> str:
+        """Return the name of the thread which created it."""
+        return self._thread_name
+
+    def get_owner(self) -> str:
+        """Return the long-lived owner, or None if frame-scoped."""
+        return self._owner
+
+    def set_owner(self, owner: str):
+        """Set the long-lived owner of the object."""
+        self._owner = owner
+
+    def describe(self) -> str:
+        """Return a line describing the object."""
+        return (f"{self._kind} of {self._size} bytes created at "
+                f"{self._call_site} on thread '{self._thread_name}'"
+                f", owned by {self._owner or 'no one'}")
+
+
+class GPUResourceTracker:
+    """Tracking of the OpenGL objects created by the render pipeline."""
+
+    _enabled: bool = None
+    _strict: bool = None
+    _lock: threading.Lock = threading.Lock()
+    _resources: dict[int, tuple[Any, GPUResource]] = dict()
+    # dict(id(object) => tuple[object, GPUResource])
+    _thread_data: threading.local = threading.local()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Return whether new contexts track their objects."""
+        if cls._enabled is None:
+            cls._enabled = Config.render.gpu_tracking
+        return cls._enabled
+
+    @classmethod
+    def is_strict(cls) -> bool:
+        """Return whether leaks raise a GPUResourceLeakError."""
+        if cls._strict is None:
+            cls._strict = Config.render.gpu_tracking_strict
+        return cls._strict
+
+    @classmethod
+    def set_enabled(cls, enabled: bool = True, strict: bool = None):
+        """Enable or disable tracking, for contexts created afterwards."""
+        cls._enabled = enabled
+        if strict is not None:
+            cls._strict = strict
+
+    @staticmethod
+    def _get_call_site() -> str:
+        """Return the first caller outside of the tracking modules."""
+        _frame = sys._getframe(1)
+        while _frame is not None and _frame.f_globals.get(
+                "__name__") == __name__:
+            _frame = _frame.f_back
+        if _frame is None:
+            return "unknown"
+        return (f"{_frame.f_code.co_filename}:{_frame.f_lineno} "
+                f"in {_frame.f_code.co_name}")
+
+    @staticmethod
+    def get_object_size(gl_object: Any) -> int:
+        """Return the memory of a moderngl object in bytes."""
+        if isinstance(gl_object, (moderngl.Texture, moderngl.Renderbuffer)):
+            return (gl_object.width*gl_object.height*gl_object.components
+                    * int(gl_object.dtype[1:])*max(1, gl_object.samples))
+        if isinstance(gl_object, moderngl.Buffer):
+            return gl_object.size
+        return 0
+
+    @classmethod
+    def track(cls, gl_object: Any, kind: str) -> Any:
+        """Record a new object, and return it."""
+        _resource = GPUResource(kind, cls.get_object_size(gl_object),
+                                cls._get_call_site(),
+                                threading.current_thread().name)
+        with cls._lock:
+            cls._resources[id(gl_object)] = (gl_object, _resource)
+        _frame_ids = getattr(cls._thread_data, "frame_ids", None)
+        if _frame_ids is not None:
+            _frame_ids.append(id(gl_object))
+        return gl_object
+
+    @classmethod
+    def adopt(cls, gl_object: Any, owner: str):
+        """Mark an object as owned beyond the frame creating it."""
+        if gl_object is None:
+            return
+        with cls._lock:
+            _entry = cls._resources.get(id(gl_object))
+        if _entry is not None:
+            _entry[1].set_owner(owner)
+
+    @classmethod
+    def lend(cls, gl_object: Any):
+        """Mark an owned object as used by the current frame only.
+
+        This is for objects handed out again by their owner, such as
+        pooled textures, which must be given back before the frame
+        ends.
+        """
+        with cls._lock:
+            _entry = cls._resources.get(id(gl_object))
+        if _entry is None:
+            return
+        _entry[1].set_owner(None)
+        _frame_ids = getattr(cls._thread_data, "frame_ids", None)
+        if _frame_ids is not None:
+            _frame_ids.append(id(gl_object))
+
+    @classmethod
+    def release(cls, gl_object: Any):
+        """Release an object, and stop tracking it."""
+        with cls._lock:
+            cls._resources.pop(id(gl_object), None)
+        gl_object.release()
+
+    @classmethod
+    def begin_frame(cls):
+        """Start collecting the objects created by the calling thread.
+
+        Frames may be nested, in which case only the outermost one
+        checks for leaks. Nothing is collected unless tracking.
+        """
+        if not cls.is_enabled():
+            return
+        _depth = getattr(cls._thread_data, "depth", 0)
+        if _depth == 0:
+            cls._thread_data.frame_ids = []
+        cls._thread_data.depth = _depth + 1
+
+    @classmethod
+    def end_frame(cls, label: str = "frame"):
+        """Report the frame-scoped objects which are still alive."""
+        if getattr(cls._thread_data, "depth", 0) == 0:
+            return
+        cls._thread_data.depth -= 1
+        if cls._thread_data.depth > 0:
+            return
+        _frame_ids = cls._thread_data.frame_ids
+        cls._thread_data.frame_ids = None
+        _leaks = []
+        with cls._lock:
+            # Ids of released objects may have been reused.
+            for _id in dict.fromkeys(_frame_ids):
+                _entry = cls._resources.get(_id)
+                if _entry is not None and _entry[1].get_owner() is None:
+                    _leaks.append(_entry[1])
+        if not _leaks:
+            return
+        _message = (f"{len(_leaks)} OpenGL objects outlived the {label}"
+                    f" creating them:\n  "
+                    + "\n  ".join(_leak.describe() for _leak in _leaks))
+        if cls.is_strict():
+            raise GPUResourceLeakError(_message)
+        print(_message)
+
+    @classmethod
+    def get_live_resources(cls) -> list[GPUResource]:
+        """Return the records of all the live objects."""
+        with cls._lock:
+            return [_entry[1] for _entry in cls._resources.values()]
+
+    @classmethod
+    def get_totals(cls) -> dict[str, dict[str, int]]:
+        """Return the number and bytes of live objects, by kind."""
+        _counts = Counter()
+        _sizes = Counter()
+        for _resource in cls.get_live_resources():
+            _counts[_resource.get_kind()] += 1
+            _sizes[_resource.get_kind()] += _resource.get_size()
+        return {_kind: {"count": _counts[_kind], "bytes": _sizes[_kind]}
+                for _kind in sorted(_counts)}
+
+    @classmethod
+    def get_total_bytes(cls) -> int:
+        """Return the memory of all the live objects in bytes."""
+        return sum(_resource.get_size()
+                   for _resource in cls.get_live_resources())
+
+
+class TrackedContext:
+    """A moderngl context recording the objects it creates.
+
+    Any other attribute is the one of the wrapped context, which is
+    also where attributes are set, such as its blend function.
+    """
+
+    _CREATORS: dict[str, str] = {
+        "texture": "texture",
+        "texture_array": "texture",
+        "texture3d": "texture",
+        "texture_cube": "texture",
+        "depth_texture": "texture",
+        "renderbuffer": "renderbuffer",
+        "depth_renderbuffer": "renderbuffer",
+        "buffer": "buffer",
+        "framebuffer": "framebuffer",
+        "simple_framebuffer": "framebuffer",
+        "vertex_array": "vertex_array",
+        "simple_vertex_array": "vertex_array",
+        "program": "program",
+        "compute_shader": "compute_shader",
+        "query": "query",
+        "sampler": "sampler"}
+
+    _context: moderngl.Context
+
+    def __init__(self, context: moderngl.Context):
+        object.__setattr__(self, "_context", context)
+
+    def get_wrapped_context(self) -> moderngl.Context:
+        """Return the wrapped moderngl context."""
+        return self._context
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the attribute of the context, tracking creations."""
+        _attribute = getattr(self._context, name)
+        _kind = self._CREATORS.get(name)
+        if _kind is None:
+            return _attribute
+
+        def _create(*args, **kwargs):
+            return GPUResourceTracker.track(_attribute(*args, **kwargs),
+                                            _kind)
+        return _create
+
+    def __setattr__(self, name: str, value: Any):
+        """Set the attribute of the wrapped context."""
+        if name == "_context":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._context, name, value)
@@ -0,0 +1,73 @@
+"""
+Pixel formats of the images within the render pipeline.
+
+The ImageFormat enumeration lists the RGBA formats that textures may
+use, along with their GLSL image format, and their moderngl and numpy
+data types. Layers are rendered and composited in the floating point
+working format of their Sequence, while the 8-bit format only suits
+display-only stages, once the frame is tone mapped.
+"""
+
+from enum import Enum
+
+import numpy as np
+
+
+class ImageFormat(Enum):
+    """Enumerate the pixel formats of the render pipeline."""
+
+    FLOAT32 = 0
+    FLOAT16 = 1
+    UINT8 = 2
+
+    def get_glsl_format(self) -> str:
+        """Return the GLSL format qualifier of image variables."""
+        return ("rgba32f", "rgba16f", "rgba8")[self.value]
+
+    def get_dtype(self) -> str:
+        """Return the moderngl data type of the textures."""
+        return ("f4", "f2", "f1")[self.value]
+
+    def get_numpy_dtype(self) -> type:
+        """Return the numpy data type of the pixels read back."""
+        return (np.float32, np.float16, np.uint8)[self.value]
+
+    def get_item_size(self) -> int:
+        """Return the size of a pixel component in bytes."""
+        return (4, 2, 1)[self.value]
+
+    def get_title(self) -> str:
+        """Return the name of the format shown to the user."""
+        return ("32-bit float", "16-bit float", "8-bit")[self.value]
+
+    def is_working_format(self) -> bool:
+        """Tell if layers may be rendered and composited in the format.
+
+        The 8-bit format clamps values between 0 and 1, which is only
+        acceptable for display.
+        """
+        return self is not ImageFormat.UINT8
+
+    def get_shader_defines(self) -> dict[str, str]:
+        """Return the preprocessor macros describing the format.
+
+        Shaders use 'IMAGE_FORMAT' as the format qualifier of their
+        image variables, such as 'layout (IMAGE_FORMAT, binding = 0)'.
+        """
+        return {"IMAGE_FORMAT": self.get_glsl_format()}
+
+    @classmethod
+    def from_dtype(cls, dtype: str) -> "ImageFormat":
+        """Return the format of a moderngl data type."""
+        for _format in cls:
+            if _format.get_dtype() == dtype:
+                return _format
+        raise ValueError(f"No image format with data type '{dtype}'")
+
+    @classmethod
+    def from_numpy_dtype(cls, dtype: np.dtype) -> "ImageFormat":
+        """Return the format of a numpy data type."""
+        for _format in cls:
+            if np.dtype(_format.get_numpy_dtype()) == np.dtype(dtype):
+                return _format
+        raise ValueError(f"No image format with numpy data type '{dtype}'")
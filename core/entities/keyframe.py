@@ -58,61 +58,77 @@ class Keyframe:
         """Return the value."""
         return self._value
 
+    def get_keyframe_type(self) -> KeyframeType:
+        """Return the interpolation type."""
+        return self._keyframe_type
+
+    def get_left_handle(self) -> tuple[float, DataType]:
+        """Return the (influence, -offset) handle before the keyframe."""
+        return self._left_handle
+
+    def get_right_handle(self) -> tuple[float, DataType]:
+        """Return the (influence, offset) handle after the keyframe."""
+        return self._right_handle
+
+    def has_left_bezier_handle(self) -> bool:
+        """Tell if the values before the keyframe follow its handle."""
+        return self._keyframe_type in [KeyframeType.BEZIER_LEFT,
+                                       KeyframeType.BEZIER]
+
+    def has_right_bezier_handle(self) -> bool:
+        """Tell if the values after the keyframe follow its handle."""
+        return self._keyframe_type in [KeyframeType.BEZIER_RIGHT,
+                                       KeyframeType.BEZIER]
+
+    def get_interpolation_to(self, keyframe_b: Self) -> KeyframeType:
+        """Return how values are interpolated up to another keyframe.
+
+        This is CONSTANT, LINEAR, or BEZIER when a handle of either
+        keyframe lies within the segment.
+        """
+        if self._keyframe_type == KeyframeType.CONSTANT:
+            return KeyframeType.CONSTANT
+        if (self.has_right_bezier_handle()
+                or keyframe_b.has_left_bezier_handle()):
+            return KeyframeType.BEZIER
+        return KeyframeType.LINEAR
+
+    def get_bezier_controls_to(self, keyframe_b: Self
+                               ) -> tuple[DataType, DataType, float, float]:
+        """Return the Bezier controls of the segment to another keyframe.
+
+        These are the control values y1 and y2, at the normalized
+        times t1 and t2, a side without handle being linear.
+        """
+        if self.has_right_bezier_handle():
+            _t1 = self._right_handle[0]
+            _value_handle_a = self._value + self._right_handle[1]
+        else:
+            _t1 = 0
+            _value_handle_a = self._value
+        if keyframe_b.has_left_bezier_handle():
+            _t2 = 1 - keyframe_b._left_handle[0]
+            _value_handle_b = keyframe_b._value - keyframe_b._left_handle[1]
+        else:
+            _t2 = 1
+            _value_handle_b = keyframe_b._value
+        return _value_handle_a, _value_handle_b, _t1, _t2
+
     def interpolate_to(self, keyframe_b: Self, t: float) -> DataType:
         """Interpolate from this keyframe to another with factor t."""
-        _value_a = self._value
-        _type_a = self._keyframe_type
-        _value_b = keyframe_b._value
-        _type_b = keyframe_b._keyframe_type
+        _interpolation = self.get_interpolation_to(keyframe_b)
 
         # Constant keyframe.
-        if _type_a == KeyframeType.CONSTANT:
-            return _value_a
+        if _interpolation == KeyframeType.CONSTANT:
+            return self._value
 
         # Linear interpolation.
-        if (_type_a in [KeyframeType.LINEAR,
-                        KeyframeType.BEZIER_LEFT]
-            and (_type_b in [KeyframeType.CONSTANT,
-                             KeyframeType.LINEAR,
-                             KeyframeType.BEZIER_RIGHT])):
-            return Interpolate.linear(_value_a, _value_b, t)
-
-        # Right bezier interpolation.
-        if (_type_a in [KeyframeType.LINEAR,
-                        KeyframeType.BEZIER_LEFT]
-            and (_type_b in [KeyframeType.BEZIER_RIGHT,
-                             KeyframeType.BEZIER])):
-            _handle_b = keyframe_b._left_handle
-            _value_handle_b = _value_b - _handle_b[1]
-            _t2 = 1 - _handle_b[0]
-            return Interpolate.cubic_bezier_2d_handles(
-                _value_a, _value_a, _value_handle_b, _value_b, 0, _t2, t)
-
-        # Left bezier interpolation.
-        if (_type_a in [KeyframeType.BEZIER_RIGHT,
-                        KeyframeType.BEZIER]
-            and (_type_b in [KeyframeType.CONSTANT,
-                             KeyframeType.LINEAR,
-                             KeyframeType.BEZIER_RIGHT])):
-            _handle_a = self._right_handle
-            _value_handle_a = _value_a + _handle_a[1]
-            _t1 = _handle_a[0]
-            return Interpolate.cubic_bezier_2d_handles(
-                _value_a, _value_handle_a, _value_b, _value_b, _t1, 1, t)
-
-        # Left-Right bezier interpolation.
-        if (_type_a in [KeyframeType.BEZIER_RIGHT,
-                        KeyframeType.BEZIER]
-            and (_type_b in [KeyframeType.BEZIER_LEFT,
-                             KeyframeType.BEZIER])):
-            _handle_a = self._right_handle
-            _handle_b = keyframe_b._left_handle
-            _value_handle_a = _value_a + _handle_a[1]
-            _value_handle_b = _value_b - _handle_b[1]
-            _t1 = _handle_a[0]
-            _t2 = 1 - _handle_b[0]
-            return Interpolate.cubic_bezier_2d_handles(
-                _value_a, _value_handle_a, _value_handle_b, _value_b,
-                _t1, _t2, t)
-
-        return _value_a
+        if _interpolation == KeyframeType.LINEAR:
+            return Interpolate.linear(self._value, keyframe_b._value, t)
+
+        # Bezier interpolation, with one or two handles.
+        _value_handle_a, _value_handle_b, _t1, _t2 = (
+            self.get_bezier_controls_to(keyframe_b))
+        return Interpolate.cubic_bezier_2d_handles(
+            self._value, _value_handle_a, _value_handle_b, keyframe_b._value,
+            _t1, _t2, t)
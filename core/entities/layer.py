@@ -5,7 +5,10 @@ The abstract class Layer has display properties, such as a title,
 as well as sequence related properties, such as a start frame and
 an end frame. This abstract class can be implemented to represent
 any type of layer such as a video, an image, an audio, a text...
-A Layer also holds a list of Modifier that are applied to it.
+A Layer also holds a list of Modifier that are applied to it. It
+follows the notifications of its parameters, and notifies any change
+affecting its renders, such that its revisions are known without
+going through its parameters.
 """
 
 from data_types.data_type import DataType
@@ -13,6 +16,8 @@ from core.entities.modifier import Modifier
 from core.entities.parameter import Parameter
 from core.entities.parameter_template import ParameterTemplate
 from core.services.animation_service import AnimationService
+from utils.notification import Notification
+from utils.revision import Revision
 
 
 class Layer:
@@ -23,6 +28,10 @@ class Layer:
     _end_frame: int
     _modifier_list: list[Modifier]
     _properties: dict[str, Parameter]
+    _revision: int
+    _render_revision: int
+
+    changed: Notification
 
     _properties_templates: dict[str, ParameterTemplate] = dict()
 
@@ -31,6 +40,9 @@ class Layer:
                  start_frame: int,
                  end_frame: int):
         self._title = title
+        self._revision = Revision.next()
+        self._render_revision = self._revision
+        self.changed = Notification()
         self.set_start_frame(start_frame)
         self.set_end_frame(end_frame)
         self._modifier_list = []
@@ -39,6 +51,7 @@ class Layer:
             _property = AnimationService.parameter_from_template(
                 _property_template)
             self._properties[_name_id] = _property
+            self.follow_parameter(_property)
 
     def get_properties_templates(self) -> dict[str, ParameterTemplate]:
         """Return the properties templates."""
@@ -71,11 +84,44 @@ class Layer:
     def set_start_frame(self, frame: int):
         """Set the layer start frame."""
         self._start_frame = frame
+        self.update_revision()
 
     def set_end_frame(self, frame: int):
         """Set the layer end frame."""
         self._end_frame = frame
+        self.update_revision()
 
     def get_title(self) -> str:
         """Return the layer title."""
         return self._title
+
+    def get_revision(self) -> int:
+        """Return the revision of the last structural change.
+
+        Structural changes are changes in the timing of the
+        layer or in its list of modifiers, not in its parameters.
+        """
+        return self._revision
+
+    def update_revision(self):
+        """Mark the Layer structure as modified, and notify it."""
+        self._revision = Revision.next()
+        self._render_revision = self._revision
+        self.changed.emit(self)
+
+    def get_render_revision(self) -> int:
+        """Return the revision of the last change affecting renders.
+
+        This includes the changes of the parameters it follows.
+        """
+        return self._render_revision
+
+    def follow_parameter(self, parameter: Parameter):
+        """Take the changes of a parameter into account in renders."""
+        parameter.changed.connect(self._on_parameter_changed)
+
+    def _on_parameter_changed(self, parameter: Parameter):
+        """Update the render revision after a parameter changed."""
+        self._render_revision = max(self._render_revision,
+                                    parameter.get_revision())
+        self.changed.emit(self)
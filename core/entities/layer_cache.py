@@ -0,0 +1,91 @@
+"""
+Cache of rendered textures for time-invariant layers.
+
+The LayerCache class keeps the untransformed texture of layers
+whose content does not vary over time, along with a key describing
+the state in which they were rendered, so that such layers are
+rendered once and then reused for every frame. A texture may only
+hold a region of its layer, given as (x, y, width, height), and is
+reused as long as that region contains the requested one. Each
+moderngl context has its own cache, whose textures come from the
+texture pool of that context. When a layer is garbage collected,
+its texture is queued, and given back to the pool by the next call
+on the cache, from the thread of the context.
+"""
+
+from typing import Hashable
+import weakref
+
+import moderngl
+
+from core.entities.layer import Layer
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from core.entities.texture_pool import TexturePool
+
+
+class LayerCache:
+    """Cache of rendered textures for time-invariant layers."""
+
+    _texture_pool: TexturePool
+    _entries: weakref.WeakKeyDictionary
+    # WeakKeyDictionary(layer => tuple[key, texture, region, finalize])
+    _orphan_textures: list[moderngl.Texture]
+
+    def __init__(self, texture_pool: TexturePool):
+        self._texture_pool = texture_pool
+        self._entries = weakref.WeakKeyDictionary()
+        self._orphan_textures = []
+
+    def _release_orphan_textures(self):
+        """Give the textures of collected layers back to the pool."""
+        while self._orphan_textures:
+            self._texture_pool.release(self._orphan_textures.pop())
+
+    def get(self,
+            layer: Layer,
+            key: Hashable,
+            region: tuple[int, int, int, int]
+            ) -> tuple[moderngl.Texture, tuple[int, int, int, int]]:
+        """Return the cached texture of a layer and its region.
+
+        Returns None if the key does not match, or if the cached
+        region does not contain the requested region.
+        """
+        self._release_orphan_textures()
+        _entry = self._entries.get(layer)
+        if _entry is None or _entry[0] != key:
+            return None
+        _x, _y, _width, _height = _entry[2]
+        _region_x, _region_y, _region_width, _region_height = region
+        if (_region_x < _x or _region_y < _y
+                or _region_x + _region_width > _x + _width
+                or _region_y + _region_height > _y + _height):
+            return None
+        return _entry[1], _entry[2]
+
+    def put(self,
+            layer: Layer,
+            key: Hashable,
+            texture: moderngl.Texture,
+            region: tuple[int, int, int, int]):
+        """Store the texture of a layer, which the cache now owns."""
+        self.remove(layer)
+        GPUResourceTracker.adopt(texture, "LayerCache")
+        # The finalizer may run on any thread, so it only queues.
+        _finalize = weakref.finalize(layer, self._orphan_textures.append,
+                                     texture)
+        self._entries[layer] = (key, texture, region, _finalize)
+
+    def remove(self, layer: Layer):
+        """Remove the texture of a layer from the cache."""
+        self._release_orphan_textures()
+        _entry = self._entries.pop(layer, None)
+        if _entry is not None:
+            _entry[3].detach()
+            self._texture_pool.release(_entry[1])
+
+    def clear(self):
+        """Remove all the textures from the cache."""
+        for _layer in list(self._entries.keys()):
+            self.remove(_layer)
+        self._release_orphan_textures()
@@ -0,0 +1,69 @@
+"""
+Index of the frame intervals during which layers are active.
+
+The LayerIntervalIndex class answers which layers of a Sequence are
+active at a frame, or over a range of frames, without going through
+every layer. Intervals are sorted by start frame, and a binary tree
+over them keeps the largest end frame of each subtree, such that a
+query only visits the subtrees holding overlapping intervals, in
+logarithmic time plus the number of results.
+"""
+
+from bisect import bisect_left
+
+
+class LayerIntervalIndex:
+    """Index of the frame intervals during which layers are active."""
+
+    _starts: list[int]
+    _layer_ids: list[int]
+    _max_ends: list[int]
+    _size: int
+
+    def __init__(self, intervals: list[tuple[int, int, int]]):
+        """Build the index from (start, end, layer_id) intervals.
+
+        The end frame is excluded, as in Layer, and empty intervals
+        are left out.
+        """
+        _intervals = sorted(_interval for _interval in intervals
+                            if _interval[1] > _interval[0])
+        self._starts = [_interval[0] for _interval in _intervals]
+        self._layer_ids = [_interval[2] for _interval in _intervals]
+        self._size = 1
+        while self._size < len(_intervals):
+            self._size *= 2
+        # Node 1 is the root, and leaves start at index size.
+        _no_end = float("-inf")
+        self._max_ends = [_no_end] * (2*self._size)
+        for _index, _interval in enumerate(_intervals):
+            self._max_ends[self._size + _index] = _interval[1]
+        for _node in range(self._size-1, 0, -1):
+            self._max_ends[_node] = max(self._max_ends[2*_node],
+                                        self._max_ends[2*_node+1])
+
+    def get_layers_over(self, start: int, end: int) -> list[int]:
+        """Return the ids of layers active within [start, end).
+
+        The ids are sorted, which is the drawing order.
+        """
+        # Only intervals starting before the end may overlap.
+        _count = bisect_left(self._starts, end)
+        _layer_ids = []
+        _stack = [(1, 0, self._size)]
+        while _stack:
+            _node, _low, _high = _stack.pop()
+            if _low >= _count or self._max_ends[_node] <= start:
+                continue
+            if _high - _low == 1:
+                _layer_ids.append(self._layer_ids[_low])
+                continue
+            _middle = (_low + _high) // 2
+            _stack.append((2*_node+1, _middle, _high))
+            _stack.append((2*_node, _low, _middle))
+        _layer_ids.sort()
+        return _layer_ids
+
+    def get_layers_at(self, frame: int) -> list[int]:
+        """Return the sorted ids of layers active at a frame."""
+        return self.get_layers_over(frame, frame+1)
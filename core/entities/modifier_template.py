@@ -5,6 +5,12 @@ The ModifierTemplate class contains a reference to a Modifier that the
 rendering pipeline can apply to a layer, and a list of ParameterTemplate
 that lay out a model for which Parameter objects to create when
 instanciating the interface, for the user to adjust.
+
+A pointwise modifier, which computes each pixel from the same pixel
+of its input, may be declared as a GLSL function along with the
+uniforms it needs, instead of an apply function. The rendering
+pipeline then fuses consecutive pointwise modifiers into a single
+compute shader.
 """
 
 from enum import Enum
@@ -26,16 +32,34 @@ class ModifierTemplate:
     _flags: set[ModifierFlag]
     _parameter_template_list: list[ParameterTemplate]
     _apply_function: Callable
+    _time_dependency_function: Callable
+    _footprint_function: Callable
+    _shaders: dict[str, str]
+    _pointwise_code: str
+    _pointwise_uniforms: dict[str, str]
+    _pointwise_uniforms_function: Callable
 
     def __init__(self,
                  apply_function: Callable,
                  title: str = "",
                  flags: set[ModifierFlag] = set(),
-                 parameter_template_list: list[ParameterTemplate] = []):
+                 parameter_template_list: list[ParameterTemplate] = [],
+                 shaders: dict[str, str] = dict(),
+                 time_dependency_function: Callable = None,
+                 footprint_function: Callable = None,
+                 pointwise_code: str = None,
+                 pointwise_uniforms: dict[str, str] = dict(),
+                 pointwise_uniforms_function: Callable = None):
         self._title = title
         self._parameter_template_list = parameter_template_list
         self._apply_function = apply_function
+        self._time_dependency_function = time_dependency_function
+        self._footprint_function = footprint_function
         self._flags = flags
+        self._shaders = shaders
+        self._pointwise_code = pointwise_code
+        self._pointwise_uniforms = pointwise_uniforms
+        self._pointwise_uniforms_function = pointwise_uniforms_function
 
     def get_parameter_template_list(self) -> list[ParameterTemplate]:
         """Retrieve the list of parameter templates."""
@@ -46,9 +70,57 @@ class ModifierTemplate:
         return self._title
 
     def get_apply_function(self) -> Callable:
-        """Retrieve the modifier apply function."""
+        """Retrieve the modifier apply function.
+
+        Returns None if the modifier is only declared as pointwise.
+        """
         return self._apply_function
 
+    def get_time_dependency_function(self) -> Callable:
+        """Retrieve the function telling if the modifier varies in time.
+
+        Returns None if the modifier does not depend on time.
+        """
+        return self._time_dependency_function
+
+    def get_footprint_function(self) -> Callable:
+        """Retrieve the function giving the pixels read around a pixel.
+
+        Returns None if the modifier can only be applied to the whole
+        layer at once.
+        """
+        return self._footprint_function
+
     def get_flags(self) -> set[ModifierFlag]:
         """Retrieve modifier flags."""
         return self._flags
+
+    def get_shaders(self) -> dict[str, str]:
+        """Retrieve the GLSL source of the modifier shaders."""
+        return self._shaders
+
+    def is_pointwise(self) -> bool:
+        """Tell if the modifier is declared as a pointwise function."""
+        return self._pointwise_code is not None
+
+    def get_pointwise_code(self) -> str:
+        """Retrieve the GLSL code of the pointwise function.
+
+        The code defines 'vec4 <name_id>_pointwise(vec4 color,
+        ivec2 coords, ...)', taking the pointwise uniforms in order
+        after the color and the pixel coordinates within the layer.
+        Returns None if the modifier is not pointwise.
+        """
+        return self._pointwise_code
+
+    def get_pointwise_uniforms(self) -> dict[str, str]:
+        """Retrieve the GLSL types of the pointwise uniforms by name."""
+        return self._pointwise_uniforms
+
+    def get_pointwise_uniforms_function(self) -> Callable:
+        """Retrieve the function giving the pointwise uniform values.
+
+        Returns None if the uniforms are the parameters of the same
+        name.
+        """
+        return self._pointwise_uniforms_function
@@ -3,12 +3,18 @@ Represents a property that can vary over time.
 
 A Parameter is an object which stores a value of a certain DataType, has
 default, minimum, and maximum values and can be keyframed for animations.
+Its keyframes are kept compiled into an AnimationCurve, which is
+compiled again after the Parameter is modified. A Parameter notifies
+each of its modifications.
 """
 
 from typing import Type
 
 from data_types.data_type import DataType
+from core.entities.animation_curve import AnimationCurve
 from core.entities.keyframe import Keyframe
+from utils.notification import Notification
+from utils.revision import Revision
 
 
 class Parameter:
@@ -21,6 +27,10 @@ class Parameter:
     _min_value: DataType
     _max_value: DataType
     _keyframe_list: list[Keyframe]
+    _animation_curve: AnimationCurve
+    _revision: int
+
+    changed: Notification
 
     def __init__(self,
                  accepts_keyframes: bool = True,
@@ -40,6 +50,9 @@ class Parameter:
 
         self._keyframe_list = []
         self._keyframe_at_frame_dict = dict()
+        self._animation_curve = None
+        self._revision = Revision.next()
+        self.changed = Notification()
 
     def get_current_value(self) -> DataType:
         """Return the current value stored in the Parameter."""
@@ -48,11 +61,37 @@ class Parameter:
     def set_current_value(self, value: DataType):
         """Change the current value stored in the Parameter."""
         self._current_value = value.clip(self._min_value, self._max_value)
+        self.update_revision()
+
+    def get_min_value(self) -> DataType:
+        """Return the minimum value, or None if unbounded."""
+        return self._min_value
+
+    def get_max_value(self) -> DataType:
+        """Return the maximum value, or None if unbounded."""
+        return self._max_value
 
     def get_keyframe_list(self) -> list[Keyframe]:
         """Return a reference to the keyframe list."""
         return self._keyframe_list
 
+    def get_animation_curve(self) -> AnimationCurve:
+        """Return the last compiled keyframes, or None."""
+        return self._animation_curve
+
+    def set_animation_curve(self, animation_curve: AnimationCurve):
+        """Store the compiled keyframes."""
+        self._animation_curve = animation_curve
+
+    def get_revision(self) -> int:
+        """Return the revision of the last change in the Parameter."""
+        return self._revision
+
+    def update_revision(self):
+        """Mark the Parameter as modified, and notify it."""
+        self._revision = Revision.next()
+        self.changed.emit(self)
+
     def accepts_keyframes(self) -> bool:
         """Tell if the parameter accepts keyframes."""
         return self._accepts_keyframes
@@ -19,6 +19,7 @@ class ParameterFlag(Enum):
     """Enumerate all the flags a ParameterTemplate can exhibit."""
 
     DROPDOWN = 0
+    PIXELS = 1
 
 
 class ParameterTemplate:
@@ -0,0 +1,91 @@
+"""
+Asynchronous readback of textures through pixel buffer objects.
+
+The PixelReadback class streams the content of textures into a
+ring of moderngl buffers, used as pixel buffer objects. Starting a
+transfer returns immediately, and the data is only mapped once the
+ring is full, a frame or two later, such that the host keeps
+working while the GPU renders and transfers. Collected pixels are
+written directly into numpy arrays, which the caller may provide
+and reuse, with the data type matching the format of the textures.
+"""
+
+from typing import Hashable
+from collections import deque
+
+import numpy as np
+import moderngl
+
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from core.entities.image_format import ImageFormat
+from utils.image import Image
+
+
+class PixelReadback:
+    """Asynchronous readback of textures through pixel buffer objects."""
+
+    _gl_context: moderngl.Context
+    _depth: int
+    _free_buffers: list[moderngl.Buffer]
+    _transfers: deque[tuple[Hashable, moderngl.Buffer, int, int,
+                            ImageFormat]]
+    # deque(tuple[key, buffer, width, height, image_format])
+
+    def __init__(self, gl_context: moderngl.Context, depth: int = 2):
+        self._gl_context = gl_context
+        self._depth = max(1, depth)
+        self._free_buffers = []
+        self._transfers = deque()
+
+    def submit(self, texture: moderngl.Texture, key: Hashable):
+        """Start reading an RGBA texture back to the host.
+
+        The texture may be modified or released right after, as the
+        transfer is ordered before any later command.
+        """
+        _image_format = ImageFormat.from_dtype(texture.dtype)
+        _size = (texture.width * texture.height * 4
+                 * _image_format.get_item_size())
+        if self._free_buffers:
+            _buffer = self._free_buffers.pop()
+            if _buffer.size != _size:
+                _buffer.orphan(_size)
+        else:
+            _buffer = self._gl_context.buffer(reserve=_size)
+            GPUResourceTracker.adopt(_buffer, "PixelReadback")
+        texture.read_into(_buffer)
+        self._transfers.append((key, _buffer, texture.width,
+                                texture.height, _image_format))
+
+    def is_full(self) -> bool:
+        """Return whether the oldest transfer should be collected."""
+        return len(self._transfers) >= self._depth
+
+    def get_pending_count(self) -> int:
+        """Return the number of transfers which were not collected."""
+        return len(self._transfers)
+
+    def collect(self, out: np.ndarray = None) -> tuple[Hashable, Image]:
+        """Wait for the oldest transfer and return its key and Image.
+
+        The pixels are written into the given array of shape (height,
+        width, 4), whose data type matches the format of the texture,
+        or into a new array if none is given.
+        """
+        _key, _buffer, _width, _height, _image_format = \
+            self._transfers.popleft()
+        if out is None:
+            out = np.empty((_height, _width, 4),
+                           dtype=_image_format.get_numpy_dtype())
+        _buffer.read_into(out)
+        self._free_buffers.append(_buffer)
+        return _key, Image(_width, _height, data_array=out)
+
+    def release(self):
+        """Release all the buffers, dropping pending transfers."""
+        for _key, _buffer, _width, _height, _format in self._transfers:
+            GPUResourceTracker.release(_buffer)
+        self._transfers.clear()
+        for _buffer in self._free_buffers:
+            GPUResourceTracker.release(_buffer)
+        self._free_buffers.clear()
@@ -5,12 +5,21 @@ A RenderContext is used to provide a ModifierProgram with various
 information about the rendering context, such as the Layer dimensions,
 as well as the source and destination textures, and a ModernGL context
 for running shaders if needed...
+
+The textures may only hold a region of the Layer, such as the part
+which is visible within the sequence. The region is given as a tuple
+(x, y, width, height) in the pixel coordinates of the Layer.
+
+Textures use the working image format of the sequence, which shaders
+get as the 'IMAGE_FORMAT' macro, to be used as the format qualifier
+of their image variables.
 """
 
 import moderngl
 
 from core.entities.gl_context import GLContext
-from core.entities.sequence_context import SequenceContext
+from core.entities.image_format import ImageFormat
+from core.entities.sequence_context import SequenceContext, RenderQuality
 
 
 class RenderContext:
@@ -18,33 +27,79 @@ class RenderContext:
 
     _width: int
     _height: int
+    _region: tuple[int, int, int, int]
     _src_texture: moderngl.Texture
     _dest_texture: moderngl.Texture
     _sequence_context: SequenceContext
+    _modifier_name_id: str
 
     def __init__(self,
                  width: int,
                  height: int,
-                 sequence_context: SequenceContext):
+                 sequence_context: SequenceContext,
+                 region: tuple[int, int, int, int] = None):
         self._width = width
         self._height = height
+        if region is None:
+            region = (0, 0, width, height)
+        self._region = region
         self._sequence_context = sequence_context
         self._src_texture = None
         self._dest_texture = None
+        self._modifier_name_id = ""
 
     def get_sequence_context(self) -> SequenceContext:
         """Return the sequence context."""
         return self._sequence_context
 
     def release_dest_texture(self):
-        """Release the destination moderngl texture."""
-        if self._dest_texture is not None:
-            self._dest_texture.release()
+        """Give the destination moderngl texture back to the pool."""
+        if (self._dest_texture is not None
+                and self._dest_texture is not self._src_texture):
+            GLContext.get_texture_pool().release(self._dest_texture)
+        self._dest_texture = None
 
     def get_gl_context(self) -> moderngl.Context:
         """Return the moderngl context."""
         return GLContext.get_context()
 
+    def set_modifier_name_id(self, name_id: str):
+        """Set the name id of the Modifier currently being applied."""
+        self._modifier_name_id = name_id
+
+    def compute_shader_once(self,
+                            glsl_code: str,
+                            shader_name_id: str = "main"
+                            ) -> moderngl.ComputeShader:
+        """Return a compute shader, compiling it only the first time.
+
+        The 'IMAGE_FORMAT' macro is defined as the GLSL format of the
+        textures, such as 'rgba32f'.
+        """
+        return GLContext.compute_shader_once(
+            f"{self._modifier_name_id}.{shader_name_id}", glsl_code,
+            self.get_image_format().get_shader_defines())
+
+    def get_image_format(self) -> ImageFormat:
+        """Return the image format of the textures."""
+        return self._sequence_context.get_image_format()
+
+    def get_resolution_scale(self) -> float:
+        """Return the ratio between the render and sequence dimensions.
+
+        Parameters flagged as 'pixels' are already scaled by this
+        ratio when they reach a modifier.
+        """
+        return self._sequence_context.get_resolution_scale()
+
+    def get_quality(self) -> RenderQuality:
+        """Return the quality level of the render."""
+        return self._sequence_context.get_quality()
+
+    def is_draft(self) -> bool:
+        """Tell if the render is a draft, which may be less accurate."""
+        return self._sequence_context.get_quality() is RenderQuality.DRAFT
+
     def get_width(self) -> int:
         """Return the width of the Layer."""
         return self._width
@@ -53,25 +108,52 @@ class RenderContext:
         """Return the height of the Layer."""
         return self._height
 
+    def get_region(self) -> tuple[int, int, int, int]:
+        """Return the region of the Layer held by the textures."""
+        return self._region
+
+    def get_region_offset(self) -> tuple[int, int]:
+        """Return the position of the region within the Layer."""
+        return self._region[0], self._region[1]
+
+    def get_region_width(self) -> int:
+        """Return the width of the region, which is the texture width."""
+        return self._region[2]
+
+    def get_region_height(self) -> int:
+        """Return the height of the region, which is the texture height."""
+        return self._region[3]
+
+    def _acquire_texture(self) -> moderngl.Texture:
+        """Acquire a texture of the region dimensions from the pool."""
+        return GLContext.get_texture_pool().acquire(
+            self.get_region_width(), self.get_region_height(),
+            dtype=self.get_image_format().get_dtype())
+
     def get_src_texture(self) -> moderngl.Texture:
-        """Return the destination moderngl texture."""
+        """Return the source moderngl texture."""
         if self._src_texture is None:
-            self._src_texture = self.get_gl_context().texture(
-                (self.get_width(), self.get_height()), 4, dtype="f4")
+            self._src_texture = self._acquire_texture()
         return self._src_texture
 
     def get_dest_texture(self) -> moderngl.Texture:
         """Return the destination moderngl texture."""
         if self._dest_texture is None:
-            self._dest_texture = self.get_gl_context().texture(
-                (self.get_width(), self.get_height()), 4, dtype="f4")
+            self._dest_texture = self._acquire_texture()
         return self._dest_texture
 
     def roll_textures(self):
-        """Replace src texture with dest texture, and clear dest texture."""
+        """Replace src texture with dest texture, and reset dest texture.
+
+        The previous src texture is given back to the pool, and a new
+        dest texture is acquired the next time it is requested.
+        """
+        _previous_src_texture = self._src_texture
         self._src_texture = self.get_dest_texture()
-        self._dest_texture = self.get_gl_context().texture(
-            (self.get_width(), self.get_height()), 4, dtype="f4")
+        self._dest_texture = None
+        if (_previous_src_texture is not None
+                and _previous_src_texture is not self._src_texture):
+            GLContext.get_texture_pool().release(_previous_src_texture)
     
     def pass_through(self):
         """Copy the src texture onto the dest texture."""
@@ -0,0 +1,191 @@
+"""
+Precompiled plan for rendering the frames of a Sequence.
+
+A RenderPlan holds what the rendering pipeline would otherwise look
+up again for every frame: the visual layers of the sequence, the
+parameters of their geometry and content, and for each
+modifier its template, apply function, parameters, and which of them
+are measured in pixels. Modifiers before the last WRITEONLY one are
+skipped, and consecutive pointwise modifiers are grouped into a
+single pass. The plan also indexes the frames during which its
+layers are active, from the same snapshot of the layer list, so that
+layer ids found in the index always have a layer plan. A plan only
+stays valid as long as the structure of its sequence, which is its
+layers, their timing and their modifiers, does not change; parameter
+values are read at render time.
+"""
+
+from typing import Callable
+
+from core.entities.layer_interval_index import LayerIntervalIndex
+from core.entities.modifier import Modifier
+from core.entities.modifier_template import ModifierTemplate
+from core.entities.parameter import Parameter
+from core.entities.visual_layer import VisualLayer
+
+
+class ModifierStep:
+    """A Modifier of a layer, resolved for rendering."""
+
+    _modifier: Modifier
+    _name_id: str
+    _template: ModifierTemplate
+    _parameter_list: list[Parameter]
+    _pixel_flags: list[bool]
+
+    def __init__(self,
+                 modifier: Modifier,
+                 template: ModifierTemplate,
+                 pixel_flags: list[bool]):
+        self._modifier = modifier
+        self._name_id = modifier.get_template_id()
+        self._template = template
+        self._parameter_list = modifier.get_parameter_list()
+        self._pixel_flags = pixel_flags
+
+    def get_modifier(self) -> Modifier:
+        """Return the Modifier."""
+        return self._modifier
+
+    def get_name_id(self) -> str:
+        """Return the name id of the ModifierTemplate."""
+        return self._name_id
+
+    def get_template(self) -> ModifierTemplate:
+        """Return the ModifierTemplate."""
+        return self._template
+
+    def get_parameter_list(self) -> list[Parameter]:
+        """Return the parameters, in the order of the template."""
+        return self._parameter_list
+
+    def get_pixel_flags(self) -> list[bool]:
+        """Return whether each parameter is measured in pixels."""
+        return self._pixel_flags
+
+
+class RenderPass:
+    """One or several modifiers applied by a single dispatch.
+
+    A pass either calls the apply function of a single modifier, or
+    runs the fused shader of a chain of pointwise modifiers.
+    """
+
+    _steps: list[ModifierStep]
+    _apply_function: Callable
+    _chain: tuple[str, ...]
+
+    def __init__(self,
+                 steps: list[ModifierStep],
+                 apply_function: Callable = None):
+        self._steps = steps
+        self._apply_function = apply_function
+        self._chain = tuple(_step.get_name_id() for _step in steps)
+
+    def get_steps(self) -> list[ModifierStep]:
+        """Return the modifiers applied by the pass."""
+        return self._steps
+
+    def get_apply_function(self) -> Callable:
+        """Return the apply function, or None for a pointwise chain."""
+        return self._apply_function
+
+    def get_chain(self) -> tuple[str, ...]:
+        """Return the name ids of the modifiers of the pass."""
+        return self._chain
+
+
+class LayerPlan:
+    """Plan for rendering a VisualLayer."""
+
+    _layer: VisualLayer
+    _render_function: Callable
+    _transform_parameters: list[Parameter]
+    _content_parameters: list[Parameter]
+    _steps: list[ModifierStep]
+    _passes: list[RenderPass]
+
+    def __init__(self,
+                 layer: VisualLayer,
+                 render_function: Callable,
+                 steps: list[ModifierStep],
+                 passes: list[RenderPass]):
+        self._layer = layer
+        self._render_function = render_function
+        self._transform_parameters = [
+            layer.get_property_parameter(_name_id)
+            for _name_id in ("position", "anchor", "scale",
+                             "rotation", "opacity")]
+        self._content_parameters = layer.get_content_parameters()
+        self._steps = steps
+        self._passes = passes
+
+    def get_layer(self) -> VisualLayer:
+        """Return the layer."""
+        return self._layer
+
+    def get_render_function(self) -> Callable:
+        """Return the function rendering the layer from its plan.
+
+        It takes the plan, a SequenceContext and a region.
+        """
+        return self._render_function
+
+    def get_transform_parameters(self) -> list[Parameter]:
+        """Return the position, anchor, scale, rotation and opacity."""
+        return self._transform_parameters
+
+    def get_content_parameters(self) -> list[Parameter]:
+        """Return the parameters affecting the untransformed layer."""
+        return self._content_parameters
+
+    def get_content_revision(self) -> int:
+        """Return the revision of the last change in the layer content."""
+        _revision = self._layer.get_revision()
+        for _parameter in self._content_parameters:
+            _revision = max(_revision, _parameter.get_revision())
+        return _revision
+
+    def get_steps(self) -> list[ModifierStep]:
+        """Return all the modifiers of the layer, in order."""
+        return self._steps
+
+    def get_passes(self) -> list[RenderPass]:
+        """Return the passes to apply, from the last WRITEONLY one."""
+        return self._passes
+
+
+class RenderPlan:
+    """Precompiled plan for rendering the frames of a Sequence."""
+
+    _revision: int
+    _layer_plans: list[LayerPlan]
+    # list(layer_id => LayerPlan, or None if the layer is not visual)
+    _interval_index: LayerIntervalIndex
+
+    def __init__(self,
+                 revision: int,
+                 layer_plans: list[LayerPlan],
+                 interval_index: LayerIntervalIndex):
+        """Create a plan, given an index of the same layers."""
+        self._revision = revision
+        self._layer_plans = layer_plans
+        self._interval_index = interval_index
+
+    def get_revision(self) -> int:
+        """Return the structural revision of the planned sequence."""
+        return self._revision
+
+    def get_layer_plan(self, layer_id: int) -> LayerPlan:
+        """Return the plan of a layer, or None if it is not visual."""
+        return self._layer_plans[layer_id]
+
+    def get_active_layer_ids(self, frame: int) -> list[int]:
+        """Return the ids of the planned layers active at a frame."""
+        return self._interval_index.get_layers_at(frame)
+
+    def get_active_layer_ids_over(self,
+                                  start: int,
+                                  end: int) -> list[int]:
+        """Return the ids of planned layers active within [start, end)."""
+        return self._interval_index.get_layers_over(start, end)
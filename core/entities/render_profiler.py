@@ -0,0 +1,177 @@
+"""
+GPU and CPU timing of the steps of renders.
+
+The RenderProfiler class times the steps of each rendered frame,
+such as applying a modifier, compositing a layer, or tone mapping.
+GPU time is measured with OpenGL timer queries, and CPU time is the
+time spent submitting the step. Timer queries cannot be nested, so
+only the innermost steps are timed. Each thread keeps a pool of the
+timer queries of its context, which are used again by later frames
+once their results are read. Reports of the last frames are kept,
+and can be retrieved from any thread.
+
+Reading the queries waits for the GPU at the end of each frame, so
+profiling slows rendering down and is disabled by default.
+"""
+
+from typing import ContextManager
+from contextlib import contextmanager, nullcontext
+from collections import deque
+import threading
+import time
+
+import moderngl
+
+from core.entities.gl_context import GLContext
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from utils.config import Config
+
+
+_NO_STEP = nullcontext()
+
+
+class RenderProfiler:
+    """GPU and CPU timing of the steps of renders."""
+
+    _enabled: bool = None
+    _history: deque = None
+    # deque(dict[label, cpu_ms, gpu_ms, steps])
+    _lock: threading.Lock = threading.Lock()
+    _thread_data: threading.local = threading.local()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Return whether renders are profiled."""
+        if cls._enabled is None:
+            cls._enabled = Config.render.profiling
+        return cls._enabled
+
+    @classmethod
+    def set_enabled(cls, enabled: bool = True):
+        """Enable or disable profiling, from the next frame on."""
+        cls._enabled = enabled
+
+    @classmethod
+    def _get_query_pool(cls) -> list[moderngl.Query]:
+        """Return the unused timer queries of the calling thread."""
+        _query_pool = getattr(cls._thread_data, "query_pool", None)
+        if _query_pool is None:
+            _query_pool = cls._thread_data.query_pool = []
+        return _query_pool
+
+    @classmethod
+    def _acquire_query(cls) -> moderngl.Query:
+        """Return an unused timer query of the calling thread."""
+        _query_pool = cls._get_query_pool()
+        if _query_pool:
+            return _query_pool.pop()
+        _query = GLContext.get_context().query(time=True)
+        GPUResourceTracker.adopt(_query, "RenderProfiler")
+        return _query
+
+    @classmethod
+    def begin_frame(cls, label: str):
+        """Start timing a frame on the calling thread."""
+        _frame = getattr(cls._thread_data, "frame", None)
+        if _frame is not None:
+            # The previous frame was interrupted.
+            cls._get_query_pool().extend(
+                _query for _, _query, _ in _frame[2])
+        if not cls.is_enabled():
+            cls._thread_data.frame = None
+            return
+        cls._thread_data.frame = (label, time.perf_counter(), [])
+
+    @classmethod
+    def step(cls, *names: str) -> ContextManager:
+        """Return a context manager timing a step of the frame.
+
+        The names are joined with '/', such as the title of a layer
+        followed by the name of a modifier. Nothing is timed unless a
+        frame is being profiled on the calling thread.
+        """
+        _frame = getattr(cls._thread_data, "frame", None)
+        if _frame is None:
+            return _NO_STEP
+        return cls._time_step("/".join(names), _frame[2])
+
+    @classmethod
+    @contextmanager
+    def _time_step(cls,
+                   name: str,
+                   steps: list[tuple[str, moderngl.Query, float]]):
+        """Time a step with a timer query, and record it."""
+        _query = cls._acquire_query()
+        _start = time.perf_counter()
+        try:
+            with _query:
+                yield
+        finally:
+            steps.append((name, _query, time.perf_counter() - _start))
+
+    @classmethod
+    def end_frame(cls):
+        """Finish timing the frame, waiting for the GPU results."""
+        _frame = getattr(cls._thread_data, "frame", None)
+        if _frame is None:
+            return
+        cls._thread_data.frame = None
+        _label, _start, _steps = _frame
+        _step_reports = []
+        _query_pool = cls._get_query_pool()
+        for _name, _query, _cpu_time in _steps:
+            _step_reports.append({"name": _name,
+                                  "cpu_ms": 1000*_cpu_time,
+                                  "gpu_ms": _query.elapsed/1e6})
+            _query_pool.append(_query)
+        _report = {
+            "label": _label,
+            "cpu_ms": 1000*(time.perf_counter() - _start),
+            "gpu_ms": sum(_step["gpu_ms"] for _step in _step_reports),
+            "steps": _step_reports}
+        with cls._lock:
+            if cls._history is None:
+                cls._history = deque(
+                    maxlen=Config.render.profiling_history)
+            cls._history.append(_report)
+
+    @classmethod
+    def get_report(cls, count: int = None) -> list[dict]:
+        """Return the reports of the last frames, oldest first.
+
+        Each report is a dict with the 'label' of the frame, its
+        total 'cpu_ms' and 'gpu_ms', and its 'steps', a list of dict
+        with the 'name', 'cpu_ms' and 'gpu_ms' of each step.
+        """
+        with cls._lock:
+            _reports = list(cls._history or [])
+        if count is not None:
+            _reports = _reports[-count:] if count > 0 else []
+        return _reports
+
+    @classmethod
+    def get_step_summary(cls, count: int = None) -> list[dict]:
+        """Return the time spent in each step over the last frames.
+
+        Steps are grouped by name, into a dict with the 'name', the
+        number of 'calls', and the total 'cpu_ms' and 'gpu_ms', sorted
+        from the most expensive on the GPU.
+        """
+        _summary = dict()
+        for _report in cls.get_report(count):
+            for _step in _report["steps"]:
+                _entry = _summary.setdefault(
+                    _step["name"], {"name": _step["name"], "calls": 0,
+                                    "cpu_ms": 0., "gpu_ms": 0.})
+                _entry["calls"] += 1
+                _entry["cpu_ms"] += _step["cpu_ms"]
+                _entry["gpu_ms"] += _step["gpu_ms"]
+        return sorted(_summary.values(),
+                      key=lambda _entry: _entry["gpu_ms"], reverse=True)
+
+    @classmethod
+    def clear(cls):
+        """Forget the reports of previous frames."""
+        with cls._lock:
+            if cls._history is not None:
+                cls._history.clear()
@@ -4,10 +4,19 @@ Represents a video Sequence within a Project.
 The class Sequence represents a sequence within a Project, which
 holds properties, such as pixel dimensions, duration, or frame rate,
 and a pile of Layer of various types. When rendered, a Sequence
-combines all its visual layers using blend modes.
+combines all its visual layers using blend modes, in the working
+image format of the sequence. A Sequence also holds its last
+compiled RenderPlan, which indexes the frames during which its
+layers are active, such that the plan is released along with the
+sequence. The revisions of the sequence follow the notifications of
+its layers, such that checking whether a plan or a cached frame is
+outdated doesn't go through every layer.
 """
 
+from core.entities.image_format import ImageFormat
 from core.entities.layer import Layer
+from core.entities.render_plan import RenderPlan
+from utils.revision import Revision
 
 
 class Sequence:
@@ -19,19 +28,28 @@ class Sequence:
     _duration: int
     _frame_rate: float
     _layer_list: list[Layer]
+    _image_format: ImageFormat
+    _render_plan: RenderPlan
+    _revision: int
+    _structure_revision: int
+    _render_revision: int
 
     def __init__(self,
                  title: str,
                  width: int,
                  height: int,
                  duration: int,
-                 frame_rate: float):
+                 frame_rate: float,
+                 image_format: ImageFormat = ImageFormat.FLOAT32):
+        self._revision = Revision.next()
         self.set_title(title)
         self.set_width(width)
         self.set_height(height)
         self.set_duration(duration)
         self.set_frame_rate(frame_rate)
+        self.set_image_format(image_format)
         self._layer_list = []
+        self._render_plan = None
 
     def get_width(self) -> int:
         """Return the sequence width."""
@@ -56,10 +74,12 @@ class Sequence:
     def set_width(self, width: int):
         """Set the sequence width."""
         self._width = width
+        self.update_revision()
 
     def set_height(self, height: int):
         """Set the sequence height."""
         self._height = height
+        self.update_revision()
     
     def set_title(self, title: str):
         """Set the sequence title."""
@@ -68,10 +88,24 @@ class Sequence:
     def set_frame_rate(self, frame_rate: float):
         """Set the sequence frame rate."""
         self._frame_rate = frame_rate
+        self.update_revision()
     
     def set_duration(self, frames: int):
         """Set the sequence duration."""
         self._duration = frames
+        self.update_revision()
+
+    def get_image_format(self) -> ImageFormat:
+        """Return the format in which the sequence is rendered."""
+        return self._image_format
+
+    def set_image_format(self, image_format: ImageFormat):
+        """Set the format in which the sequence is rendered."""
+        if not image_format.is_working_format():
+            raise ValueError(f"Sequences can't be rendered in "
+                             f"{image_format.get_title()} format")
+        self._image_format = image_format
+        self.update_revision()
 
     def get_layer_list(self) -> list[Layer]:
         """Return a reference to the layer list."""
@@ -80,3 +114,51 @@ class Sequence:
     def get_layer(self, layer_id: int) -> Layer:
         """Return a reference to a layer given its index."""
         return self._layer_list[layer_id]
+
+    def add_layer(self, layer: Layer) -> int:
+        """Add a Layer on top of the others, and return its id."""
+        self._layer_list.append(layer)
+        layer.changed.connect(self._on_layer_changed)
+        self.update_revision()
+        return len(self._layer_list)-1
+
+    def get_render_plan(self) -> RenderPlan:
+        """Return the last compiled render plan, or None."""
+        return self._render_plan
+
+    def set_render_plan(self, render_plan: RenderPlan):
+        """Keep the last compiled render plan of the sequence."""
+        self._render_plan = render_plan
+
+    def get_revision(self) -> int:
+        """Return the revision of the last structural change.
+
+        Structural changes are changes in the sequence settings
+        or in its list of layers, not within the layers.
+        """
+        return self._revision
+
+    def update_revision(self):
+        """Mark the Sequence structure as modified."""
+        self._revision = Revision.next()
+        self._structure_revision = self._revision
+        self._render_revision = self._revision
+
+    def get_structure_revision(self) -> int:
+        """Return the revision of the last change in the structure.
+
+        This includes the structural changes within the layers, such
+        as their timing or their list of modifiers.
+        """
+        return self._structure_revision
+
+    def get_render_revision(self) -> int:
+        """Return the revision of the last change affecting renders."""
+        return self._render_revision
+
+    def _on_layer_changed(self, layer: Layer):
+        """Update the revisions after a layer changed."""
+        self._structure_revision = max(self._structure_revision,
+                                       layer.get_revision())
+        self._render_revision = max(self._render_revision,
+                                    layer.get_render_revision())
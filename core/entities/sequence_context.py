@@ -4,14 +4,30 @@ Provides useful information about the sequence context.
 A SequenceContext is used to provide a ModifierProgram with various
 information about the sequence context, such as the current frame number,
 the sequence dimensions, and so on...
+
+A sequence may be rendered at a reduced resolution for previewing, in
+which case the dimensions are those of the reduced render. It may also
+be rendered at a draft quality, which trades accuracy for speed while
+the user is interacting. Textures use the working image format of
+the sequence.
 """
 
+from enum import Enum
+
 import moderngl
 
 from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
 from core.entities.sequence import Sequence
 
 
+class RenderQuality(Enum):
+    """Enumerate the quality levels of a render."""
+
+    DRAFT = 0
+    FULL = 1
+
+
 class SequenceContext:
     """Provides useful information about the sequence context."""
 
@@ -20,18 +36,40 @@ class SequenceContext:
     _duration: int
     _frame_rate: float
     _current_frame: int
+    _resolution_scale: float
+    _quality: RenderQuality
+    _image_format: ImageFormat
 
-    def __init__(self, sequence: Sequence, current_frame: int):
-        self._width = sequence.get_width()
-        self._height = sequence.get_height()
+    def __init__(self,
+                 sequence: Sequence,
+                 current_frame: int,
+                 resolution_scale: float = 1,
+                 quality: RenderQuality = RenderQuality.FULL):
+        self._resolution_scale = resolution_scale
+        self._quality = quality
+        self._width = max(1, round(sequence.get_width()*resolution_scale))
+        self._height = max(1, round(sequence.get_height()*resolution_scale))
         self._duration = sequence.get_duration()
         self._frame_rate = sequence.get_frame_rate()
         self._current_frame = current_frame
+        self._image_format = sequence.get_image_format()
 
     def get_current_frame(self) -> int:
         """Return the current frame number."""
         return self._current_frame
     
+    def get_resolution_scale(self) -> float:
+        """Return the ratio between the render and sequence dimensions."""
+        return self._resolution_scale
+
+    def get_quality(self) -> RenderQuality:
+        """Return the quality level of the render."""
+        return self._quality
+
+    def get_image_format(self) -> ImageFormat:
+        """Return the working image format of the render."""
+        return self._image_format
+
     def get_width(self) -> int:
         """Return the sequence width."""
         return self._width
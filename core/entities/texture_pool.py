@@ -0,0 +1,165 @@
+"""
+Pool of reusable moderngl textures.
+
+The TexturePool class keeps released textures in a bounded free
+list, keyed by size and format, such that the rendering pipeline
+can reuse them instead of allocating GPU memory for every frame.
+It also keeps one framebuffer per texture, created on demand, and
+counts the memory of the textures it allocated, which are either in
+use or free, along with its peak. The textures in use are known by
+their OpenGL name, such that giving one back twice is an error
+rather than a texture handed out to two users. When tracking GPU
+resources, textures in use belong to the frame using them, and only
+free textures are owned by the pool.
+"""
+
+import moderngl
+
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+
+
+class TexturePool:
+    """Pool of reusable moderngl textures."""
+
+    _gl_context: moderngl.Context
+    _max_free_textures: int
+    _free_list: list[tuple[tuple, moderngl.Texture]]
+    _used_textures: set[int]
+    # set(glo of the textures handed out)
+    _framebuffers: dict[int, moderngl.Framebuffer]
+    _allocated_bytes: int
+    _peak_bytes: int
+    _allocation_count: int
+    _reuse_count: int
+
+    def __init__(self,
+                 gl_context: moderngl.Context,
+                 max_free_textures: int = 16):
+        self._gl_context = gl_context
+        self._max_free_textures = max_free_textures
+        self._free_list = []
+        self._used_textures = set()
+        self._framebuffers = dict()
+        self._allocated_bytes = 0
+        self._peak_bytes = 0
+        self._allocation_count = 0
+        self._reuse_count = 0
+
+    @staticmethod
+    def _texture_key(width: int,
+                     height: int,
+                     components: int,
+                     dtype: str,
+                     samples: int) -> tuple:
+        """Return the key identifying a texture size and format."""
+        return (width, height, components, dtype, samples)
+
+    @staticmethod
+    def _texture_bytes(width: int,
+                       height: int,
+                       components: int,
+                       dtype: str,
+                       samples: int) -> int:
+        """Return the memory taken by a texture, such as 'f4' ones."""
+        return width*height*components*int(dtype[1:])*max(1, samples)
+
+    def acquire(self,
+                width: int,
+                height: int,
+                components: int = 4,
+                dtype: str = "f4",
+                samples: int = 0
+                ) -> moderngl.Texture:
+        """Return a texture, reusing a free one when possible.
+
+        The content of a reused texture is undefined.
+        """
+        _key = self._texture_key(width, height, components, dtype, samples)
+        for _index in range(len(self._free_list)-1, -1, -1):
+            if self._free_list[_index][0] == _key:
+                self._reuse_count += 1
+                _texture = self._free_list.pop(_index)[1]
+                self._used_textures.add(_texture.glo)
+                GPUResourceTracker.lend(_texture)
+                return _texture
+        self._allocation_count += 1
+        self._allocated_bytes += self._texture_bytes(*_key)
+        self._peak_bytes = max(self._peak_bytes, self._allocated_bytes)
+        _texture = self._gl_context.texture(
+            (width, height), components, dtype=dtype, samples=samples)
+        self._used_textures.add(_texture.glo)
+        return _texture
+
+    def release(self, texture: moderngl.Texture):
+        """Give a texture back to the pool.
+
+        Raise a ValueError if the texture isn't handed out by the
+        pool, such as when it was already given back.
+        """
+        if texture.glo not in self._used_textures:
+            raise ValueError(f"Texture {texture.glo} isn't in use from "
+                             f"this pool, it may be released twice")
+        self._used_textures.discard(texture.glo)
+        GPUResourceTracker.adopt(texture, "TexturePool")
+        _key = self._texture_key(texture.width, texture.height,
+                                 texture.components, texture.dtype,
+                                 texture.samples)
+        if texture.samples == 0:
+            # Restore the default sampling state.
+            texture.repeat_x = True
+            texture.repeat_y = True
+            texture.filter = moderngl.LINEAR, moderngl.LINEAR
+        self._free_list.append((_key, texture))
+        if len(self._free_list) > self._max_free_textures:
+            _key, _oldest_texture = self._free_list.pop(0)
+            self._destroy(_oldest_texture)
+
+    def get_framebuffer(self,
+                        texture: moderngl.Texture
+                        ) -> moderngl.Framebuffer:
+        """Return a framebuffer with the texture as color attachment."""
+        _framebuffer = self._framebuffers.get(texture.glo)
+        if _framebuffer is None:
+            _framebuffer = self._gl_context.framebuffer(
+                color_attachments=[texture])
+            GPUResourceTracker.adopt(_framebuffer, "TexturePool")
+            self._framebuffers[texture.glo] = _framebuffer
+        return _framebuffer
+
+    def clear(self):
+        """Release all the free textures."""
+        for _key, _texture in self._free_list:
+            self._destroy(_texture)
+        self._free_list.clear()
+
+    def get_allocated_bytes(self) -> int:
+        """Return the memory of the textures allocated by the pool."""
+        return self._allocated_bytes
+
+    def get_peak_bytes(self) -> int:
+        """Return the largest allocated memory since the last reset."""
+        return self._peak_bytes
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the counters of the pool, such as for benchmarks."""
+        return {"allocated_bytes": self._allocated_bytes,
+                "peak_bytes": self._peak_bytes,
+                "allocation_count": self._allocation_count,
+                "reuse_count": self._reuse_count,
+                "free_count": len(self._free_list)}
+
+    def reset_stats(self):
+        """Reset the peak memory to the current one, and the counters."""
+        self._peak_bytes = self._allocated_bytes
+        self._allocation_count = 0
+        self._reuse_count = 0
+
+    def _destroy(self, texture: moderngl.Texture):
+        """Release a texture and its framebuffer."""
+        self._allocated_bytes -= self._texture_bytes(
+            texture.width, texture.height, texture.components,
+            texture.dtype, texture.samples)
+        _framebuffer = self._framebuffers.pop(texture.glo, None)
+        if _framebuffer is not None:
+            GPUResourceTracker.release(_framebuffer)
+        GPUResourceTracker.release(texture)
@@ -9,12 +9,16 @@ rotation, opacity, or blend mode...
 from data_types.number import Number
 from data_types.vector2 import Vector2
 from core.entities.layer import Layer
+from core.entities.parameter import Parameter
 from core.entities.parameter_template import ParameterTemplate
 
 
 class VisualLayer(Layer):
     """Represents a generic visual layer with basic geometry."""
 
+    _transform_properties: tuple[str, ...] = (
+        "position", "anchor", "scale", "rotation", "opacity")
+
     _properties_templates: dict[str, ParameterTemplate] = {
         "position": ParameterTemplate(
             "position", Vector2, "Position", Vector2([.5, .5])),
@@ -34,3 +38,17 @@ class VisualLayer(Layer):
                  start_frame: int,
                  end_frame: int):
         super().__init__(title, start_frame, end_frame)
+
+    def get_content_parameters(self) -> list[Parameter]:
+        """Return the parameters affecting the untransformed layer.
+
+        These are the layer properties which are not part of its
+        geometry, followed by the parameters of its modifiers.
+        """
+        _parameter_list = [
+            self.get_property_parameter(_name_id)
+            for _name_id in self.get_properties_templates()
+            if _name_id not in self._transform_properties]
+        for _modifier in self.get_modifier_list():
+            _parameter_list.extend(_modifier.get_parameter_list())
+        return _parameter_list
@@ -3,15 +3,20 @@ Service concerning animation in general.
 
 The AnimationService class defines services within the core
 package, concerning animation capabilities. This includes
-keyframing, interpolating between keyframes...
+keyframing, interpolating between keyframes, at a single frame or
+over whole arrays of frames...
 """
 
 from typing import Union
 
+import numpy as np
+
 from data_types.data_type import DataType
 from core.entities.parameter import Parameter
 from core.entities.parameter_template import ParameterTemplate
 from core.entities.keyframe import Keyframe
+from core.entities.animation_curve import AnimationCurve
+from utils.trace import Trace
 
 
 class AnimationService:
@@ -26,6 +31,7 @@ class AnimationService:
             _list = parameter.get_keyframe_list()
             _list.append(keyframe)
             _list.sort(key=lambda _keyframe: _keyframe.get_frame())
+            parameter.update_revision()
 
     @staticmethod
     def remove_keyframe_at_frame(parameter: Parameter, frame: int):
@@ -37,48 +43,71 @@ class AnimationService:
                 _frame = _keyframe.get_frame()
                 if _frame == frame:
                     _list.pop(_index)
+                    parameter.update_revision()
                 if _frame >= frame:
                     break
 
     @staticmethod
-    def get_value_at_frame(parameter: Parameter,
+    def is_animated(parameter: Parameter) -> bool:
+        """Tell if the value of a parameter varies over time."""
+        return (parameter.accepts_keyframes()
+                and len(parameter.get_keyframe_list()) > 1)
+
+    @staticmethod
+    def get_animation_curve(parameter: Parameter) -> AnimationCurve:
+        """Return the compiled keyframes of a parameter.
+
+        The keyframes are compiled again after any change of the
+        parameter.
+        """
+        _revision = parameter.get_revision()
+        _animation_curve = parameter.get_animation_curve()
+        if (_animation_curve is None
+                or _animation_curve.get_revision() != _revision):
+            _animation_curve = AnimationCurve(
+                _revision, parameter.get_keyframe_list())
+            parameter.set_animation_curve(_animation_curve)
+        return _animation_curve
+
+    @classmethod
+    @Trace.traced("animation")
+    def get_value_at_frame(cls,
+                           parameter: Parameter,
                            frame: Union[int, float]) -> DataType:
         """Retrieve the value of a parameter at a given frame."""
         if not parameter.accepts_keyframes():
             # The parameter doesn't accept keyframes.
             return parameter.get_current_value()
 
-        _list = parameter.get_keyframe_list()
-        if len(_list) == 0:
+        if len(parameter.get_keyframe_list()) == 0:
             # There are no keyframes.
             return parameter.get_current_value()
 
-        if len(_list) == 1:
-            # There is only one keyframe.
-            return _list[0].get_value()
+        return cls.get_animation_curve(parameter).get_value_at_frame(frame)
 
-        # There are at least two keyframes.
-        for _index in range(len(_list)):
-            _keyframe_b = _list[_index]
-            _frame_b = _keyframe_b.get_frame()
-
-            if _frame_b == frame:
-                # The frame has a keyframe.
-                return _keyframe_b.get_value()
-
-            if _frame_b > frame:
-                if _index == 0:
-                    # The frame is before the first keyframe.
-                    return _keyframe_b.get_value()
-
-                # The frame is between two keyframes.
-                _keyframe_a = _list[_index-1]
-                _frame_a = _keyframe_a.get_frame()
-                _t = (frame-_frame_a)/(_frame_b-_frame_a)
-                return _keyframe_a.interpolate_to(_keyframe_b, _t)
-
-        # The frame is after the last keyframe.
-        return _list[-1].get_value()
+    @classmethod
+    @Trace.traced("animation")
+    def get_values_at_frames(cls,
+                             parameter: Parameter,
+                             frames: np.ndarray) -> np.ndarray:
+        """Retrieve the raw values of a parameter at an array of frames.
+
+        Return an array of shape (T, *value_shape), holding at each
+        of the T frames the raw value of get_value_at_frame, in the
+        dtype of the raw values of the parameter.
+        """
+        _frames = np.asarray(frames, dtype=np.float64)
+        if (not parameter.accepts_keyframes()
+                or len(parameter.get_keyframe_list()) == 0):
+            # The value doesn't vary over time.
+            _raw_value = np.asarray(
+                parameter.get_current_value().get_raw_value())
+            return np.repeat(_raw_value[np.newaxis], len(_frames), axis=0)
+
+        _dtype = np.asarray(parameter.get_keyframe_list()[0].get_value()
+                            .get_raw_value()).dtype
+        return cls.get_animation_curve(parameter).get_values_at_frames(
+            _frames).astype(_dtype, copy=False)
 
     @staticmethod
     def parameter_from_template(parameter_template: ParameterTemplate) -> Parameter:
@@ -0,0 +1,152 @@
+"""
+Service concerning caching in general.
+
+The CacheService class defines services within the core
+package, concerning caching of rendered content. This includes
+storing rendered frames, retrieving them instead of rendering
+again, invalidating them when a sequence is modified...
+"""
+
+import time
+import weakref
+
+import moderngl
+
+from core.entities.frame_cache import FrameCache
+from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
+from core.entities.sequence import Sequence
+from core.entities.sequence_context import RenderQuality
+from core.services.project_service import ProjectService
+from core.services.render_service import RenderService
+from utils.config import Config
+from utils.image import Image
+from utils.trace import Trace
+
+
+class CacheService:
+    """Service concerning caching in general."""
+
+    _sequence_revisions: weakref.WeakKeyDictionary = (
+        weakref.WeakKeyDictionary())
+    # WeakKeyDictionary(frame_cache => dict(sequence_id => revision))
+
+    @staticmethod
+    def get_frame_cache() -> FrameCache:
+        """Return the cache of rendered frames of the calling thread."""
+        return GLContext.get_frame_cache()
+
+    @classmethod
+    def _get_frame_key(cls,
+                       sequence: Sequence,
+                       sequence_id: int,
+                       frame: int,
+                       resolution_scale: float,
+                       quality: RenderQuality,
+                       output_format: ImageFormat) -> tuple:
+        """Return the cache key of a frame, dropping outdated frames."""
+        _revision = sequence.get_render_revision()
+        _revisions = cls._sequence_revisions.setdefault(
+            cls.get_frame_cache(), dict())
+        if _revisions.get(sequence_id) != _revision:
+            # The sequence was modified, all its frames are outdated.
+            cls.invalidate_sequence(sequence_id)
+            _revisions[sequence_id] = _revision
+        return (sequence_id, frame, _revision, resolution_scale, quality,
+                output_format)
+
+    @staticmethod
+    def _is_stored_on_gpu() -> bool:
+        """Return whether frames are cached as textures."""
+        return Config.cache.frame_cache_storage.strip().lower() == "gpu"
+
+    @classmethod
+    @Trace.traced("cache")
+    def request_sequence_frame(cls,
+                               sequence_id: int,
+                               frame: int,
+                               resolution_scale: float = 1,
+                               quality: RenderQuality = RenderQuality.FULL,
+                               output_format: ImageFormat = None
+                               ) -> moderngl.Texture:
+        """Return a rendered frame of a sequence, rendering if needed.
+
+        Frames rendered at different resolution scales, qualities or
+        output formats are cached separately. 8-bit frames take a
+        quarter of the memory of float32 ones.
+
+        The returned texture belongs to the caller, who must give it
+        back with RenderService.release_texture when done with it.
+        """
+        _sequence = ProjectService.get_sequence_by_id(sequence_id)
+        _key = cls._get_frame_key(_sequence, sequence_id, frame,
+                                  resolution_scale, quality, output_format)
+        _frame_cache = cls.get_frame_cache()
+        _content = _frame_cache.get(_key)
+        if _content is not None:
+            Trace.instant("frame cache hit", "cache", frame=frame)
+            if isinstance(_content, moderngl.Texture):
+                return RenderService.copy_texture(_content)
+            return RenderService.texture_from_image(_content)
+
+        _start_time = time.perf_counter()
+        _texture = RenderService.render_sequence_frame(
+            _sequence, frame, resolution_scale, quality, output_format)
+        if cls._is_stored_on_gpu():
+            _content = RenderService.copy_texture(_texture)
+            GLContext.get_context().finish()
+        else:
+            _content = RenderService.image_from_texture(_texture)
+        _cost = time.perf_counter() - _start_time
+        _frame_cache.put(_key, _content, _cost)
+        return _texture
+
+    @classmethod
+    @Trace.traced("cache")
+    def request_sequence_image(cls,
+                               sequence_id: int,
+                               frame: int,
+                               resolution_scale: float = 1,
+                               quality: RenderQuality = RenderQuality.FULL,
+                               output_format: ImageFormat = None
+                               ) -> Image:
+        """Return a rendered frame of a sequence as an Image.
+
+        This is request_sequence_frame for callers needing the pixels
+        on the host: frames cached in memory are returned as they
+        are, without going through a texture, and frames are only
+        rendered and read back when they are not cached. The
+        returned Image may be shared with the cache, and must not be
+        modified.
+        """
+        _sequence = ProjectService.get_sequence_by_id(sequence_id)
+        _key = cls._get_frame_key(_sequence, sequence_id, frame,
+                                  resolution_scale, quality, output_format)
+        _frame_cache = cls.get_frame_cache()
+        _content = _frame_cache.get(_key)
+        if _content is not None:
+            Trace.instant("frame cache hit", "cache", frame=frame)
+            if isinstance(_content, moderngl.Texture):
+                return RenderService.image_from_texture(_content)
+            return _content
+
+        _start_time = time.perf_counter()
+        _texture = RenderService.render_sequence_frame(
+            _sequence, frame, resolution_scale, quality, output_format)
+        with Trace.span("read back frame", "render"):
+            _image = RenderService.image_from_texture(_texture)
+        if cls._is_stored_on_gpu():
+            # The rendered texture is kept instead of a copy.
+            _frame_cache.put(_key, _texture,
+                             time.perf_counter() - _start_time)
+        else:
+            RenderService.release_texture(_texture)
+            _frame_cache.put(_key, _image,
+                             time.perf_counter() - _start_time)
+        return _image
+
+    @classmethod
+    def invalidate_sequence(cls, sequence_id: int):
+        """Remove the cached frames of a sequence, in this thread."""
+        cls.get_frame_cache().remove_if(
+            lambda _key: _key[0] == sequence_id)
@@ -0,0 +1,241 @@
+"""
+Service concerning exporting in general.
+
+The ExportService class defines services within the core
+package, concerning the export of rendered content to files.
+This includes rendering a range of frames of a Sequence and
+writing them to disk as images, possibly sharing the frames
+between several processes...
+"""
+
+from typing import Callable, Iterable, Iterator
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from configparser import ConfigParser
+from multiprocessing.sharedctypes import Synchronized
+import multiprocessing
+import queue
+
+import numpy as np
+
+from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
+from core.entities.pixel_readback import PixelReadback
+from core.entities.sequence import Sequence
+from core.services.modifier_service import ModifierService
+from core.services.project_service import ProjectService
+from core.services.render_service import RenderService
+from utils.config import Config
+
+
+class ExportService:
+    """Service concerning exporting in general."""
+
+    @classmethod
+    def export_frame_range(cls,
+                           sequence: Sequence,
+                           output_directory: Path,
+                           start: int = 0,
+                           end: int = None,
+                           step: int = 1,
+                           threads: int = 1,
+                           file_prefix: str = "frame_",
+                           progress_callback: Callable[[int, int], None]
+                           = None
+                           ) -> int:
+        """Render frames of a Sequence and write them as PNG files.
+
+        Frames are rendered from start (included) to end (excluded),
+        which defaults to the sequence duration. Rendering happens on
+        the calling thread, which owns the moderngl context, while
+        pixels are read back asynchronously and files are encoded by
+        a pool of threads. The progress callback receives the number
+        of written frames and the total number of frames. Return the
+        number of frames.
+        """
+        if end is None:
+            end = sequence.get_duration()
+        _frames = cls._get_frames(start, end, step)
+        output_directory.mkdir(parents=True, exist_ok=True)
+        _written = 0
+
+        def _count_frame(frame: int):
+            nonlocal _written
+            _written += 1
+            if progress_callback is not None:
+                progress_callback(_written, len(_frames))
+
+        cls._export_frames(sequence, output_directory, _frames,
+                           cls._get_digits(start, end), threads,
+                           file_prefix, _count_frame)
+        return len(_frames)
+
+    @classmethod
+    def export_frame_range_in_processes(cls,
+                                        project_file: Path,
+                                        sequence_id: int,
+                                        output_directory: Path,
+                                        start: int = 0,
+                                        end: int = None,
+                                        step: int = 1,
+                                        processes: int = 2,
+                                        threads: int = 1,
+                                        file_prefix: str = "frame_",
+                                        progress_callback:
+                                        Callable[[int, int], None] = None
+                                        ) -> int:
+        """Render frames of a Sequence using several processes.
+
+        Each process loads the configuration, the modifiers and the
+        project script on its own, and renders with its own moderngl
+        context. Processes claim chunks of frames from a shared
+        counter, with chunks shrinking as fewer frames remain, such
+        that processes which get cheap frames take more of them.
+        Files are named after their frame, so the output is in order
+        whichever process wrote it. Return the number of frames.
+        """
+        if end is None:
+            ProjectService.load_project_from_file(project_file)
+            end = ProjectService.get_sequence_by_id(
+                sequence_id).get_duration()
+        _frames = cls._get_frames(start, end, step)
+        output_directory.mkdir(parents=True, exist_ok=True)
+
+        # Spawned processes don't inherit the moderngl contexts.
+        _multiprocessing = multiprocessing.get_context("spawn")
+        _next_index = _multiprocessing.Value("i", 0)
+        _written_queue = _multiprocessing.Queue()
+        _arguments = (Config.get_sections(), GLContext.get_backend(),
+                      project_file, sequence_id, output_directory, _frames,
+                      _next_index, processes, cls._get_digits(start, end),
+                      threads, file_prefix, _written_queue)
+        _processes = [_multiprocessing.Process(
+                          target=cls._run_export_process, args=_arguments,
+                          name=f"ExportProcess-{_index}")
+                      for _index in range(max(1, processes))]
+        for _process in _processes:
+            _process.start()
+
+        _written = 0
+        try:
+            while _written < len(_frames):
+                try:
+                    _written_queue.get(timeout=1)
+                except queue.Empty:
+                    if any(_process.exitcode not in (None, 0)
+                           for _process in _processes):
+                        raise RuntimeError("An export process failed")
+                    continue
+                _written += 1
+                if progress_callback is not None:
+                    progress_callback(_written, len(_frames))
+        finally:
+            for _process in _processes:
+                _process.join(None if _written == len(_frames) else 0)
+                if _process.is_alive():
+                    _process.terminate()
+        return len(_frames)
+
+    @classmethod
+    def _run_export_process(cls,
+                            config_sections: dict[str, dict[str, str]],
+                            backend: str,
+                            project_file: Path,
+                            sequence_id: int,
+                            output_directory: Path,
+                            frames: range,
+                            next_index: Synchronized,
+                            processes: int,
+                            digits: int,
+                            threads: int,
+                            file_prefix: str,
+                            written_queue: multiprocessing.Queue):
+        """Export the frames claimed by one of several processes."""
+        _config = ConfigParser()
+        _config.read_dict(config_sections)
+        Config.load(_config)
+        if backend is not None:
+            GLContext.set_backend(backend)
+        ModifierService.load_modifiers_from_directory()
+        ProjectService.load_project_from_file(project_file)
+        _sequence = ProjectService.get_sequence_by_id(sequence_id)
+        ModifierService.warm_up_all_shaders(_sequence.get_image_format())
+
+        def _claim_frames() -> Iterator[int]:
+            while True:
+                with next_index.get_lock():
+                    _first = next_index.value
+                    _remaining = len(frames) - _first
+                    _count = max(1, _remaining // (2*processes))
+                    next_index.value = _first + _count
+                if _remaining <= 0:
+                    return
+                yield from frames[_first:_first+_count]
+
+        cls._export_frames(_sequence, output_directory, _claim_frames(),
+                           digits, threads, file_prefix, written_queue.put)
+
+    @staticmethod
+    def _get_frames(start: int, end: int, step: int) -> range:
+        """Return the frames to export."""
+        if step < 1:
+            raise ValueError("The frame step must be at least 1")
+        return range(start, end, step)
+
+    @staticmethod
+    def _get_digits(start: int, end: int) -> int:
+        """Return the number of digits of frames within file names."""
+        return max(4, len(str(max(abs(start), abs(end)))))
+
+    @staticmethod
+    def _export_frames(sequence: Sequence,
+                       output_directory: Path,
+                       frames: Iterable[int],
+                       digits: int,
+                       threads: int,
+                       file_prefix: str,
+                       written_callback: Callable[[int], None]):
+        """Render frames and write them, reporting each written frame.
+
+        Frames are tone mapped to 8-bit on the GPU, as PNG files are
+        8-bit, which also makes readbacks four times smaller.
+        """
+        _max_pending = 2*max(1, threads)
+        _readback = PixelReadback(GLContext.get_context(),
+                                  Config.render.readback_depth)
+        _free_arrays: list[np.ndarray] = []
+        _pending: deque[tuple[Future, np.ndarray, int]] = deque()
+
+        def _wait_oldest_file():
+            _future, _array, _frame = _pending.popleft()
+            _future.result()
+            _free_arrays.append(_array)
+            written_callback(_frame)
+
+        def _write_oldest_frame():
+            _out = _free_arrays.pop() if _free_arrays else None
+            _frame, _image = _readback.collect(_out)
+            _path = output_directory / f"{file_prefix}" \
+                f"{_frame:0{digits}d}.png"
+            _pending.append((_executor.submit(_image.save_png, _path, True),
+                             _image.get_data_array(), _frame))
+            # Bound the number of images waiting in memory.
+            while len(_pending) >= _max_pending:
+                _wait_oldest_file()
+
+        with ThreadPoolExecutor(max_workers=max(1, threads)) as _executor:
+            try:
+                for _frame in frames:
+                    _texture = RenderService.render_sequence_frame(
+                        sequence, _frame, output_format=ImageFormat.UINT8)
+                    _readback.submit(_texture, _frame)
+                    RenderService.release_texture(_texture)
+                    if _readback.is_full():
+                        _write_oldest_frame()
+                while _readback.get_pending_count() > 0:
+                    _write_oldest_frame()
+                while _pending:
+                    _wait_oldest_file()
+            finally:
+                _readback.release()
@@ -19,8 +19,31 @@ from core.entities.parameter_template import ParameterTemplate, ParameterFlag
 from core.services.animation_service import AnimationService
 from core.entities.modifier import Modifier
 from core.entities.layer import Layer
+from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
 
 from utils.config import Config
+from utils.trace import Trace
+
+
+POINTWISE_SHADER_CODE = """
+#version 430
+layout (local_size_x = 16, local_size_y = 16) in;
+layout (IMAGE_FORMAT, binding = 0) uniform readonly image2D img_input;
+layout (IMAGE_FORMAT, binding = 1) uniform writeonly image2D img_output;
+uniform ivec2 region_offset;
+{declarations}
+{functions}
+void main() {{
+    ivec2 coords = ivec2(gl_GlobalInvocationID.xy);
+    ivec2 dimensions = imageSize(img_output).xy;
+    if(any(greaterThanEqual(coords, dimensions))){{return;}}
+    ivec2 layer_coords = coords + region_offset;
+    vec4 color = imageLoad(img_input, coords);
+    {calls}
+    imageStore(img_output, coords, color);
+}}
+"""
 
 
 class ModifierService:
@@ -28,8 +51,10 @@ class ModifierService:
 
     _loaded: bool = False
     _modifier_count = 0
+    _pointwise_code_cache: dict[tuple[str, ...], str] = dict()
 
     @classmethod
+    @Trace.traced("modifiers")
     def load_modifiers_from_directory(cls):
         """Load modifiers from the directory into the ModifierRepository."""
         if cls._loaded:
@@ -63,6 +88,7 @@ class ModifierService:
         cls._loaded = True
 
     @classmethod
+    @Trace.traced("modifiers")
     def load_modifier_from_file(cls,
                                 py_file: Path
                                 ) -> tuple[str, ModifierTemplate]:
@@ -116,24 +142,202 @@ class ModifierService:
         _parameter_template_list = cls._create_parameter_list(
             _parameters_info, modifier_name_id=_name_id)
 
-        # Retrieve _apply function
+        # Retrieve shaders sources
+        _shaders = getattr(_module, "_shaders", dict())
+        if not isinstance(_shaders, dict):
+            raise TypeError(f"Attribute '_shaders' in modifier "
+                            f"'{_name_id}' should be a dict of str.")
+        for _shader_name_id, _glsl_code in _shaders.items():
+            if (not isinstance(_shader_name_id, str)
+                    or not isinstance(_glsl_code, str)):
+                raise TypeError(f"Attribute '_shaders' in modifier "
+                                f"'{_name_id}' should be a dict of str.")
+
+        # Retrieve optional pointwise declaration
+        _pointwise = getattr(_module, "_pointwise", None)
+        _pointwise_code = None
+        _pointwise_uniforms = dict()
+        _pointwise_uniforms_function = None
+        if _pointwise is not None:
+            _pointwise_code, _pointwise_uniforms, \
+                _pointwise_uniforms_function = cls._get_pointwise_info(
+                    _module, _pointwise, _parameter_template_list,
+                    modifier_name_id=_name_id)
+
+        # Retrieve _apply function, optional for pointwise modifiers
         _apply_function = getattr(_module, "_apply", None)
-        if _apply_function is None:
+        if _apply_function is None and _pointwise is None:
             raise AttributeError(f"Couldn't find '_apply' function "
                                  f"in modifier '{_name_id}'")
-        if not callable(_apply_function):
-            raise TypeError(f"Attribute '_apply' in modifier "
-                            f"'{_name_id}' should be a function.")
-        cls._inspect_apply_signature(_apply_function,
-                                      _parameter_template_list,
-                                      modifier_name_id=_name_id)
+        if _apply_function is not None:
+            if not callable(_apply_function):
+                raise TypeError(f"Attribute '_apply' in modifier "
+                                f"'{_name_id}' should be a function.")
+            cls._inspect_apply_signature(_apply_function,
+                                         _parameter_template_list,
+                                         modifier_name_id=_name_id)
+
+        # Retrieve optional _is_time_dependent function
+        _time_dependency_function = getattr(
+            _module, "_is_time_dependent", None)
+        if _time_dependency_function is not None:
+            if not callable(_time_dependency_function):
+                raise TypeError(f"Attribute '_is_time_dependent' in "
+                                f"modifier '{_name_id}' should be "
+                                f"a function.")
+            cls._inspect_optional_signature(
+                _time_dependency_function, "_is_time_dependent",
+                _parameter_template_list, modifier_name_id=_name_id)
+
+        # Retrieve optional _footprint function
+        _footprint_function = getattr(_module, "_footprint", None)
+        if _footprint_function is not None:
+            if not callable(_footprint_function):
+                raise TypeError(f"Attribute '_footprint' in modifier "
+                                f"'{_name_id}' should be a function.")
+            cls._inspect_optional_signature(
+                _footprint_function, "_footprint",
+                _parameter_template_list, modifier_name_id=_name_id)
 
         # Return name id and modifier template
         _modifier_template = ModifierTemplate(
             _apply_function, title=_title, flags=_flags,
-            parameter_template_list=_parameter_template_list)
+            parameter_template_list=_parameter_template_list,
+            shaders=_shaders,
+            time_dependency_function=_time_dependency_function,
+            footprint_function=_footprint_function,
+            pointwise_code=_pointwise_code,
+            pointwise_uniforms=_pointwise_uniforms,
+            pointwise_uniforms_function=_pointwise_uniforms_function)
         return _name_id, _modifier_template
 
+    @classmethod
+    def _get_pointwise_info(cls,
+                            module: object,
+                            pointwise: dict,
+                            template_list: list[ParameterTemplate],
+                            modifier_name_id: str = ""
+                            ) -> tuple[str, dict[str, str], Callable]:
+        """Check and return the pointwise declaration of a modifier.
+
+        The '_pointwise' attribute is a dict holding the GLSL 'code'
+        of the pointwise function, and the 'uniforms' it takes as a
+        dict of GLSL types. Their values are given by the optional
+        '_pointwise_uniforms' function, or else by the parameters of
+        the same name.
+        """
+        if not isinstance(pointwise, dict):
+            raise TypeError(f"Attribute '_pointwise' in modifier "
+                            f"'{modifier_name_id}' should be a dict.")
+        _code = pointwise.get("code")
+        if not isinstance(_code, str):
+            raise TypeError(f"Attribute '_pointwise' in modifier "
+                            f"'{modifier_name_id}' should have a 'code' "
+                            f"str.")
+        _uniforms = pointwise.get("uniforms", dict())
+        if not isinstance(_uniforms, dict) or not all(
+                isinstance(_key, str) and isinstance(_value, str)
+                for _key, _value in _uniforms.items()):
+            raise TypeError(f"Attribute 'uniforms' of '_pointwise' in "
+                            f"modifier '{modifier_name_id}' should be "
+                            f"a dict of str.")
+        if f"{modifier_name_id}_pointwise" not in _code:
+            raise ValueError(f"Pointwise code of modifier "
+                             f"'{modifier_name_id}' should define "
+                             f"'{modifier_name_id}_pointwise'")
+
+        _function = getattr(module, "_pointwise_uniforms", None)
+        if _function is None:
+            _parameter_names = [_template.get_name_id()
+                                for _template in template_list]
+            for _uniform_name in _uniforms:
+                if _uniform_name not in _parameter_names:
+                    raise AttributeError(
+                        f"Couldn't find '_pointwise_uniforms' function "
+                        f"giving uniform '{_uniform_name}' in modifier "
+                        f"'{modifier_name_id}'")
+        else:
+            if not callable(_function):
+                raise TypeError(f"Attribute '_pointwise_uniforms' in "
+                                f"modifier '{modifier_name_id}' should "
+                                f"be a function.")
+            cls._inspect_apply_signature(
+                _function, template_list, modifier_name_id=modifier_name_id,
+                function_name="_pointwise_uniforms")
+        return _code, _uniforms, _function
+
+    @classmethod
+    @Trace.traced("modifiers")
+    def warm_up_all_shaders(cls,
+                            image_format: ImageFormat = ImageFormat.FLOAT32):
+        """Compile the shaders of all the loaded modifiers.
+
+        Shaders are compiled within the moderngl context of the
+        calling thread, which should be the thread that renders, for
+        the given working image format.
+        """
+        for _name_id in ModifierRepository.get_repository():
+            cls.warm_up_shaders(_name_id, image_format)
+
+    @classmethod
+    def warm_up_shaders(cls,
+                        modifier_name_id: str,
+                        image_format: ImageFormat = ImageFormat.FLOAT32):
+        """Compile the shaders of a modifier ahead of rendering.
+
+        A pointwise modifier gets the shader applying it alone, while
+        the shaders of longer chains are compiled as they appear.
+        """
+        _template = ModifierRepository.get_template(modifier_name_id)
+        _defines = image_format.get_shader_defines()
+        for _shader_name_id, _glsl_code in _template.get_shaders().items():
+            GLContext.compute_shader_once(
+                f"{modifier_name_id}.{_shader_name_id}", _glsl_code,
+                _defines)
+        if _template.is_pointwise():
+            _chain = (modifier_name_id,)
+            GLContext.compute_shader_once(
+                cls.get_pointwise_chain_name_id(_chain),
+                cls.get_pointwise_chain_code(_chain), _defines)
+
+    @staticmethod
+    def get_pointwise_chain_name_id(chain: tuple[str, ...]) -> str:
+        """Return the name id of the shader fusing pointwise modifiers."""
+        return "pointwise." + "+".join(chain)
+
+    @classmethod
+    def get_pointwise_chain_code(cls, chain: tuple[str, ...]) -> str:
+        """Return the compute shader fusing a chain of pointwise modifiers.
+
+        The chain is given as the name ids of its modifiers, in order.
+        The uniforms of modifier #i are declared as 'm<i>_<uniform>',
+        while the code of each distinct modifier is included once.
+        Generated code is cached by chain.
+        """
+        _code = cls._pointwise_code_cache.get(chain)
+        if _code is not None:
+            return _code
+        _declarations = []
+        _functions = dict()
+        _calls = []
+        for _index, _name_id in enumerate(chain):
+            _template = ModifierRepository.get_template(_name_id)
+            _functions[_name_id] = _template.get_pointwise_code()
+            _arguments = ["color", "layer_coords"]
+            for _uniform_name, _glsl_type in \
+                    _template.get_pointwise_uniforms().items():
+                _declarations.append(
+                    f"uniform {_glsl_type} m{_index}_{_uniform_name};")
+                _arguments.append(f"m{_index}_{_uniform_name}")
+            _calls.append(f"color = {_name_id}_pointwise("
+                          f"{', '.join(_arguments)});")
+        _code = POINTWISE_SHADER_CODE.format(
+            declarations="\n".join(_declarations),
+            functions="\n".join(_functions.values()),
+            calls="\n    ".join(_calls))
+        cls._pointwise_code_cache[chain] = _code
+        return _code
+
     @staticmethod
     def _create_parameter_list(info_list: list[dict],
                                modifier_name_id: str = ""
@@ -250,29 +454,57 @@ class ModifierService:
     @staticmethod
     def _inspect_apply_signature(apply_function: Callable,
                                  template_list: list[ParameterTemplate],
-                                 modifier_name_id: str = ""):
-        """Check whether the signature of an '_apply' function is valid."""
+                                 modifier_name_id: str = "",
+                                 function_name: str = "_apply"):
+        """Check whether the signature of an '_apply' function is valid.
+
+        Other functions taking a RenderContext, such as
+        '_pointwise_uniforms', are checked the same way.
+        """
         _signature = inspect.signature(apply_function)
         _signature_parameters = list(_signature.parameters.values())
         if len(_signature_parameters) != 1+len(template_list):
             _correct_signature = [
                 _template.get_name_id() for _template in template_list]
             _correct_signature.insert(0, "_render_context")
-            raise TypeError(f"Signature mismatch: Arguments of '_apply' "
-                            f"function in modifier '{modifier_name_id}' "
-                            f" should be {_correct_signature}")
+            raise TypeError(f"Signature mismatch: Arguments of "
+                            f"'{function_name}' function in modifier "
+                            f"'{modifier_name_id}' should be "
+                            f"{_correct_signature}")
         if _signature_parameters[0].name != "_render_context":
-            raise TypeError(f"Signature mismatch: First argument of '_apply' "
-                            f"function in modifier '{modifier_name_id}' "
-                            f" should be '_render_context'")
+            raise TypeError(f"Signature mismatch: First argument of "
+                            f"'{function_name}' function in modifier "
+                            f"'{modifier_name_id}' should be "
+                            f"'_render_context'")
         for _i in range(len(template_list)):
             if (_signature_parameters[_i+1].name
                     != template_list[_i].get_name_id()):
                 raise TypeError(f"Signature mismatch: Argument #{_i+1} of "
-                                f"'_apply' function in modifier "
+                                f"'{function_name}' function in modifier "
                                 f"'{modifier_name_id}' should be "
                                 f"'{template_list[_i].get_name_id()}'")
 
+    @staticmethod
+    def _inspect_optional_signature(
+            function: Callable,
+            function_name: str,
+            template_list: list[ParameterTemplate],
+            modifier_name_id: str = ""):
+        """Check whether an optional function signature is valid.
+
+        Optional functions, such as '_is_time_dependent', take the
+        values of the parameters, without any RenderContext.
+        """
+        _signature = inspect.signature(function)
+        _signature_names = list(_signature.parameters)
+        _correct_signature = [
+            _template.get_name_id() for _template in template_list]
+        if _signature_names != _correct_signature:
+            raise TypeError(f"Signature mismatch: Arguments of "
+                            f"'{function_name}' function in modifier "
+                            f"'{modifier_name_id}' should be "
+                            f"{_correct_signature}")
+
     @staticmethod
     def modifier_from_template(modifier_name_id: str) -> Modifier:
         """Create a Modifier based on a ModifierTemplate in the repository."""
@@ -293,6 +525,9 @@ class ModifierService:
         """Add a Modifier to a Layer."""
         _modifier_list = layer.get_modifier_list()
         _modifier_list.append(modifier)
+        for _parameter in modifier.get_parameter_list():
+            layer.follow_parameter(_parameter)
+        layer.update_revision()
 
     @staticmethod
     def modifier_has_flag(modifier: Modifier, flag: ModifierFlag):
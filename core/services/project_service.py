@@ -6,6 +6,9 @@ package, concerning the project. This includes adding new
 sequences to the project, changing parameters...
 """
 
+from pathlib import Path
+import importlib.util
+
 from core.entities.project import Project
 from core.entities.sequence import Sequence
 
@@ -28,4 +31,19 @@ class ProjectService:
         if sequence_id not in _sequence_dict:
             return None
         _sequence = _sequence_dict[sequence_id]
-        return _sequence
\ No newline at end of file
+        return _sequence
+
+    @staticmethod
+    def load_project_from_file(py_file: Path):
+        """Load a project by running a project script.
+
+        A project script is a python file which builds its sequences,
+        layers and modifiers using the services of the core package.
+        """
+        if not py_file.is_file():
+            raise ValueError(f"{py_file} is not a file")
+        if py_file.suffix != ".py":
+            raise ValueError(f"{py_file} is not a *.py file")
+        _spec = importlib.util.spec_from_file_location("project", py_file)
+        _module = importlib.util.module_from_spec(_spec)
+        _spec.loader.exec_module(_module)
@@ -7,6 +7,7 @@ rendering of various types of Layer, the compositing
 of layers within a Sequence...
 """
 
+import math
 import time
 import moderngl
 import numpy as np
@@ -15,103 +16,555 @@ from core.entities.modifier_repository import ModifierRepository
 from core.entities.modifier import Modifier
 from core.entities.modifier_template import ModifierFlag
 from core.entities.render_context import RenderContext
-from core.entities.sequence_context import SequenceContext
+from core.entities.sequence_context import SequenceContext, RenderQuality
 from core.entities.visual_layer import VisualLayer
 from core.entities.solid_layer import SolidLayer
 from core.entities.sequence import Sequence
 from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
+from core.entities.layer_interval_index import LayerIntervalIndex
+from core.entities.gpu_resource_tracker import GPUResourceTracker
+from core.entities.render_profiler import RenderProfiler
+from core.entities.render_plan import (RenderPlan, LayerPlan, RenderPass,
+                                       ModifierStep)
 from core.entities.parameter import Parameter
+from core.entities.parameter_template import ParameterFlag
 from data_types.data_type import DataType
 from core.services.animation_service import AnimationService
 from core.services.modifier_service import ModifierService
 from data_types.color import Color
 from utils.image import Image
 from utils.config import Config
+from utils.trace import Trace
+
+
+COLOR_SHADER_CODE = """
+#version 430
+layout (local_size_x = 1, local_size_y = 1) in;
+layout (IMAGE_FORMAT, binding = 0) uniform writeonly image2D texture;
+uniform vec4 color;
+void main() {
+    imageStore(texture, ivec2(gl_GlobalInvocationID.xy), color);
+}
+"""
+
+TONEMAPPING_SHADER_CODE = """
+#version 430
+layout (local_size_x = 1, local_size_y = 1) in;
+layout (IMAGE_FORMAT, binding = 0) uniform readonly image2D img_input;
+layout (OUTPUT_FORMAT, binding = 1) uniform writeonly image2D img_output;
+void main() {
+    ivec2 coords = ivec2(gl_GlobalInvocationID.xy);
+    vec4 color = imageLoad(img_input, coords);
+    // Layers are accumulated with premultiplied alpha.
+    vec3 linear = color.a > 0. ? color.rgb/color.a : vec3(0.);
+
+    bvec3 cutoff = lessThan(linear, vec3(.0031308));
+    vec3 higher = 1.055*pow(linear, vec3(1./2.4)) - .055;
+    vec3 lower = linear * 12.92;
+    vec3 sRGB = mix(higher, lower, cutoff);
+
+    vec4 out_color = clamp(vec4(sRGB, color.a), 0., 1.);
+    imageStore(img_output, coords.xy, out_color);
+}
+"""
+
+TRANSFORM_VERTEX_CODE = """
+#version 330 core
+in vec2 in_uv;
+out vec2 uv;
+out vec2 layer_coords;
+uniform vec2 context_size;
+uniform vec2 layer_size;
+uniform vec2 region_offset;
+uniform vec2 region_size;
+uniform vec2 position;
+uniform vec2 anchor;
+uniform vec2 scale;
+uniform float rotation;
+uniform vec2 margin;
+void main() {
+    // The quad is expanded by a margin so that the partially
+    // covered pixels along the edges are rasterized.
+    vec2 expanded_uv = in_uv*(1.+2.*margin) - margin;
+    layer_coords = region_offset + expanded_uv*region_size;
+    mat2 rot = mat2(cos(rotation), sin(rotation),
+                    -sin(rotation), cos(rotation));
+    vec2 transformed_pos = scale*(layer_coords-anchor*layer_size);
+    transformed_pos = rot*transformed_pos;
+    transformed_pos += position*context_size;
+    transformed_pos = transformed_pos*2./context_size - 1.;
+    transformed_pos.y *= -1.;
+    gl_Position = vec4(transformed_pos, 0., 1.);
+    uv = expanded_uv;
+}
+"""
+
+TRANSFORM_FRAGMENT_CODE = """
+#version 330 core
+in vec2 uv;
+in vec2 layer_coords;
+out vec4 out_color;
+uniform sampler2D in_texture;
+uniform vec2 layer_size;
+uniform float opacity;
+uniform bool anti_aliasing;
+void main() {
+    // Distance to the nearest edge of the layer, converted from
+    // layer pixels to screen pixels using the derivatives.
+    vec2 edge_distance = min(layer_coords, layer_size-layer_coords);
+    float coverage;
+    if(anti_aliasing){
+        vec2 screen_distance = edge_distance
+            / max(fwidth(layer_coords), vec2(1e-6));
+        coverage = clamp(min(screen_distance.x, screen_distance.y)+.5,
+                         0., 1.);
+    }else{
+        coverage = float(all(greaterThanEqual(edge_distance, vec2(0.))));
+    }
+    vec4 tex_color = texture(in_texture, clamp(uv, 0., 1.));
+    float alpha = tex_color.a * opacity * coverage;
+    out_color = vec4(tex_color.rgb*alpha, alpha);
+}
+"""
 
 
 class RenderService:
     """Service concerning rendering in general."""
 
-    _transform_program: moderngl.Program = None
-    _color_shader: moderngl.ComputeShader = None
-    _compositing_shader: moderngl.ComputeShader = None
-    _tonemapping_shader: moderngl.ComputeShader = None
-    _transform_msaa_fbo: moderngl.Buffer = None
-    _transform_fbo: moderngl.Buffer = None
-    _transform_msaa_texture: moderngl.Texture = None
-    _transform_texture: moderngl.Texture = None
+    @classmethod
+    def get_render_plan(cls, sequence: Sequence) -> RenderPlan:
+        """Return the render plan of a Sequence, compiling it if needed.
+
+        The plan is compiled again after any structural change of the
+        sequence or of its layers. Its layer plans and its index of
+        active layers come from a single copy of the layer list, as
+        layers may be added by another thread meanwhile.
+        """
+        _revision = sequence.get_structure_revision()
+        _render_plan = sequence.get_render_plan()
+        if _render_plan is None or _render_plan.get_revision() != _revision:
+            with Trace.span("compile render plan", "render"):
+                _layer_list = list(sequence.get_layer_list())
+                _render_plan = RenderPlan(
+                    _revision,
+                    [cls.create_layer_plan(_layer)
+                     if isinstance(_layer, VisualLayer) else None
+                     for _layer in _layer_list],
+                    LayerIntervalIndex([
+                        (_layer.get_start_frame(), _layer.get_end_frame(),
+                         _id)
+                        for _id, _layer in enumerate(_layer_list)]))
+            sequence.set_render_plan(_render_plan)
+        return _render_plan
+
+    @classmethod
+    def clear_layer_cache(cls):
+        """Give the cached textures of the calling thread to its pool."""
+        GLContext.get_layer_cache().clear()
+
+    @classmethod
+    def create_layer_plan(cls, layer: VisualLayer) -> LayerPlan:
+        """Compile the plan for rendering a VisualLayer."""
+        if isinstance(layer, SolidLayer):
+            _render_function = cls.render_solid_layer_plan
+        else:
+            raise NotImplementedError(f"Rendering method for "
+                                      f"'{layer.__class__}' not implemented")
+        _steps = [cls.create_modifier_step(_modifier)
+                  for _modifier in layer.get_modifier_list()]
+        # Modifiers before the last WRITEONLY one have no effect.
+        _start_index = 0
+        for _index, _step in enumerate(_steps):
+            if ModifierFlag.WRITEONLY in _step.get_template().get_flags():
+                _start_index = _index
+        _passes = []
+        _pointwise_chain = []
+        for _step in _steps[_start_index:]:
+            if _step.get_template().is_pointwise():
+                _pointwise_chain.append(_step)
+                continue
+            if _pointwise_chain:
+                _passes.append(RenderPass(_pointwise_chain))
+                _pointwise_chain = []
+            _passes.append(RenderPass(
+                [_step], _step.get_template().get_apply_function()))
+        if _pointwise_chain:
+            _passes.append(RenderPass(_pointwise_chain))
+        return LayerPlan(layer, _render_function, _steps, _passes)
+
+    @staticmethod
+    def create_modifier_step(modifier: Modifier) -> ModifierStep:
+        """Resolve the template and pixel parameters of a Modifier."""
+        _template = ModifierRepository.get_template(
+            modifier.get_template_id())
+        _pixel_flags = [
+            _parameter_template.has_flag(ParameterFlag.PIXELS)
+            for _parameter_template
+            in _template.get_parameter_template_list()]
+        return ModifierStep(modifier, _template, _pixel_flags)
 
     @classmethod
     def apply_modifier_to_render_context(cls,
                                          modifier: Modifier,
                                          context: RenderContext):
         """Execute the action of a Modifier on a RenderContext."""
-        _name_id = modifier.get_template_id()
-        _modifier_template = ModifierRepository.get_template(_name_id)
-        _function = _modifier_template.get_apply_function()
-        _arguments = []
+        _step = cls.create_modifier_step(modifier)
+        cls.apply_pass_to_render_context(
+            RenderPass([_step], _step.get_template().get_apply_function()),
+            context)
+
+    @classmethod
+    def apply_pointwise_chain_to_render_context(cls,
+                                                modifier_list: list[Modifier],
+                                                context: RenderContext):
+        """Apply consecutive pointwise modifiers in a single pass."""
+        cls.apply_pass_to_render_context(
+            RenderPass([cls.create_modifier_step(_modifier)
+                        for _modifier in modifier_list]),
+            context)
+
+    @classmethod
+    def apply_pass_to_render_context(cls,
+                                     render_pass: RenderPass,
+                                     context: RenderContext):
+        """Execute a pass of a layer plan on a RenderContext.
+
+        A chain of pointwise modifiers is fused into one compute
+        shader, cached by the chain of modifier templates, which reads
+        each pixel once and writes it once.
+        """
         _sequence_ctx = context.get_sequence_context()
-        for _parameter in modifier.get_parameter_list():
-            _data = cls.get_parameter_value(_parameter, _sequence_ctx)
+        _function = render_pass.get_apply_function()
+        if _function is not None:
+            _step = render_pass.get_steps()[0]
+            context.set_modifier_name_id(_step.get_name_id())
+            _function(context, *cls.get_step_arguments(_step, _sequence_ctx))
+            return
+
+        _chain = render_pass.get_chain()
+        _compute_shader = GLContext.compute_shader_once(
+            ModifierService.get_pointwise_chain_name_id(_chain),
+            ModifierService.get_pointwise_chain_code(_chain),
+            context.get_image_format().get_shader_defines())
+        for _index, _step in enumerate(render_pass.get_steps()):
+            _modifier_template = _step.get_template()
+            context.set_modifier_name_id(_step.get_name_id())
+            _arguments = cls.get_step_arguments(_step, _sequence_ctx)
+            _function = _modifier_template.get_pointwise_uniforms_function()
+            if _function is None:
+                _names = [_template.get_name_id() for _template
+                          in _modifier_template.get_parameter_template_list()]
+                _values = dict(zip(_names, _arguments))
+            else:
+                _values = _function(context, *_arguments)
+            for _uniform_name in _modifier_template.get_pointwise_uniforms():
+                # Uniforms unused by the shader are optimized out.
+                _uniform = _compute_shader.get(
+                    f"m{_index}_{_uniform_name}", None)
+                if _uniform is not None:
+                    _uniform.value = _values[_uniform_name]
+        _region_offset = _compute_shader.get("region_offset", None)
+        if _region_offset is not None:
+            _region_offset.value = context.get_region_offset()
+
+        context.get_src_texture().bind_to_image(0, read=True, write=False)
+        context.get_dest_texture().bind_to_image(1, read=False, write=True)
+        _compute_shader.run(context.get_region_width()//16+1,
+                            context.get_region_height()//16+1, 1)
+
+    @classmethod
+    def get_modifier_arguments(cls,
+                               modifier: Modifier,
+                               sequence_ctx: SequenceContext) -> list:
+        """Return the values of the parameters of a Modifier."""
+        return cls.get_step_arguments(cls.create_modifier_step(modifier),
+                                      sequence_ctx)
+
+    @classmethod
+    def get_step_arguments(cls,
+                           step: ModifierStep,
+                           sequence_ctx: SequenceContext) -> list:
+        """Return the values of the parameters of a ModifierStep.
+
+        Parameters flagged as 'pixels' are scaled according to the
+        resolution of the render, such that reduced renders look
+        like full ones.
+        """
+        _resolution_scale = sequence_ctx.get_resolution_scale()
+        _arguments = []
+        for _parameter, _is_pixels in zip(step.get_parameter_list(),
+                                          step.get_pixel_flags()):
+            _data = cls.get_parameter_value(_parameter, sequence_ctx)
+            if _is_pixels and _resolution_scale != 1:
+                _data = cls._scale_pixel_value(_data, _resolution_scale)
             _arguments.append(_data)
-        _function(context, *_arguments)
+        return _arguments
 
     @staticmethod
-    def _image_from_texture(texture: moderngl.Texture) -> Image:
-        """Extract an Image object from a moderngl Texture."""
-        _data_bytes = texture.read()
-        _image = Image(texture.width, texture.height, data_bytes=_data_bytes)
-        return _image
+    def _scale_pixel_value(value, resolution_scale: float):
+        """Scale a value measured in pixels, keeping integers whole."""
+        if isinstance(value, list):
+            return [RenderService._scale_pixel_value(_item,
+                                                     resolution_scale)
+                    for _item in value]
+        if isinstance(value, int):
+            return round(value*resolution_scale)
+        return value*resolution_scale
 
     @staticmethod
-    def _texture_from_image(gl_context: moderngl.Context,
-                            image: Image
-                            ) -> moderngl.Texture:
+    def image_from_texture(texture: moderngl.Texture,
+                           out: np.ndarray = None) -> Image:
+        """Extract an Image object from a moderngl Texture.
+
+        The pixels are read directly into the given array of shape
+        (height, width, 4), whose data type matches the format of the
+        texture, or into a new array.
+        """
+        if out is None:
+            _image_format = ImageFormat.from_dtype(texture.dtype)
+            out = np.empty((texture.height, texture.width, 4),
+                           dtype=_image_format.get_numpy_dtype())
+        texture.read_into(out)
+        return Image(texture.width, texture.height, data_array=out)
+
+    @staticmethod
+    def texture_from_image(image: Image) -> moderngl.Texture:
         """Create a moderngl Texture from an Image."""
         _width = image.get_width()
         _height = image.get_height()
-        _data = image.get_data_bytes()
-        _texture = gl_context.texture((_width, _height), 4, _data, dtype="f4")
+        _image_format = ImageFormat.from_numpy_dtype(image.get_dtype())
+        _texture = GLContext.get_texture_pool().acquire(
+            _width, _height, dtype=_image_format.get_dtype())
+        _texture.write(image.get_data_bytes())
         return _texture
 
+    @staticmethod
+    def copy_texture(texture: moderngl.Texture) -> moderngl.Texture:
+        """Copy a texture into a new texture from the texture pool."""
+        _texture_pool = GLContext.get_texture_pool()
+        _copy = _texture_pool.acquire(texture.width, texture.height,
+                                      texture.components, texture.dtype)
+        GLContext.get_context().copy_framebuffer(
+            _copy, _texture_pool.get_framebuffer(texture))
+        return _copy
+
+    @staticmethod
+    def release_texture(texture: moderngl.Texture):
+        """Give a rendered texture back to the texture pool."""
+        GLContext.get_texture_pool().release(texture)
+
     @classmethod
     def render_visual_layer(cls,
                             layer: VisualLayer,
-                            sequence_ctx: SequenceContext
+                            sequence_ctx: SequenceContext,
+                            region: tuple[int, int, int, int] = None
                             ) -> moderngl.Texture:
-        """Render a VisualLayer to a texture."""
+        """Render a region of a VisualLayer to a texture.
 
-        # TODO : render only the visible part of the layer
-        # (don't render any potential offscreen pixels)
+        The region defaults to the whole layer.
+        """
+        _layer_plan = cls.create_layer_plan(layer)
+        return _layer_plan.get_render_function()(_layer_plan, sequence_ctx,
+                                                 region)
 
+    @staticmethod
+    def get_layer_dimensions(layer: VisualLayer,
+                             sequence_ctx: SequenceContext
+                             ) -> tuple[int, int]:
+        """Return the dimensions of a VisualLayer in rendered pixels."""
+        _resolution_scale = sequence_ctx.get_resolution_scale()
         if isinstance(layer, SolidLayer):
-            return cls.render_solid_layer(layer, sequence_ctx)
-        raise NotImplementedError(f"Rendering method for '{layer.__class__}' "
+            _width = layer.get_property("width").get_value()
+            _height = layer.get_property("height").get_value()
+            return (max(1, round(_width*_resolution_scale)),
+                    max(1, round(_height*_resolution_scale)))
+        raise NotImplementedError(f"Dimensions of '{layer.__class__}' "
                                   f"not implemented")
 
+    @classmethod
+    def get_layer_transform(cls,
+                            layer: VisualLayer,
+                            sequence_ctx: SequenceContext) -> tuple:
+        """Return the position, anchor, scale, rotation and opacity."""
+        return tuple(
+            cls.get_parameter_value(
+                layer.get_property_parameter(_name_id), sequence_ctx)
+            for _name_id in ("position", "anchor", "scale",
+                             "rotation", "opacity"))
+
+    @classmethod
+    def get_plan_transform(cls,
+                           layer_plan: LayerPlan,
+                           sequence_ctx: SequenceContext) -> tuple:
+        """Return the transform of a layer from its plan."""
+        return tuple(cls.get_parameter_value(_parameter, sequence_ctx)
+                     for _parameter in layer_plan.get_transform_parameters())
+
+    @classmethod
+    def get_modifiers_footprint(cls,
+                                layer_plan: LayerPlan,
+                                sequence_ctx: SequenceContext
+                                ) -> tuple[int, int]:
+        """Return how far around a pixel the modifiers of a layer read.
+
+        The footprints of the modifiers add up, as each one reads the
+        output of the previous one. Returns None if a modifier needs
+        the whole layer.
+        """
+        _footprint_x, _footprint_y = 0, 0
+        for _step in layer_plan.get_steps():
+            _function = _step.get_template().get_footprint_function()
+            if _function is None:
+                return None
+            _arguments = cls.get_step_arguments(_step, sequence_ctx)
+            _modifier_x, _modifier_y = _function(*_arguments)
+            _footprint_x += math.ceil(_modifier_x)
+            _footprint_y += math.ceil(_modifier_y)
+        return _footprint_x, _footprint_y
+
+    @classmethod
+    def get_visible_region(cls,
+                           layer_plan: LayerPlan,
+                           transform: tuple,
+                           sequence_ctx: SequenceContext
+                           ) -> tuple[int, int, int, int]:
+        """Return the region of a layer needed to render a frame.
+
+        The corners of the frame are brought into the pixel space of
+        the layer to find the visible region, which is then padded by
+        the footprint of the modifiers. The region is (x, y, width,
+        height) in layer pixels, or None if the layer is not visible.
+        """
+        _width, _height = cls.get_layer_dimensions(layer_plan.get_layer(),
+                                                   sequence_ctx)
+        _position, _anchor, _scale, _rotation, _opacity = transform
+        if _opacity <= 0 or _scale[0] == 0 or _scale[1] == 0:
+            return None
+        _context_width = sequence_ctx.get_width()
+        _context_height = sequence_ctx.get_height()
+        _cos = math.cos(_rotation)
+        _sin = math.sin(_rotation)
+        _x_list = []
+        _y_list = []
+        for _corner_x, _corner_y in ((0, 0), (_context_width, 0),
+                                     (0, _context_height),
+                                     (_context_width, _context_height)):
+            # Undo the translation, the rotation, then the scale.
+            _delta_x = _corner_x - _position[0]*_context_width
+            _delta_y = _corner_y - _position[1]*_context_height
+            _x_list.append((_cos*_delta_x + _sin*_delta_y)/_scale[0]
+                           + _anchor[0]*_width)
+            _y_list.append((-_sin*_delta_x + _cos*_delta_y)/_scale[1]
+                           + _anchor[1]*_height)
+
+        # Pad for bilinear sampling and for anti-aliased edges.
+        _padding_x = 1 + math.ceil(1/abs(_scale[0]))
+        _padding_y = 1 + math.ceil(1/abs(_scale[1]))
+        _left = max(0, math.floor(min(_x_list)) - _padding_x)
+        _top = max(0, math.floor(min(_y_list)) - _padding_y)
+        _right = min(_width, math.ceil(max(_x_list)) + _padding_x)
+        _bottom = min(_height, math.ceil(max(_y_list)) + _padding_y)
+        if _left >= _right or _top >= _bottom:
+            return None
+
+        _footprint = cls.get_modifiers_footprint(layer_plan, sequence_ctx)
+        if _footprint is None:
+            return 0, 0, _width, _height
+        _left = max(0, _left - _footprint[0])
+        _top = max(0, _top - _footprint[1])
+        _right = min(_width, _right + _footprint[0])
+        _bottom = min(_height, _bottom + _footprint[1])
+        return _left, _top, _right - _left, _bottom - _top
+
+    @classmethod
+    def is_layer_time_invariant(cls,
+                                layer_plan: LayerPlan,
+                                sequence_ctx: SequenceContext) -> bool:
+        """Tell if the untransformed content of a layer is constant.
+
+        A layer is time-invariant when none of its content parameters
+        is animated, and none of its modifiers depends on time.
+        """
+        for _parameter in layer_plan.get_content_parameters():
+            if AnimationService.is_animated(_parameter):
+                return False
+        for _step in layer_plan.get_steps():
+            _function = _step.get_template().get_time_dependency_function()
+            if _function is None:
+                continue
+            _arguments = cls.get_step_arguments(_step, sequence_ctx)
+            if _function(*_arguments):
+                return False
+        return True
+
+    @classmethod
+    def _render_visual_layer_cached(cls,
+                                    layer_plan: LayerPlan,
+                                    region: tuple[int, int, int, int],
+                                    sequence_ctx: SequenceContext
+                                    ) -> tuple[moderngl.Texture,
+                                               tuple[int, int, int, int],
+                                               bool]:
+        """Render a region of a VisualLayer, reusing it if possible.
+
+        A time-invariant layer is reused while its cached region
+        contains the requested one. Return the texture, the region it
+        holds, and whether it belongs to the layer cache rather than
+        to the caller.
+        """
+        _layer = layer_plan.get_layer()
+        _render_function = layer_plan.get_render_function()
+        if not cls.is_layer_time_invariant(layer_plan, sequence_ctx):
+            GLContext.get_layer_cache().remove(_layer)
+            return (_render_function(layer_plan, sequence_ctx, region),
+                    region, False)
+        _key = (layer_plan.get_content_revision(),
+                sequence_ctx.get_resolution_scale(),
+                sequence_ctx.get_quality(),
+                sequence_ctx.get_image_format())
+        _layer_cache = GLContext.get_layer_cache()
+        _entry = _layer_cache.get(_layer, _key, region)
+        if _entry is None:
+            _texture = _render_function(layer_plan, sequence_ctx, region)
+            _layer_cache.put(_layer, _key, _texture, region)
+            return _texture, region, True
+        _texture, _cached_region = _entry
+        return _texture, _cached_region, True
+
     @classmethod
     def render_solid_layer(cls,
                            layer: SolidLayer,
-                           sequence_ctx: SequenceContext
+                           sequence_ctx: SequenceContext,
+                           region: tuple[int, int, int, int] = None
                            ) -> moderngl.Texture:
-        """Render a SolidLayer to a texture."""
-        _width = layer.get_property("width").get_value()
-        _height = layer.get_property("height").get_value()
-        _context = RenderContext(_width, _height, sequence_ctx)
-        _color = cls.get_parameter_value(layer.get_property_parameter("color"),
-                                         sequence_ctx)
-        _texture = cls.create_color_texture(_width, _height, _color)
+        """Render a region of a SolidLayer to a texture."""
+        return cls.render_solid_layer_plan(cls.create_layer_plan(layer),
+                                           sequence_ctx, region)
+
+    @classmethod
+    def render_solid_layer_plan(cls,
+                                layer_plan: LayerPlan,
+                                sequence_ctx: SequenceContext,
+                                region: tuple[int, int, int, int] = None
+                                ) -> moderngl.Texture:
+        """Render a region of a SolidLayer to a texture from its plan."""
+        _layer = layer_plan.get_layer()
+        _width, _height = cls.get_layer_dimensions(_layer, sequence_ctx)
+        _context = RenderContext(_width, _height, sequence_ctx, region)
+        _color = cls.get_parameter_value(
+            _layer.get_property_parameter("color"), sequence_ctx)
+        _title = _layer.get_title()
+        with RenderProfiler.step(_title, "color"):
+            _texture = cls.create_color_texture(
+                _context.get_region_width(), _context.get_region_height(),
+                _color, _context.get_image_format())
         _context.set_src_texture(_texture)
-        _modifier_list = layer.get_modifier_list()
-        _start_index = 0
-        for _modifier_index in range(_start_index, len(_modifier_list)):
-            _modifier = _modifier_list[_modifier_index]
-            if ModifierService.modifier_has_flag(
-                _modifier, ModifierFlag.WRITEONLY):
-                _start_index = _modifier_index
-        for _modifier_index in range(_start_index, len(_modifier_list)):
-            _modifier = _modifier_list[_modifier_index]
-            cls.apply_modifier_to_render_context(_modifier, _context)
+        for _render_pass in layer_plan.get_passes():
+            _chain_name = "+".join(_render_pass.get_chain())
+            with RenderProfiler.step(_title, _chain_name), Trace.span(
+                    "apply modifiers", "render", chain=_chain_name):
+                cls.apply_pass_to_render_context(_render_pass, _context)
             _context.roll_textures()
         _context.release_dest_texture()
         return _context.get_src_texture()
@@ -128,232 +581,184 @@ class RenderService:
     def create_color_texture(cls,
                              width: int,
                              height: int,
-                             color: tuple = (0, 0, 0, 0)
+                             color: tuple = (0, 0, 0, 0),
+                             image_format: ImageFormat = ImageFormat.FLOAT32
                              ) -> moderngl.Texture:
         """Render a SolidLayer to a texture using a fragment shader."""
-        _gl_context = GLContext.get_context()
-        if cls._color_shader is None:
-            _glsl_code = """
-            #version 430
-            layout (local_size_x = 1, local_size_y = 1) in;
-            layout (rgba32f, binding = 0) uniform writeonly image2D texture;
-            uniform vec4 color;
-            void main() {
-                imageStore(texture, ivec2(gl_GlobalInvocationID.xy), color);
-            }
-            """
-            cls._color_shader = _gl_context.compute_shader(_glsl_code)
-        _texture = _gl_context.texture((width, height), 4, dtype="f4")
+        _shader = GLContext.compute_shader_once(
+            "render_service.color", COLOR_SHADER_CODE,
+            image_format.get_shader_defines())
+        _texture = GLContext.get_texture_pool().acquire(
+            width, height, dtype=image_format.get_dtype())
         _texture.bind_to_image(0, read=False, write=True)
-        cls._color_shader["color"] = color
-        cls._color_shader.run(width, height, 1)
+        _shader["color"] = color
+        _shader.run(width, height, 1)
         return _texture
 
     @classmethod
     def render_sequence_frame(cls,
                               sequence: Sequence,
-                              frame: int
+                              frame: int,
+                              resolution_scale: float = 1,
+                              quality: RenderQuality = RenderQuality.FULL,
+                              output_format: ImageFormat = None
                               ) -> moderngl.Texture:
-        """Render a frame of a Sequence to an OpenGL texture."""
-        _width = sequence.get_width()
-        _height = sequence.get_height()
-        _sequence_ctx = SequenceContext(sequence, frame)
-        _gl_context = GLContext.get_context()
-        _result_texture = _gl_context.texture((_width, _height), 4, dtype="f4")
+        """Render a frame of a Sequence to an OpenGL texture.
 
-        # TODO : try avoiding doing this just to clear the texture
-        _fbo = _gl_context.framebuffer(color_attachments=[_result_texture])
-        _fbo.use()
-        _fbo.clear()
-        _fbo.release()
+        A resolution scale below 1 renders a reduced preview, whose
+        dimensions are those of the sequence times the scale. A draft
+        quality disables anti-aliasing, and lets modifiers lower their
+        accuracy. The frame is rendered in the working format of the
+        sequence, and tone mapped into the output format, which may
+        be 8-bit for display or PNG files. It defaults to the working
+        format.
 
-        _layer_list = sequence.get_layer_list()
-        for _layer in _layer_list:
-            if not isinstance(_layer, VisualLayer):
+        When profiling, each step of the frame is timed and reported
+        to the RenderProfiler. When tracking GPU resources, OpenGL
+        objects created or taken from the texture pool by the frame
+        and still alive at its end, with no long-lived owner, are
+        reported as leaks, apart from the returned texture.
+        """
+        GPUResourceTracker.begin_frame()
+        RenderProfiler.begin_frame(f"{sequence.get_title()} #{frame}")
+        try:
+            with Trace.span("render frame", "render", frame=frame,
+                            resolution_scale=resolution_scale):
+                _texture = cls._render_sequence_frame(
+                    sequence, frame, resolution_scale, quality,
+                    output_format)
+            GPUResourceTracker.adopt(_texture, "render_sequence_frame caller")
+            return _texture
+        finally:
+            RenderProfiler.end_frame()
+            GPUResourceTracker.end_frame(f"frame {frame}")
+
+    @classmethod
+    def _render_sequence_frame(cls,
+                               sequence: Sequence,
+                               frame: int,
+                               resolution_scale: float,
+                               quality: RenderQuality,
+                               output_format: ImageFormat
+                               ) -> moderngl.Texture:
+        """Render a frame of a Sequence, see render_sequence_frame."""
+        _sequence_ctx = SequenceContext(sequence, frame,
+                                        resolution_scale, quality)
+        _width = _sequence_ctx.get_width()
+        _height = _sequence_ctx.get_height()
+        _image_format = _sequence_ctx.get_image_format()
+        _texture_pool = GLContext.get_texture_pool()
+        _result_texture = _texture_pool.acquire(
+            _width, _height, dtype=_image_format.get_dtype())
+        _texture_pool.get_framebuffer(_result_texture).clear()
+
+        _render_plan = cls.get_render_plan(sequence)
+        for _layer_id in _render_plan.get_active_layer_ids(frame):
+            _layer_plan = _render_plan.get_layer_plan(_layer_id)
+            if _layer_plan is None:
                 continue
-            _start = _layer.get_start_frame()
-            _end = _layer.get_end_frame()
-            if frame < _start or frame >= _end:
+            _transform = cls.get_plan_transform(_layer_plan, _sequence_ctx)
+            _region = cls.get_visible_region(_layer_plan, _transform,
+                                             _sequence_ctx)
+            if _region is None:
                 continue
-            _texture = cls.render_visual_layer(_layer, _sequence_ctx)
-            cls._transform_visual_layer_texture(
-                _layer, _texture, _sequence_ctx)
-            _texture.release()
-            cls._composite_over(cls._transform_texture, _result_texture)
+            _layer = _layer_plan.get_layer()
+            with Trace.span("render layer", "render",
+                            layer=_layer.get_title()):
+                _texture, _region, _is_cached = (
+                    cls._render_visual_layer_cached(_layer_plan, _region,
+                                                    _sequence_ctx))
+            with RenderProfiler.step(_layer.get_title(), "composite"):
+                cls._draw_visual_layer(
+                    cls.get_layer_dimensions(_layer, _sequence_ctx),
+                    _texture, _region, _transform, _result_texture,
+                    _sequence_ctx)
+            if not _is_cached:
+                _texture_pool.release(_texture)
 
-        cls._tonemap(_result_texture)
-        return _result_texture
+        if output_format is None or output_format is _image_format:
+            with RenderProfiler.step("tonemap"):
+                cls._tonemap(_result_texture, _result_texture)
+            return _result_texture
+        _output_texture = _texture_pool.acquire(
+            _width, _height, dtype=output_format.get_dtype())
+        with RenderProfiler.step("tonemap"):
+            cls._tonemap(_result_texture, _output_texture)
+        _texture_pool.release(_result_texture)
+        return _output_texture
 
     @classmethod
-    def _tonemap(cls, texture: moderngl.Texture):
-        """Apply tone mapping to convert linear RGB to sRGB."""
+    @Trace.traced("render")
+    def _tonemap(cls,
+                 texture: moderngl.Texture,
+                 output_texture: moderngl.Texture):
+        """Apply tone mapping to convert linear RGB to sRGB.
+
+        The output texture may be the input texture itself, or have a
+        different format.
+        """
         # TODO : handle different tonemapping algorithms
-        _gl_context = GLContext.get_context()
-        if cls._tonemapping_shader is None:
-            _glsl_code = """
-            #version 430
-            layout (local_size_x = 1, local_size_y = 1) in;
-            layout (rgba32f, binding = 0) uniform image2D texture;
-            void main() {
-                ivec2 coords = ivec2(gl_GlobalInvocationID.xy);
-                vec4 color = imageLoad(texture, coords);
-                vec3 linear = color.rgb;
-
-                bvec3 cutoff = lessThan(linear, vec3(.0031308));
-                vec3 higher = 1.055*pow(linear, vec3(1./2.4)) - .055;
-                vec3 lower = linear * 12.92;
-                vec3 sRGB = mix(higher, lower, cutoff);
-
-                vec4 out_color = clamp(vec4(sRGB, color.a), 0., 1.);
-                imageStore(texture, coords.xy, out_color);
-            }
-            """
-            cls._tonemapping_shader = _gl_context.compute_shader(_glsl_code)
-        texture.bind_to_image(0, read=True, write=True)
-        cls._tonemapping_shader.run(texture.width, texture.height, 1)
+        _defines = ImageFormat.from_dtype(texture.dtype).get_shader_defines()
+        _defines["OUTPUT_FORMAT"] = ImageFormat.from_dtype(
+            output_texture.dtype).get_glsl_format()
+        _shader = GLContext.compute_shader_once(
+            "render_service.tonemapping", TONEMAPPING_SHADER_CODE, _defines)
+        texture.bind_to_image(0, read=True, write=False)
+        output_texture.bind_to_image(1, read=False, write=True)
+        _shader.run(texture.width, texture.height, 1)
 
     @classmethod
-    def _composite_over(cls,
-                        texture_a: moderngl.Texture,
-                        texture_b: moderngl.Texture):
-        """Composite two equal size moderngl Texture on top of each other."""
-        _gl_context = GLContext.get_context()
-        if cls._compositing_shader is None:
-            _glsl_code = """
-            #version 430
-            layout (local_size_x = 1, local_size_y = 1) in;
-            layout (rgba32f, binding = 0) uniform readonly image2D texture_a;
-            layout (rgba32f, binding = 1) uniform image2D texture_b;
-            void main() {
-                ivec2 coords = ivec2(gl_GlobalInvocationID.xy);
-                vec4 color_a = imageLoad(texture_a, coords);
-                vec4 out_color;
-                if(color_a.a == 1.){
-                    out_color = color_a;
-                }else{
-                    vec4 color_b = imageLoad(texture_b, coords);
-
-                    vec3 rgb_a = color_a.rgb;
-                    vec3 rgb_b = color_b.rgb;
-                    float alpha_a = color_a.a;
-                    float alpha_b = color_b.a;
-
-                    float out_alpha = alpha_a + alpha_b*(1.-alpha_a);
-                    vec3 out_rgb = (rgb_a*alpha_a+rgb_b*alpha_b*(1.-alpha_a));
-                    if(out_alpha > 0.){
-                        out_rgb /= out_alpha;
-                    }
-                    out_color = vec4(out_rgb, out_alpha);
-                }
-                imageStore(texture_b, coords.xy, out_color);
-            }
-            """
-            cls._compositing_shader = _gl_context.compute_shader(_glsl_code)
-        texture_a.bind_to_image(0, read=True, write=False)
-        texture_b.bind_to_image(1, read=True, write=True)
-        cls._compositing_shader.run(texture_a.width, texture_a.height, 1)
+    @Trace.traced("render")
+    def _draw_visual_layer(cls,
+                           layer_dimensions: tuple[int, int],
+                           texture: moderngl.Texture,
+                           region: tuple[int, int, int, int],
+                           transform: tuple,
+                           target_texture: moderngl.Texture,
+                           sequence_ctx: SequenceContext):
+        """Transform and blend a layer texture over the target texture.
+
+        The texture holds a region of the layer, and is drawn as a
+        single quad with premultiplied alpha blending, so only the
+        pixels it covers are touched. The edges of the layer are
+        anti-aliased from their analytic coverage of each pixel.
+        """
+        _position, _anchor, _scale, _rotation, _opacity = transform
+        _region_x, _region_y, _region_width, _region_height = region
+        _anti_aliasing = (Config.render.anti_aliasing_samples > 1
+                          and sequence_ctx.get_quality()
+                          is RenderQuality.FULL)
+        _margin = (0, 0)
+        if _anti_aliasing:
+            # One screen pixel, in texture coordinates.
+            _margin = (1/(_region_width*abs(_scale[0])),
+                       1/(_region_height*abs(_scale[1])))
+
+        _program = GLContext.program_once(
+            "render_service.transform",
+            TRANSFORM_VERTEX_CODE, TRANSFORM_FRAGMENT_CODE)
+        _program["in_texture"] = 0
+        _program["context_size"] = (sequence_ctx.get_width(),
+                                    sequence_ctx.get_height())
+        _program["layer_size"] = layer_dimensions
+        _program["region_offset"] = _region_x, _region_y
+        _program["region_size"] = _region_width, _region_height
+        _program["position"] = _position
+        _program["anchor"] = _anchor
+        _program["scale"] = _scale
+        _program["rotation"] = _rotation
+        _program["opacity"] = _opacity
+        _program["margin"] = _margin
+        _program["anti_aliasing"] = _anti_aliasing
 
-    @classmethod
-    def _transform_visual_layer_texture(cls,
-                                        visual_layer: VisualLayer,
-                                        texture: moderngl.Texture,
-                                        sequence_ctx: SequenceContext):
-        """Transform a texture based on a VisualLayer geometry."""
-        out_width = sequence_ctx.get_width()
-        out_height = sequence_ctx.get_height()
         _gl_context = GLContext.get_context()
-        _tex_width = texture.width
-        _tex_height = texture.height
-        if cls._transform_program is None:
-            _vertex_code = """
-            #version 330 core
-            in vec2 in_uv;
-            out vec2 uv;
-            uniform vec2 context_size;
-            uniform vec2 texture_size;
-            uniform vec2 position;
-            uniform vec2 anchor;
-            uniform vec2 scale;
-            uniform float rotation;
-            void main() {
-                mat2 rot = mat2(cos(rotation), sin(rotation),
-                                -sin(rotation), cos(rotation));
-                vec2 transformed_pos = texture_size*scale*(in_uv-anchor);
-                transformed_pos = rot*transformed_pos;
-                transformed_pos += position*context_size;
-                transformed_pos = transformed_pos*2./context_size - 1.;
-                transformed_pos.y *= -1.;
-                gl_Position = vec4(transformed_pos, 0., 1.);
-                uv = in_uv;
-            }
-            """
-            _fragment_code = """
-            #version 330 core
-            in vec2 uv;
-            out vec4 out_color;
-            uniform sampler2D in_texture;
-            uniform float opacity;
-            void main() {
-                vec4 tex_color = texture(in_texture, uv);
-                out_color = vec4(tex_color.rgb, tex_color.a * opacity);
-            }
-            """
-            cls._transform_program = _gl_context.program(
-                vertex_shader=_vertex_code,
-                fragment_shader=_fragment_code
-            )
-        _quad_vertices = np.array([0,0,1,0,0,1,1,1], dtype=np.float32)
-        _vbo = _gl_context.buffer(_quad_vertices.tobytes())
-        _vao = _gl_context.vertex_array(cls._transform_program, _vbo, "in_uv")
+        # Make the writes of compute shaders visible to sampling.
+        _gl_context.memory_barrier()
         texture.use(location=0)
-
-        # TODO : make this part thread safe, by storing the geometrical info
-        # about the layer inside the RenderContext
-        _position = cls.get_parameter_value(
-            visual_layer.get_property_parameter("position"), sequence_ctx)
-        _anchor = cls.get_parameter_value(
-            visual_layer.get_property_parameter("anchor"), sequence_ctx)
-        _scale = cls.get_parameter_value(
-            visual_layer.get_property_parameter("scale"), sequence_ctx)
-        _rotation = cls.get_parameter_value(
-            visual_layer.get_property_parameter("rotation"), sequence_ctx)
-        _opacity = cls.get_parameter_value(
-            visual_layer.get_property_parameter("opacity"), sequence_ctx)
-
-        cls._transform_program["in_texture"] = 0
-        cls._transform_program["context_size"] = out_width, out_height
-        cls._transform_program["texture_size"] = _tex_width, _tex_height
-        cls._transform_program["position"] = _position
-        cls._transform_program["anchor"] = _anchor
-        cls._transform_program["scale"] = _scale
-        cls._transform_program["rotation"] = _rotation
-        cls._transform_program["opacity"] = _opacity
-
-        if (cls._transform_texture is not None
-            and (cls._transform_texture.width != out_width
-                 or cls._transform_texture.height != out_height)):
-            cls._transform_msaa_texture.release()
-            cls._transform_msaa_fbo.release()
-            cls._transform_texture.release()
-            cls._transform_fbo.release()
-            cls._transform_msaa_texture = None
-            cls._transform_msaa_fbo = None
-            cls._transform_texture = None
-            cls._transform_fbo = None
-
-        if cls._transform_texture is None:
-            cls._transform_msaa_texture = _gl_context.texture(
-                (out_width, out_height), 4, dtype="f4",
-                samples=Config.render.anti_aliasing_samples)
-            cls._transform_msaa_fbo = _gl_context.framebuffer(
-                color_attachments=[cls._transform_msaa_texture])
-            cls._transform_texture = _gl_context.texture(
-                (out_width, out_height), 4, dtype="f4")
-            cls._transform_fbo = _gl_context.framebuffer(
-                color_attachments=[cls._transform_texture])
-
-        cls._transform_msaa_fbo.use()
-        cls._transform_msaa_fbo.clear(0, 0, 0, 0)
-        _vao.render(moderngl.TRIANGLE_STRIP)
-        _gl_context.copy_framebuffer(cls._transform_fbo,
-                                     cls._transform_msaa_fbo)
+        GLContext.get_texture_pool().get_framebuffer(target_texture).use()
+        _gl_context.enable(moderngl.BLEND)
+        _gl_context.blend_func = moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA
+        GLContext.quad_vertex_array_once(
+            "render_service.transform", _program).render(
+                moderngl.TRIANGLE_STRIP)
+        _gl_context.disable(moderngl.BLEND)
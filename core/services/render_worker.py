@@ -0,0 +1,118 @@
+"""
+Thread rendering frames in the background.
+
+The RenderWorker class is a thread which owns its own moderngl
+context and renders frames requested by clients, such as viewers.
+Requests wait in a priority queue, and each client has at most one
+pending request: a new request from a client replaces its previous
+one, so that only the newest frame gets rendered. Rendered frames
+are delivered to the clients as Image objects, through callbacks
+called from the worker thread. Frames found in the frame cache of
+the worker are delivered without being rendered or read back.
+"""
+
+from typing import Callable, Hashable
+import heapq
+import threading
+import traceback
+
+from core.entities.image_format import ImageFormat
+from core.entities.sequence_context import RenderQuality
+from core.services.cache_service import CacheService
+from core.services.modifier_service import ModifierService
+from utils.image import Image
+
+
+class RenderWorker(threading.Thread):
+    """Thread rendering frames in the background."""
+
+    _condition: threading.Condition
+    _queue: list[tuple[int, int, Hashable]]
+    # heap(tuple[priority, order, client])
+    _pending: dict[Hashable, tuple[int, int, int, float, RenderQuality,
+                                   ImageFormat,
+                                   Callable[[Image, int], None]]]
+    # dict(client => tuple[order, sequence_id, frame, resolution_scale,
+    #                      quality, output_format, callback])
+    _order: int
+    _running: bool
+
+    def __init__(self):
+        super().__init__(name="RenderWorker", daemon=True)
+        self._condition = threading.Condition()
+        self._queue = []
+        self._pending = dict()
+        self._order = 0
+        self._running = True
+
+    def request_frame(self,
+                      client: Hashable,
+                      sequence_id: int,
+                      frame: int,
+                      callback: Callable[[Image, int], None],
+                      resolution_scale: float = 1,
+                      quality: RenderQuality = RenderQuality.FULL,
+                      output_format: ImageFormat = None,
+                      priority: int = 0):
+        """Ask for a frame of a sequence to be rendered.
+
+        Any request of the same client which has not started yet is
+        dropped. Requests with a lower priority value are rendered
+        first. The callback receives the rendered Image, in the given
+        output format, and the frame number, and is called from the
+        worker thread. The Image may be shared with the frame cache,
+        and must not be modified.
+        """
+        with self._condition:
+            self._order += 1
+            self._pending[client] = (self._order, sequence_id, frame,
+                                     resolution_scale, quality,
+                                     output_format, callback)
+            heapq.heappush(self._queue, (priority, self._order, client))
+            self._condition.notify()
+
+    def cancel_requests(self, client: Hashable):
+        """Drop the pending request of a client, if any."""
+        with self._condition:
+            self._pending.pop(client, None)
+
+    def stop(self):
+        """Ask the thread to stop after the current request."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def run(self):
+        """Render the requested frames until stopped."""
+        ModifierService.warm_up_all_shaders()
+        while True:
+            with self._condition:
+                _job = self._next_job()
+                while _job is None and self._running:
+                    self._condition.wait()
+                    _job = self._next_job()
+                if not self._running:
+                    break
+            (_sequence_id, _frame, _resolution_scale,
+             _quality, _output_format, _callback) = _job
+            try:
+                _image = CacheService.request_sequence_image(
+                    _sequence_id, _frame, _resolution_scale, _quality,
+                    _output_format)
+                _callback(_image, _frame)
+            except Exception:
+                traceback.print_exc()
+
+    def _next_job(self) -> tuple[int, int, float, RenderQuality,
+                                 ImageFormat,
+                                 Callable[[Image, int], None]]:
+        """Pop the most urgent pending request, or return None."""
+        while self._queue:
+            _priority, _order, _client = heapq.heappop(self._queue)
+            _request = self._pending.get(_client)
+            if _request is None or _request[0] != _order:
+                # This request was replaced by a newer one.
+                continue
+            del self._pending[_client]
+            return _request[1:]
+        return None
@@ -13,7 +13,11 @@ from data_types.ndarray import NDArray
 class Boolean(NDArray):
     """Represents a boolean."""
 
+    __slots__ = ()
+    DTYPE = np.bool_
+    SHAPE = (1,)
+
     _value: np.ndarray
 
     def __init__(self, value: bool):
-        super().__init__(value, dtype=np.bool_, shape=1)
+        super().__init__(value, dtype=self.DTYPE, shape=self.SHAPE)
@@ -17,6 +17,10 @@ from utils.color_management import ColorSpace, ColorManagement
 class Color(NDArray):
     """Represents a sRGB color in RGBA floating point format."""
 
+    __slots__ = ("_color_space", "_other_spaces_values")
+    DTYPE = np.float32
+    SHAPE = (4,)
+
     _color_space: ColorSpace
     _value: np.ndarray
     _other_spaces_values: dict[ColorSpace, np.ndarray]
@@ -60,7 +64,7 @@ class Color(NDArray):
         """Add two colors in linear color space."""
         if not isinstance(other, self.__class__):
             raise TypeError(f"Impossible to add {self} and {other}.")
-        return self.__class__(self.get_value() + other.get_value())
+        return self.from_raw_value(self.get_value() + other.get_value())
 
     def __sub__(self, other: Self) -> Self:
         """Subtract two colors in linear color space."""
@@ -70,7 +74,7 @@ class Color(NDArray):
 
     def __mul__(self, factor: float) -> Self:
         """Multiply by a float factor in linear color space."""
-        return self.__class__(self.get_value() * factor)
+        return self.from_raw_value(self.get_value() * factor)
 
     def __truediv__(self, factor: float) -> Self:
         """Divide by a float factor."""
@@ -83,7 +87,7 @@ class Color(NDArray):
             value = np.maximum(min_value.get_value(), value)
         if max_value is not None:
             value = np.minimum(max_value.get_value(), value)
-        return self.__class__(value)
+        return self.from_raw_value(value)
 
     def get_value(self, color_space=ColorSpace.LINEAR):
         """Return the color as a float array in a given color space."""
@@ -94,6 +98,16 @@ class Color(NDArray):
                 self._value, self._color_space, color_space)
         return self._other_spaces_values[color_space]
 
+    def get_raw_value(self) -> np.ndarray:
+        """Return the color in linear color space, where it is added."""
+        return self.get_value()
+
+    def _set_raw_value(self, raw_value: np.ndarray):
+        """Store a trusted raw color, in linear color space."""
+        super()._set_raw_value(raw_value)
+        self._color_space = ColorSpace.LINEAR
+        self._other_spaces_values = dict()
+
     def get_color_space(self) -> ColorSpace:
         """Return the color space used to define the color."""
         return self._color_space
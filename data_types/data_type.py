@@ -4,7 +4,9 @@ Represents an abstract DataType.
 This module defines the DataType abstract class, which provides
 basic arithmetic operations for data of a specific type. The class
 supports addition, subtraction, multiplication, and division,
-and can be combined with both instances and numeric values.
+and can be combined with both instances and numeric values. Results
+are created from their raw value, without the validation of the
+constructor, and interpolations are fused into a single instance.
 """
 
 from typing import Any, Self
@@ -13,6 +15,7 @@ from typing import Any, Self
 class DataType:
     """Represents abstract data."""
 
+    __slots__ = ("_value",)
     _value: Any
 
     def __init__(self, value):
@@ -26,7 +29,7 @@ class DataType:
         """Add two objects of this data type."""
         if not isinstance(other, self.__class__):
             raise TypeError(f"Impossible to add {self} and {other}.")
-        return self.__class__(self._value + other._value)
+        return self.from_raw_value(self._value + other._value)
 
     def __sub__(self, other: Self) -> Self:
         """Subtract two objects of this data type."""
@@ -36,7 +39,7 @@ class DataType:
 
     def __mul__(self, factor: float) -> Self:
         """Multiply by a float factor."""
-        return self.__class__(self._value * factor)
+        return self.from_raw_value(self._value * factor)
 
     def __truediv__(self, factor: float) -> Self:
         """Divide by a float factor."""
@@ -49,12 +52,53 @@ class DataType:
             value = max(min_value._value, value)
         if max_value is not None:
             value = min(max_value._value, value)
-        return self.__class__(value)
+        return self.from_raw_value(value)
 
     def get_value(self):
         """Return the value as a common type."""
         return self._value
 
+    def get_raw_value(self) -> Any:
+        """Return the stored value, for arithmetic on raw values.
+
+        Raw values follow the arithmetic of the data type, and
+        from_raw_value turns them back into instances.
+        """
+        return self._value
+
+    @classmethod
+    def from_raw_value(cls, raw_value: Any) -> Self:
+        """Create an instance from a raw value, without validation.
+
+        The raw value must be one get_raw_value could return, up to
+        the precision of its numbers.
+        """
+        _instance = cls.__new__(cls)
+        _instance._set_raw_value(raw_value)
+        return _instance
+
+    def _set_raw_value(self, raw_value: Any):
+        """Store a trusted raw value."""
+        self._value = raw_value
+
+    def lerp(self, other: Self, t: float) -> Self:
+        """Interpolate linearly to another value with factor t.
+
+        This is self*(1-t) + other*t, creating a single instance.
+        """
+        return self.from_raw_value(self.get_raw_value()*(1-t)
+                                   + other.get_raw_value()*t)
+
+    @classmethod
+    def weighted_sum(cls,
+                     values: tuple[Self, ...],
+                     weights: tuple[float, ...]) -> Self:
+        """Return the sum of values times weights, as one instance."""
+        _raw_value = values[0].get_raw_value()*weights[0]
+        for _value, _weight in zip(values[1:], weights[1:]):
+            _raw_value = _raw_value + _value.get_raw_value()*_weight
+        return cls.from_raw_value(_raw_value)
+
     @classmethod
     def default(cls):
         """Return an instance with default value."""
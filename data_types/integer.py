@@ -13,10 +13,14 @@ from data_types.ndarray import NDArray
 class Integer(NDArray):
     """Represents an integer number."""
 
+    __slots__ = ()
+    DTYPE = np.int32
+    SHAPE = (1,)
+
     _value: np.ndarray
 
     def __init__(self, value: int):
-        super().__init__(value, dtype=np.int32, shape=1)
+        super().__init__(value, dtype=self.DTYPE, shape=self.SHAPE)
 
 
 Integer.Maximum = Integer(2**31-1)
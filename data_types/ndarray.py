@@ -3,7 +3,8 @@ Represents a N-dimensional array.
 
 This module defines the NDArray DataType, which represents a matrix
 of numbers. It is stored as a numpy array and can be of a defined
-numpy dtype and shape.
+numpy dtype and shape. Subclasses of a fixed dtype and shape declare
+them, such that values computed from raw arrays are only cast.
 """
 
 from typing import Union, Type, Any, Self
@@ -16,6 +17,10 @@ from data_types.data_type import DataType
 class NDArray(DataType):
     """Represents a N-dimensional array."""
 
+    __slots__ = ("_shape", "_dtype")
+    DTYPE: Type = None
+    SHAPE: tuple[int, ...] = None
+
     _value: np.ndarray
     _shape: tuple[int, ...]
     _dtype: Type
@@ -76,7 +81,16 @@ class NDArray(DataType):
             value = np.maximum(min_value._value, value)
         if max_value is not None:
             value = np.minimum(max_value._value, value)
-        return self.__class__(value)
+        return self.from_raw_value(value)
+
+    def _set_raw_value(self, raw_value: np.ndarray):
+        """Store a trusted raw array, cast to the dtype of the class."""
+        self._value = np.asarray(raw_value, dtype=self.DTYPE)
+        if self.DTYPE is None:
+            self._dtype = self._value.dtype
+        else:
+            self._dtype = self.DTYPE
+        self._shape = self._value.shape
 
     def __repr__(self):
         """Return a string representation of the NDArray."""
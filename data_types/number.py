@@ -13,10 +13,14 @@ from data_types.ndarray import NDArray
 class Number(NDArray):
     """Represents a floating point number."""
 
+    __slots__ = ()
+    DTYPE = np.float32
+    SHAPE = (1,)
+
     _value: np.ndarray
 
     def __init__(self, value: float):
-        super().__init__(value, dtype=np.float32, shape=1)
+        super().__init__(value, dtype=self.DTYPE, shape=self.SHAPE)
 
 
 Number.Infinity = Number(float("inf"))
@@ -14,10 +14,14 @@ from data_types.ndarray import NDArray
 class Vector2(NDArray):
     """Represents a floating point 2D vector."""
 
+    __slots__ = ()
+    DTYPE = np.float32
+    SHAPE = (2,)
+
     _value: np.ndarray
 
     def __init__(self, *values):
-        super().__init__(*values, dtype=np.float32, shape=2)
+        super().__init__(*values, dtype=self.DTYPE, shape=self.SHAPE)
 
 
 Vector2.Infinity = Vector2(float("inf"))
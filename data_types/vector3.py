@@ -13,7 +13,11 @@ from data_types.ndarray import NDArray
 class Vector3(NDArray):
     """Represents a floating point 3D vector."""
 
+    __slots__ = ()
+    DTYPE = np.float32
+    SHAPE = (3,)
+
     _value: np.ndarray
 
     def __init__(self, *values):
-        super().__init__(*values, dtype=np.float32, shape=3)
+        super().__init__(*values, dtype=self.DTYPE, shape=self.SHAPE)
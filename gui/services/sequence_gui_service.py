@@ -1,16 +1,19 @@
 """A set of services for sequence related GUI elements."""
 
-import moderngl
+from typing import Callable, Hashable
 
 from core.services.layer_service import LayerService
 from gui.views.dialogs.sequence_dialog import SequenceDialog
 from gui.views.dialogs.solid_layer_dialog import SolidLayerDialog
 from core.services.project_service import ProjectService
-from core.services.render_service import RenderService
+from core.services.render_worker import RenderWorker
+from core.entities.sequence_context import RenderQuality
+from core.entities.image_format import ImageFormat
 from core.entities.solid_layer import SolidLayer
 from core.entities.sequence import Sequence
 from utils.notification import Notification
 from core.entities.layer import Layer
+from utils.image import Image
 
 
 class SequenceGUIService:
@@ -27,16 +30,17 @@ class SequenceGUIService:
 
     _focused_sequence: int = None
     _selected_layers: dict[int, list[int]] = dict()
+    _render_worker: RenderWorker = None
 
     @classmethod
     def create_new_sequence(cls):
         """Create a new sequence."""
         _dialog = SequenceDialog()
         if _dialog.exec():
-            (_title, _width, _height,
-             _frame_rate, _duration) = _dialog.get_values()
+            (_title, _width, _height, _frame_rate,
+             _duration, _image_format) = _dialog.get_values()
             _sequence = Sequence(_title, _width, _height,
-                                 _duration, _frame_rate)
+                                 _duration, _frame_rate, _image_format)
             _id = ProjectService.add_sequence_to_project(_sequence)
             cls.create_sequence_signal.emit(_id)
             cls.open_sequence_signal.emit(_id)
@@ -49,8 +53,8 @@ class SequenceGUIService:
         _sequence = cls.get_focused_sequence()
         _dialog = SequenceDialog(_sequence)
         if _dialog.exec():
-            (_title, _width, _height,
-             _frame_rate, _duration) = _dialog.get_values()
+            (_title, _width, _height, _frame_rate,
+             _duration, _image_format) = _dialog.get_values()
             for _layer in _sequence.get_layer_list():
                 LayerService.adapt_layer_to_frame_rate(
                     _layer, _sequence.get_frame_rate(), _frame_rate)
@@ -59,19 +63,45 @@ class SequenceGUIService:
             _sequence.set_height(_height)
             _sequence.set_frame_rate(_frame_rate)
             _sequence.set_duration(_duration)
+            _sequence.set_image_format(_image_format)
             cls.update_sequence_signal.emit(cls._focused_sequence)
     
-    @staticmethod
-    def request_texture_from_sequence(sequence_id: int,
-                                      frame: int
-                                      ) -> moderngl.Texture:
-        """Return a rendered frame within a sequence."""
-        # TODO : Optimize a lot this part, render only if needed
-        # (probably better to do it in the core package,
-        # with a MemoryStorage class for instance)
-        _sequence = ProjectService.get_sequence_by_id(sequence_id)
-        _texture = RenderService.render_sequence_frame(_sequence, frame)
-        return _texture
+    @classmethod
+    def request_frame(cls,
+                      client: Hashable,
+                      sequence_id: int,
+                      frame: int,
+                      callback: Callable[[Image, int], None],
+                      resolution_scale: float = 1,
+                      quality: RenderQuality = RenderQuality.FULL,
+                      output_format: ImageFormat = None):
+        """Ask the render thread for a frame within a sequence.
+
+        Only the newest request of each client is rendered, and the
+        callback is called from the render thread with the Image.
+        A resolution scale below 1 renders a reduced preview. The
+        output format defaults to the working format of the sequence.
+        """
+        if cls._render_worker is None:
+            cls._render_worker = RenderWorker()
+            cls._render_worker.start()
+        cls._render_worker.request_frame(client, sequence_id, frame,
+                                         callback, resolution_scale,
+                                         quality, output_format)
+
+    @classmethod
+    def cancel_frame_requests(cls, client: Hashable):
+        """Drop the pending frame request of a client."""
+        if cls._render_worker is not None:
+            cls._render_worker.cancel_requests(client)
+
+    @classmethod
+    def stop_render_thread(cls):
+        """Stop the render thread, if it was started."""
+        if cls._render_worker is not None:
+            cls._render_worker.stop()
+            cls._render_worker.join()
+            cls._render_worker = None
 
     @classmethod
     def focus_sequence(cls, sequence_id: int=None):
@@ -7,7 +7,8 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPalette, QColor
 
 from gui.views.main_window import MainWindow
-from core.entities.gl_context import GLContext
+from gui.services.sequence_gui_service import SequenceGUIService
+from core.services.modifier_service import ModifierService
 from utils.config import Config
 
 
@@ -21,7 +22,10 @@ class App(QApplication):
         self.setAttribute(Qt.AA_EnableHighDpiScaling)
         super().__init__()
 
-        GLContext.get_context()
+        # Rendering happens on a separate thread, which owns its own
+        # moderngl context and needs the modifiers to be loaded.
+        ModifierService.load_modifiers_from_directory()
+        self.aboutToQuit.connect(SequenceGUIService.stop_render_thread)
         _main_window = MainWindow()
         _screens = self.screens()
         if Config.window.second_screen and len(_screens) > 1:
@@ -15,7 +15,7 @@ from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from utils.config import Config
 from data_types.color import Color
 from gui.services.dialog_gui_service import DialogGUIService
-from utils.color_management import ColorSpace
+from utils.color_management import ColorSpace, ColorManagement
 from gui.views.inputs.type_number_input import TypeNumberInput
 
 
@@ -90,21 +90,24 @@ class ColorPickerSlider(QSlider):
         if self._type in [ColorSliderType.HUE,
                           ColorSliderType.CHROMA,
                           ColorSliderType.LIGHTNESS]:
-            _lch = self._style_color.get_value(ColorSpace.OKLCH)
-            for _i in _gradient_linspace:
-                if self._type == ColorSliderType.HUE:
-                    _color = Color(_lch[0], _lch[1], _i%1,
-                                    color_space=ColorSpace.OKLCH)
-                elif self._type == ColorSliderType.CHROMA:
-                    _color = Color(_lch[0], _i, _lch[2],
-                                   color_space=ColorSpace.OKLCH)
-                elif self._type == ColorSliderType.LIGHTNESS:
-                    _color = Color(_i, _lch[1], _lch[2],
-                                   color_space=ColorSpace.OKLCH)
-                
-                _rgba = _color.get_value(ColorSpace.SRGB)
-                if np.max(_rgba[:3]) <= 1 and np.min(_rgba[:3]) >= 0:
-                   _qcolor = QColor.fromRgbF(*_rgba[:3])
+            # Convert all the stops of the gradient at once:
+            _lchs = np.tile(self._style_color.get_value(ColorSpace.OKLCH),
+                            (_gradient_resolution, 1))
+            if self._type == ColorSliderType.HUE:
+                _lchs[:, 2] = _gradient_linspace%1
+            elif self._type == ColorSliderType.CHROMA:
+                _lchs[:, 1] = _gradient_linspace
+            elif self._type == ColorSliderType.LIGHTNESS:
+                _lchs[:, 0] = _gradient_linspace
+            _rgbas = ColorManagement.convert(_lchs, ColorSpace.OKLCH,
+                                             ColorSpace.SRGB)
+            _in_gamut = np.all((_rgbas[:, :3] >= 0) & (_rgbas[:, :3] <= 1),
+                               axis=1)
+
+            for _i, _rgba, _valid in zip(_gradient_linspace, _rgbas,
+                                         _in_gamut):
+                if _valid:
+                    _qcolor = QColor.fromRgbF(*_rgba[:3])
                 else:
                     _qcolor = QColor.fromRgbF(0, 0, 0, 0)
                 _gradient.setColorAt(_i, _qcolor)
@@ -7,10 +7,12 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLineEdit, QWidget,
 
 from utils.config import Config
 from core.entities.sequence import Sequence
+from core.entities.image_format import ImageFormat
 from gui.views.inputs.text_input import TextInput
 from gui.views.inputs.integer_input import IntegerInput
 from gui.views.inputs.type_number_input import TypeNumberInput
 from gui.views.inputs.time_input import TimeInput
+from gui.views.inputs.dropdown_input import DropdownInput
 from data_types.number import Number
 from gui.services.dialog_gui_service import DialogGUIService
 
@@ -18,11 +20,14 @@ from gui.services.dialog_gui_service import DialogGUIService
 class SequenceDialog(QDialog):
     """A dialog for setting sequence parameters."""
 
+    WORKING_FORMATS = [ImageFormat.FLOAT32, ImageFormat.FLOAT16]
+
     _title_input: TextInput
     _width_input: IntegerInput
     _height_input: IntegerInput
     _fps_input: TypeNumberInput
     _duration_input: TimeInput
+    _precision_input: DropdownInput
     _ok_button: QPushButton
 
 
@@ -36,17 +41,19 @@ class SequenceDialog(QDialog):
             _height = Config.sequence.default_height
             _frame_rate = Config.sequence.default_frame_rate
             _duration = Config.sequence.default_duration
+            _image_format = ImageFormat.FLOAT32
         else:
             _title = sequence.get_title()
             _width = sequence.get_width()
             _height = sequence.get_height()
             _frame_rate = sequence.get_frame_rate()
             _duration = sequence.get_duration()
+            _image_format = sequence.get_image_format()
 
         self.setWindowTitle("Create new sequence" if _create
                             else "Sequence parameters")
         self.setWindowIcon(QIcon(Config.app.icon))
-        self.setFixedSize(QSize(400, 250))
+        self.setFixedSize(QSize(400, 285))
 
         _layout = QVBoxLayout()
         _layout.setContentsMargins(40, 20, 40, 20)
@@ -58,6 +65,9 @@ class SequenceDialog(QDialog):
         self._height_input = IntegerInput(self, _height, min=1)
         self._fps_input = TypeNumberInput(self, _frame_rate, min=.01, decimals=1)
         self._duration_input = TimeInput(self, _duration, _frame_rate, min=1)
+        self._precision_input = DropdownInput(
+            self, self.WORKING_FORMATS.index(_image_format),
+            [_format.get_title() for _format in self.WORKING_FORMATS])
 
         self._fps_input.value_changed.connect(self.changed_frame_rate)
         self._title_input.selectAll()
@@ -68,19 +78,23 @@ class SequenceDialog(QDialog):
         DialogGUIService.add_input(self, _layout, "Height", self._height_input, "px")
         DialogGUIService.add_input(self, _layout, "Frame rate", self._fps_input, "f/s")
         DialogGUIService.add_input(self, _layout, "Duration", self._duration_input)
+        DialogGUIService.add_input(self, _layout, "Precision",
+                                   self._precision_input)
 
         DialogGUIService.add_ok_cancel(
             self, _layout, ok_text="Create sequence" if _create else "Apply")
         self.setLayout(_layout)
 
-    def get_values(self) -> tuple[str, int, int, float, int]:
+    def get_values(self) -> tuple[str, int, int, float, int, ImageFormat]:
         """Return the user inputs."""
         _title = self._title_input.get_value()
         _width = self._width_input.get_int_value()
         _height = self._height_input.get_int_value()
         _frame_rate = self._fps_input.get_float_value()
         _duration = self._duration_input.get_value()
-        return _title, _width, _height, _frame_rate, _duration
+        _image_format = self.WORKING_FORMATS[
+            self._precision_input.get_int_value()]
+        return _title, _width, _height, _frame_rate, _duration, _image_format
 
     def changed_frame_rate(self, value: Number):
         """Handle changing the frame rate."""
@@ -12,15 +12,21 @@ import moderngl
 from PySide6.QtWidgets import QWidget
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtGui import QWheelEvent, QMouseEvent, QKeyEvent
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtCore import Qt, QPointF, QTimer, Signal
 
 from utils.config import Config
 from utils.image import Image
+from utils.trace import Trace
 from gui.services.sequence_gui_service import SequenceGUIService
+from core.services.project_service import ProjectService
+from core.entities.sequence_context import RenderQuality
+from core.entities.image_format import ImageFormat
 
 
 class GLViewer(QOpenGLWidget):
     """The OpenGL widget within a ViewerPane."""
+    frame_rendered = Signal(object, int)
+
     _program: moderngl.Program
     _vao: moderngl.VertexArray
     _texture: moderngl.Texture
@@ -35,6 +41,9 @@ class GLViewer(QOpenGLWidget):
     _mouse_middle_dragging: bool
     _mouse_last_position: QPointF
     _checkerboard: bool
+    _preview_resolution: float
+    _render_scale: float
+    _refine_timer: QTimer
 
     def __init__(self, parent: QWidget, sequence_id: int):
         super().__init__(parent)
@@ -48,8 +57,17 @@ class GLViewer(QOpenGLWidget):
         self._mouse_middle_dragging = False
         self._mouse_last_position = None
         self._checkerboard = False
+        self._preview_resolution = None
+        self._render_scale = None
         self._texture = None
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(Config.viewer.refine_delay)
+        self._refine_timer.timeout.connect(self.refine_texture)
         self.setFocusPolicy(Qt.WheelFocus)
+        # The signal is emitted from the render thread and queued to
+        # the thread of the widget, which owns the OpenGL context.
+        self.frame_rendered.connect(self.receive_frame)
         self.update_texture()
     
     def set_current_frame(self, frame: int):
@@ -63,15 +81,29 @@ class GLViewer(QOpenGLWidget):
         self._checkerboard = state
         self.update()
 
-    def set_texture(self, texture: moderngl.Texture):
-        """Set the displayed texture."""
-        if self._texture is not None:
-            self._texture.release()
-        self._texture = texture
-        self._texture.repeat_x = False
-        self._texture.repeat_y = False
+    @Trace.traced("gui")
+    def receive_frame(self, image: Image, frame: int):
+        """Display a frame rendered by the render thread."""
+        self.makeCurrent()
+        _gl_context = moderngl.create_context()
+        _width = image.get_width()
+        _height = image.get_height()
+        _dtype = ImageFormat.from_numpy_dtype(image.get_dtype()).get_dtype()
+        if (self._texture is None or self._texture.width != _width
+                or self._texture.height != _height
+                or self._texture.dtype != _dtype):
+            if self._texture is not None:
+                self._texture.release()
+            self._texture = _gl_context.texture((_width, _height), 4,
+                                                dtype=_dtype)
+            self._texture.repeat_x = False
+            self._texture.repeat_y = False
+            self._texture.filter = (moderngl.LINEAR_MIPMAP_LINEAR,
+                                    moderngl.NEAREST)
+        self._texture.write(image.get_data_bytes())
         self._texture.build_mipmaps()
-        self._texture.filter = moderngl.LINEAR_MIPMAP_LINEAR, moderngl.NEAREST
+        self.doneCurrent()
+        self.update()
 
     def resizeGL(self, width: int, height: int):
         """React to resizing."""
@@ -139,6 +171,7 @@ class GLViewer(QOpenGLWidget):
         _vbo = gl_context.buffer(_vertices.tobytes())
         self._vao = gl_context.vertex_array(self._program, _vbo, "in_uv")
 
+    @Trace.traced("gui")
     def paintGL(self):
         """Paint the OpenGL context."""
         _gl_context = moderngl.create_context()
@@ -161,8 +194,7 @@ class GLViewer(QOpenGLWidget):
         """Return the transformation matrix for displaying the texture."""
         _width = self.width() * self.devicePixelRatioF()
         _height = self.height() * self.devicePixelRatioF()
-        _tex_width = self._texture.width
-        _tex_height = self._texture.height
+        _tex_width, _tex_height = self.get_frame_dimensions()
         _scale_x = self._zoom * _tex_width / _width
         _scale_y = self._zoom * _tex_height / _height
         _offset_x = self._zoom * (1 - 2*self._center_x) * _tex_width/self.width()
@@ -178,6 +210,36 @@ class GLViewer(QOpenGLWidget):
     def set_zoom(self, value: float):
         self._zoom = max(Config.viewer.min_zoom,
                          min(value, Config.viewer.max_zoom))
+        if self.get_render_scale() != self._render_scale:
+            self.update_texture()
+
+    def get_frame_dimensions(self) -> tuple[int, int]:
+        """Return the dimensions of the displayed sequence.
+
+        The displayed texture may be smaller, when previewing at a
+        reduced resolution, and is stretched to these dimensions.
+        """
+        _sequence = ProjectService.get_sequence_by_id(self._sequence_id)
+        return _sequence.get_width(), _sequence.get_height()
+
+    def set_preview_resolution(self, resolution_scale: float = None):
+        """Choose the resolution scale of renders, None for automatic."""
+        self._preview_resolution = resolution_scale
+        if self.get_render_scale() != self._render_scale:
+            self.update_texture()
+
+    def get_render_scale(self) -> float:
+        """Return the resolution scale at which to render frames.
+
+        In automatic mode, the scale is the smallest of 1, 1/2 and
+        1/4 which still renders a pixel for each displayed pixel.
+        """
+        if self._preview_resolution is not None:
+            return self._preview_resolution
+        for _resolution_scale in (.25, .5):
+            if self._zoom <= _resolution_scale:
+                return _resolution_scale
+        return 1
 
     def get_zoom(self) -> float:
         """Return the zoom value."""
@@ -190,16 +252,14 @@ class GLViewer(QOpenGLWidget):
         """Set the viewer to fit its contents."""
         self._center_x = .5
         self._center_y = .5
-        if self._texture is not None:
-            _padding = Config.viewer.fit_padding
-            _width = self.width()*self.devicePixelRatioF()-2*_padding
-            _height = self.height()*self.devicePixelRatioF()-2*_padding
-            _tex_width = self._texture.width
-            _tex_height = self._texture.height
-            _zoom = min(_width/_tex_width, _height/_tex_height)
-            if max_zoom is not None:
-                _zoom = min(_zoom, max_zoom)
-            self.set_zoom(_zoom)
+        _padding = Config.viewer.fit_padding
+        _width = self.width()*self.devicePixelRatioF()-2*_padding
+        _height = self.height()*self.devicePixelRatioF()-2*_padding
+        _tex_width, _tex_height = self.get_frame_dimensions()
+        _zoom = min(_width/_tex_width, _height/_tex_height)
+        if max_zoom is not None:
+            _zoom = min(_zoom, max_zoom)
+        self.set_zoom(_zoom)
         self._fitting_zoom = not just_once
         self._fitting_zoom_max = max_zoom
         if update:
@@ -216,8 +276,7 @@ class GLViewer(QOpenGLWidget):
                                  widget_y: float
                                  ) -> tuple[float, float]:
         """Convert widget coordinates to texture coordinates."""
-        _tex_width = self._texture.width
-        _tex_height = self._texture.height
+        _tex_width, _tex_height = self.get_frame_dimensions()
         _img_x = (widget_x-self.width()*self.devicePixelRatioF()/2)/self._zoom
         _img_y = (widget_y-self.height()*self.devicePixelRatioF()/2)/self._zoom
         _img_x += self._center_x*_tex_width
@@ -229,8 +288,7 @@ class GLViewer(QOpenGLWidget):
                                  img_y: float
                                  ) -> tuple[float, float]:
         """Convert texture coordinates to widget coordinates."""
-        _tex_width = self._texture.width
-        _tex_height = self._texture.height
+        _tex_width, _tex_height = self.get_frame_dimensions()
         _widget_x = (img_x - self._center_x*_tex_width) * self._zoom
         _widget_y = (img_y - self._center_y*_tex_height) * self._zoom
         _widget_x += self.width()*self.devicePixelRatioF()/2
@@ -245,8 +303,7 @@ class GLViewer(QOpenGLWidget):
         _mouse_pos = event.position()
         _img_x, _img_y = self.widget_to_texture_coords(_mouse_pos.x(),
                                                        _mouse_pos.y())
-        _tex_width = self._texture.width
-        _tex_height = self._texture.height
+        _tex_width, _tex_height = self.get_frame_dimensions()
         _factor = np.exp(_delta / 100. * Config.viewer.zoom_sensitivity)
         self.set_zoom(self._zoom * _factor)
         if Config.viewer.zoom_around_cursor:
@@ -282,15 +339,30 @@ class GLViewer(QOpenGLWidget):
         """Drag using middle mouse button."""
         if self._texture is None:
             return
-        _tex_width = self._texture.width
-        _tex_height = self._texture.height
+        _tex_width, _tex_height = self.get_frame_dimensions()
         self._center_x -= delta.x() / self._zoom / _tex_width
         self._center_y -= delta.y() / self._zoom / _tex_height
         self.update()
 
+    @Trace.traced("gui")
     def update_texture(self):
-        """Update the displayed texture."""
-        self.set_texture(
-            SequenceGUIService.request_texture_from_sequence(
-                self._sequence_id, self._current_frame))
-        self.update()
+        """Ask for a draft of the displayed frame, refined when idle.
+
+        Each call postpones the refinement, such that scrubbing or
+        dragging a value only renders drafts until input stops.
+        Frames are tone mapped to 8-bit, which is enough for display.
+        """
+        self._render_scale = self.get_render_scale()
+        SequenceGUIService.request_frame(
+            self, self._sequence_id, self._current_frame,
+            self.frame_rendered.emit,
+            self._render_scale*Config.viewer.draft_resolution,
+            RenderQuality.DRAFT, ImageFormat.UINT8)
+        self._refine_timer.start()
+
+    def refine_texture(self):
+        """Ask the render thread for the displayed frame at full quality."""
+        SequenceGUIService.request_frame(
+            self, self._sequence_id, self._current_frame,
+            self.frame_rendered.emit, self._render_scale,
+            RenderQuality.FULL, ImageFormat.UINT8)
@@ -22,6 +22,7 @@ class ViewerTab(QFrame):
     _gl_viewer: GLViewer
     _zoom_list: QComboBox
     _zoom_list_length: int
+    _resolution_list: QComboBox
     _current_frame: int
 
     def __init__(self, parent: QWidget, sequence_id: int):
@@ -82,6 +83,19 @@ class ViewerTab(QFrame):
 
         _tool_bar.addSeparator()
 
+        # Preview resolution combo box:
+        self._resolution_list = QComboBox(self)
+        self._resolution_list.setCursor(QCursor(Qt.PointingHandCursor))
+        self._resolution_list.addItem("Auto", None)
+        self._resolution_list.addItem("Full", 1)
+        self._resolution_list.addItem("Half", .5)
+        self._resolution_list.addItem("Quarter", .25)
+        self._resolution_list.currentIndexChanged.connect(
+            self.choose_resolution)
+        _tool_bar.addWidget(self._resolution_list)
+
+        _tool_bar.addSeparator()
+
         # Transparency checkerboard checkbox:
         _alpha_checkbox = QCheckBox("Transparency")
         _alpha_checkbox.setCursor(Qt.PointingHandCursor)
@@ -109,6 +123,11 @@ class ViewerTab(QFrame):
             self._gl_viewer.choose_zoom(2)
             self.update_zoom_value()
 
+    def choose_resolution(self, index: int):
+        """Choose a value in the preview resolution list."""
+        self._gl_viewer.set_preview_resolution(
+            self._resolution_list.itemData(index))
+
     def remove_custom_zoom(self):
         """Remove the custom zoom option in the zoom list."""
         self._zoom_list.blockSignals(True)
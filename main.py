@@ -1,12 +1,19 @@
 """The main file used to launch the app."""
 
 from configparser import ConfigParser
+import sys
 
 from utils.config import Config
-from gui.views.app import App
 
 if __name__ == "__main__":
     _config = ConfigParser()
     _config.read("config.cfg")
     Config.load(_config)
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        from cli.render_command import RenderCommand
+        sys.exit(RenderCommand.run(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        from benchmarks.benchmark_command import BenchmarkCommand
+        sys.exit(BenchmarkCommand.run(sys.argv[2:]))
+    from gui.views.app import App
     App()
@@ -8,14 +8,16 @@ _parameters = [
         "title": "Horizontal radius",
         "data_type": "integer",
         "default_value": 2,
-        "min_value": 0
+        "min_value": 0,
+        "flags": ["pixels"]
     },
     {
         "name_id": "vertical_radius",
         "title": "Vertical radius",
         "data_type": "integer",
         "default_value": 2,
-        "min_value": 0
+        "min_value": 0,
+        "flags": ["pixels"]
     },
     {
         "name_id": "iterations",
@@ -27,17 +29,13 @@ _parameters = [
     }
 ]
 
-def _apply(_render_context, horizontal_radius, vertical_radius, iterations):
-    gl_context = _render_context.get_gl_context()
-    width = _render_context.get_width()
-    height = _render_context.get_height()
-
-    glsl_code = """
+_shaders = {
+    "main": """
     #version 430
 
     layout (local_size_x = 64) in;
-    layout (rgba32f, binding = 0) uniform readonly image2D img_input;
-    layout (rgba32f, binding = 1) uniform writeonly image2D img_output;
+    layout (IMAGE_FORMAT, binding = 0) uniform readonly image2D img_input;
+    layout (IMAGE_FORMAT, binding = 1) uniform writeonly image2D img_output;
 
     uniform int radius;
     uniform bool horizontal;
@@ -72,8 +70,17 @@ def _apply(_render_context, horizontal_radius, vertical_radius, iterations):
         }
     }
     """
+}
+
+def _footprint(horizontal_radius, vertical_radius, iterations):
+    return horizontal_radius*iterations, vertical_radius*iterations
+
+def _apply(_render_context, horizontal_radius, vertical_radius, iterations):
+    width = _render_context.get_region_width()
+    height = _render_context.get_region_height()
 
-    compute_shader = gl_context.compute_shader(glsl_code)
+    compute_shader = _render_context.compute_shader_once(
+        _shaders["main"])
 
     if horizontal_radius == 0 and vertical_radius == 0:
         _render_context.pass_through()
@@ -27,22 +27,20 @@ _parameters = [
     }
 ]
 
-def _apply(_render_context, tilt, spin, disc_min, disc_max):
-    gl_context = _render_context.get_gl_context()
-    width = _render_context.get_width()
-    height = _render_context.get_height()
-
-    glsl_code = """
+_shaders = {
+    "main": """
     #version 430
 
     layout (local_size_x = 16, local_size_y = 16) in;
-    layout (rgba32f, binding = 0) uniform readonly image2D img_input;
-    layout (rgba32f, binding = 1) uniform writeonly image2D img_output;
+    layout (IMAGE_FORMAT, binding = 0) uniform readonly image2D img_input;
+    layout (IMAGE_FORMAT, binding = 1) uniform writeonly image2D img_output;
 
     uniform float tilt;
     uniform float a;
     uniform float disc_min;
     uniform float disc_max;
+    uniform float dtau;       // affine step
+    uniform int maxSteps;     // maximum steps
 
     #define PI 3.1415926538
 
@@ -50,8 +48,6 @@ def _apply(_render_context, tilt, spin, disc_min, disc_max):
     float zoom = 1.5;     // camera zoom
 
     float eps = .01;      // hamiltonian gradient step
-    float dtau = .1;      // affine step
-    int maxSteps = 500;   // maximum steps
 
     mat4 diag(vec4 vec){
         return mat4(vec.x,0,0,0,
@@ -183,13 +179,27 @@ def _apply(_render_context, tilt, spin, disc_min, disc_max):
         imageStore(img_output, ivec2(coords), color);
     }
     """
+}
 
-    compute_shader = gl_context.compute_shader(glsl_code)
+def _apply(_render_context, tilt, spin, disc_min, disc_max):
+    width = _render_context.get_width()
+    height = _render_context.get_height()
+
+    compute_shader = _render_context.compute_shader_once(
+        _shaders["main"])
     compute_shader["tilt"] = tilt
     compute_shader["a"] = spin
     compute_shader["disc_min"] = disc_min
     compute_shader["disc_max"] = disc_max
 
+    # Drafts integrate the geodesics with a coarser step.
+    if _render_context.is_draft():
+        compute_shader["dtau"] = .4
+        compute_shader["maxSteps"] = 125
+    else:
+        compute_shader["dtau"] = .1
+        compute_shader["maxSteps"] = 500
+
     _render_context.get_src_texture().bind_to_image(0, read=True, write=False)
     _render_context.get_dest_texture().bind_to_image(1, read=False, write=True)
     compute_shader.run(width//16+1, height//16+1, 1)
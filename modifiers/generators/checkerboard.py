@@ -25,7 +25,8 @@ _parameters = [
         "name_id": "cell_size",
         "title": "Cell size",
         "data_type": "vector2",
-        "default_value": [50, 50]
+        "default_value": [50, 50],
+        "flags": ["pixels"]
     },
     {
         "name_id": "center",
@@ -43,29 +44,27 @@ _parameters = [
 
 # TODO : add rotation
 
-def _apply(_render_context, color_a, color_b, cell_size, center, antialiasing):
-    gl_context = _render_context.get_gl_context()
-    width = _render_context.get_width()
-    height = _render_context.get_height()
-
-    glsl_code = """
+_shaders = {
+    "main": """
     #version 430
 
     layout (local_size_x = 16, local_size_y = 16) in;
-    layout (rgba32f, binding = 0) uniform writeonly image2D img_output;
+    layout (IMAGE_FORMAT, binding = 0) uniform writeonly image2D img_output;
 
     uniform vec4 color_a;
     uniform vec4 color_b;
     uniform vec2 center;
     uniform vec2 cell_size;
     uniform bool antialiasing;
+    uniform ivec2 offset;
+    uniform vec2 layer_size;
 
     void main() {
         ivec2 coords = ivec2(gl_GlobalInvocationID.xy);
         ivec2 dimensions = imageSize(img_output).xy;
         if(any(greaterThanEqual(coords, dimensions))){return;}
 
-        vec2 xy = vec2(coords) + .5 - center * vec2(dimensions);
+        vec2 xy = vec2(coords + offset) + .5 - center * layer_size;
         float checker = .5;
 
         if(cell_size.x != 0. && cell_size.y != 0.){
@@ -84,13 +83,25 @@ def _apply(_render_context, color_a, color_b, cell_size, center, antialiasing):
         imageStore(img_output, coords, color);
     }
     """
+}
+
+def _footprint(color_a, color_b, cell_size, center, antialiasing):
+    return 0, 0
+
+def _apply(_render_context, color_a, color_b, cell_size, center, antialiasing):
+    width = _render_context.get_region_width()
+    height = _render_context.get_region_height()
 
-    compute_shader = gl_context.compute_shader(glsl_code)
+    compute_shader = _render_context.compute_shader_once(
+        _shaders["main"])
     compute_shader["color_a"] = color_a
     compute_shader["color_b"] = color_b
     compute_shader["cell_size"] = cell_size
     compute_shader["center"] = center
     compute_shader["antialiasing"] = antialiasing
+    compute_shader["offset"] = _render_context.get_region_offset()
+    compute_shader["layer_size"] = (_render_context.get_width(),
+                                    _render_context.get_height())
 
     _render_context.get_dest_texture().bind_to_image(0, read=False, write=True)
     compute_shader.run(width//16+1, height//16+1, 1)
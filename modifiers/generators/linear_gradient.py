@@ -45,22 +45,20 @@ _parameters = [
     }
 ]
 
-def _apply(_render_context, color_a, color_b, point_a, point_b, interpolation):
-    gl_context = _render_context.get_gl_context()
-    width = _render_context.get_width()
-    height = _render_context.get_height()
-
-    glsl_code = """
+_shaders = {
+    "main": """
     #version 430
 
     layout (local_size_x = 16, local_size_y = 16) in;
-    layout (rgba32f, binding = 0) uniform writeonly image2D img_output;
+    layout (IMAGE_FORMAT, binding = 0) uniform writeonly image2D img_output;
 
     uniform vec4 color_a;
     uniform vec4 color_b;
     uniform vec2 point_a;
     uniform vec2 point_b;
     uniform int interpolation;
+    uniform ivec2 offset;
+    uniform vec2 layer_size;
 
     const mat3 linear_to_lms_mat = mat3(.4122214708, .5363325363, .0514459929,
                                         .2119034982, .6806995451, .1073969566,
@@ -108,8 +106,8 @@ def _apply(_render_context, color_a, color_b, point_a, point_b, interpolation):
         ivec2 dimensions = imageSize(img_output).xy;
         if(any(greaterThanEqual(coords, dimensions))){return;}
 
-        vec2 dim = vec2(dimensions);
-        vec2 uv = vec2(coords) / dim;
+        vec2 dim = layer_size;
+        vec2 uv = vec2(coords + offset) / dim;
         vec2 axis = (point_b - point_a) * dim;
         vec2 vector = (uv - point_a) * dim;
 
@@ -141,13 +139,25 @@ def _apply(_render_context, color_a, color_b, point_a, point_b, interpolation):
         imageStore(img_output, coords, vec4(color, alpha));
     }
     """
+}
+
+def _footprint(color_a, color_b, point_a, point_b, interpolation):
+    return 0, 0
+
+def _apply(_render_context, color_a, color_b, point_a, point_b, interpolation):
+    width = _render_context.get_region_width()
+    height = _render_context.get_region_height()
 
-    compute_shader = gl_context.compute_shader(glsl_code)
+    compute_shader = _render_context.compute_shader_once(
+        _shaders["main"])
     compute_shader["color_a"] = color_a
     compute_shader["color_b"] = color_b
     compute_shader["point_a"] = point_a
     compute_shader["point_b"] = point_b
     compute_shader["interpolation"] = interpolation
+    compute_shader["offset"] = _render_context.get_region_offset()
+    compute_shader["layer_size"] = (_render_context.get_width(),
+                                    _render_context.get_height())
 
     _render_context.get_dest_texture().bind_to_image(0, read=False, write=True)
     compute_shader.run(width//16+1, height//16+1, 1)
@@ -0,0 +1,13 @@
+"""Run the golden-image regression checks, see RegressionCommand."""
+
+from configparser import ConfigParser
+import sys
+
+from utils.config import Config
+
+if __name__ == "__main__":
+    _config = ConfigParser()
+    _config.read("config.cfg")
+    Config.load(_config)
+    from regression.regression_command import RegressionCommand
+    sys.exit(RegressionCommand.run(sys.argv[1:]))
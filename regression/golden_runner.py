@@ -0,0 +1,148 @@
+"""
+Comparison of rendered frames with golden ones.
+
+The GoldenRunner class renders the frames of reference scenes
+through the RenderService, and compares them pixel by pixel with
+the golden frames stored as numpy files, within a tolerance. Frames
+are compared after tone mapping, in 32-bit floats. On failure, the
+rendered frame, the golden frame and an amplified difference are
+written as PNG files for inspection. Goldens can be written again
+from the current renders after an intended change.
+"""
+
+from pathlib import Path
+import json
+
+import numpy as np
+
+from core.entities.gl_context import GLContext
+from core.entities.image_format import ImageFormat
+from core.services.render_service import RenderService
+from regression.reference_scenes import ReferenceScene
+from utils.image import Image
+
+
+class GoldenRunner:
+    """Comparison of rendered frames with golden ones."""
+
+    MANIFEST_NAME: str = "manifest.json"
+    DIFF_GAIN: float = 10
+
+    @staticmethod
+    def render_frame(scene: ReferenceScene, frame: int) -> np.ndarray:
+        """Render a frame of a scene, as a (height, width, 4) array."""
+        _sequence = scene.build_sequence()
+        _texture = RenderService.render_sequence_frame(
+            _sequence, frame, output_format=ImageFormat.FLOAT32)
+        _array = RenderService.image_from_texture(
+            _texture).get_data_array().copy()
+        RenderService.release_texture(_texture)
+        RenderService.clear_layer_cache()
+        return _array
+
+    @staticmethod
+    def get_frame_name(scene: ReferenceScene, frame: int) -> str:
+        """Return the base name of the files of a frame."""
+        return f"{scene.get_name()}_{frame:04d}"
+
+    @staticmethod
+    def get_renderer() -> str:
+        """Return the name of the OpenGL renderer of this thread."""
+        return GLContext.get_context().info.get("GL_RENDERER", "unknown")
+
+    @classmethod
+    def has_goldens(cls, golden_directory: Path) -> bool:
+        """Return whether goldens were written to a directory."""
+        return (golden_directory / cls.MANIFEST_NAME).is_file()
+
+    @classmethod
+    def check_renderer(cls, golden_directory: Path) -> str:
+        """Return a warning if goldens come from another renderer."""
+        _manifest_path = golden_directory / cls.MANIFEST_NAME
+        if not _manifest_path.is_file():
+            return None
+        with open(_manifest_path) as _file:
+            _renderer = json.load(_file).get("renderer")
+        if _renderer != cls.get_renderer():
+            return (f"Goldens were rendered by '{_renderer}', "
+                    f"not '{cls.get_renderer()}'")
+        return None
+
+    @classmethod
+    def update_goldens(cls,
+                       scenes: list[ReferenceScene],
+                       golden_directory: Path) -> int:
+        """Write the golden frames of scenes, return their number."""
+        golden_directory.mkdir(parents=True, exist_ok=True)
+        _count = 0
+        for _scene in scenes:
+            for _frame in _scene.get_frames():
+                np.save(golden_directory
+                        / f"{cls.get_frame_name(_scene, _frame)}.npy",
+                        cls.render_frame(_scene, _frame))
+                _count += 1
+        with open(golden_directory / cls.MANIFEST_NAME, "w") as _file:
+            json.dump({"renderer": cls.get_renderer()}, _file, indent=2)
+        return _count
+
+    @classmethod
+    def compare_frame(cls,
+                      scene: ReferenceScene,
+                      frame: int,
+                      golden_directory: Path,
+                      output_directory: Path,
+                      tolerance: float) -> str:
+        """Compare a frame with its golden, and return the failure.
+
+        Return None when every channel of every pixel lies within the
+        tolerance, otherwise write the PNG files of the frame and
+        return the reason of the failure.
+        """
+        _name = cls.get_frame_name(scene, frame)
+        _golden_path = golden_directory / f"{_name}.npy"
+        if not _golden_path.is_file():
+            return f"missing golden '{_golden_path}'"
+        _expected = np.load(_golden_path)
+        _actual = cls.render_frame(scene, frame)
+        if _actual.shape != _expected.shape:
+            return (f"shape {_actual.shape} differs from golden "
+                    f"{_expected.shape}")
+        _difference = np.abs(_actual - _expected)
+        _bad_pixels = np.count_nonzero(
+            np.any(_difference > tolerance, axis=-1))
+        if _bad_pixels == 0:
+            return None
+
+        output_directory.mkdir(parents=True, exist_ok=True)
+        _height, _width = _actual.shape[:2]
+        Image(_width, _height, data_array=_actual).save_png(
+            output_directory / f"{_name}_actual.png")
+        Image(_width, _height, data_array=_expected).save_png(
+            output_directory / f"{_name}_expected.png")
+        _diff_image = np.ones_like(_difference)
+        _diff_image[..., :3] = np.max(_difference, axis=-1,
+                                      keepdims=True)*cls.DIFF_GAIN
+        Image(_width, _height, data_array=_diff_image).save_png(
+            output_directory / f"{_name}_diff.png")
+        return (f"{_bad_pixels} pixels off by up to "
+                f"{float(_difference.max()):.5f}")
+
+    @classmethod
+    def compare_scenes(cls,
+                       scenes: list[ReferenceScene],
+                       golden_directory: Path,
+                       output_directory: Path,
+                       tolerance: float) -> dict[str, str]:
+        """Compare all the frames of scenes with their goldens.
+
+        Return the failures, by frame name.
+        """
+        _failures = dict()
+        for _scene in scenes:
+            for _frame in _scene.get_frames():
+                _failure = cls.compare_frame(_scene, _frame,
+                                             golden_directory,
+                                             output_directory, tolerance)
+                if _failure is not None:
+                    _failures[cls.get_frame_name(_scene, _frame)] = _failure
+        return _failures
@@ -0,0 +1,157 @@
+"""
+Reference scenes rendered by the golden-image regression checks.
+
+The ReferenceScene class describes a small sequence, built through
+the services of the core package, along with the frames to render.
+The ReferenceScenes class lists the scenes covering the pipeline:
+one scene per loaded modifier, applied alone over a solid layer,
+the compositing of overlapping transformed layers, in each working
+format, and the tone mapping of values above 1.
+"""
+
+from typing import Callable
+
+from core.entities.image_format import ImageFormat
+from core.entities.keyframe import Keyframe
+from core.entities.modifier_repository import ModifierRepository
+from core.entities.sequence import Sequence
+from core.entities.solid_layer import SolidLayer
+from core.services.animation_service import AnimationService
+from core.services.layer_service import LayerService
+from core.services.modifier_service import ModifierService
+from data_types.color import Color
+from data_types.integer import Integer
+from data_types.number import Number
+from data_types.vector2 import Vector2
+
+
+class ReferenceScene:
+    """A small sequence whose frames are compared with golden ones."""
+
+    _name: str
+    _build_function: Callable[[], Sequence]
+    _frames: tuple[int, ...]
+
+    def __init__(self,
+                 name: str,
+                 build_function: Callable[[], Sequence],
+                 frames: tuple[int, ...] = (0, 30)):
+        self._name = name
+        self._build_function = build_function
+        self._frames = frames
+
+    def get_name(self) -> str:
+        """Return the name of the scene, used in golden file names."""
+        return self._name
+
+    def get_frames(self) -> tuple[int, ...]:
+        """Return the frames to render."""
+        return self._frames
+
+    def build_sequence(self) -> Sequence:
+        """Build a new sequence of the scene."""
+        return self._build_function()
+
+
+class ReferenceScenes:
+    """Reference scenes rendered by the regression checks."""
+
+    WIDTH: int = 128
+    HEIGHT: int = 72
+    DURATION: int = 60
+
+    @classmethod
+    def create_sequence(cls,
+                        title: str,
+                        image_format: ImageFormat = ImageFormat.FLOAT32
+                        ) -> Sequence:
+        """Create an empty sequence of the reference dimensions."""
+        return Sequence(title, cls.WIDTH, cls.HEIGHT, cls.DURATION, 60,
+                        image_format)
+
+    @classmethod
+    def add_solid_layer(cls,
+                        sequence: Sequence,
+                        color: Color,
+                        scale: float = 1) -> SolidLayer:
+        """Add a solid layer covering a part of the sequence."""
+        _layer = SolidLayer(f"Solid {len(sequence.get_layer_list())}",
+                            0, cls.DURATION,
+                            Integer(round(cls.WIDTH*scale)),
+                            Integer(round(cls.HEIGHT*scale)), color)
+        LayerService.add_layer_to_sequence(_layer, sequence)
+        return _layer
+
+    @classmethod
+    def build_modifier_scene(cls, modifier_name_id: str) -> Sequence:
+        """Build a scene applying a modifier alone, with its defaults."""
+        _sequence = cls.create_sequence(modifier_name_id)
+        _layer = cls.add_solid_layer(_sequence, Color(.6, .3, .15, .8))
+        ModifierService.add_modifier_to_layer(
+            ModifierService.modifier_from_template(modifier_name_id),
+            _layer)
+        return _sequence
+
+    @classmethod
+    def build_compositing_scene(cls,
+                                image_format: ImageFormat
+                                ) -> Sequence:
+        """Build a scene of overlapping, animated, transformed layers.
+
+        It covers the transform, the anti-aliased edges, opacity and
+        premultiplied alpha blending.
+        """
+        _sequence = cls.create_sequence(
+            f"compositing {image_format.name}", image_format)
+        cls.add_solid_layer(_sequence, Color(.1, .2, .4))
+        _colors = (Color(1, 0, 0, .5), Color(0, 1, 0, .75),
+                   Color(0, 0, 1, 1))
+        for _index, _color in enumerate(_colors):
+            _layer = cls.add_solid_layer(_sequence, _color, .4)
+            AnimationService.add_keyframe(
+                _layer.get_property_parameter("position"),
+                Keyframe(0, Vector2(.3 + .2*_index, .4)))
+            AnimationService.add_keyframe(
+                _layer.get_property_parameter("position"),
+                Keyframe(cls.DURATION, Vector2(.5, .6 - .1*_index)))
+            AnimationService.add_keyframe(
+                _layer.get_property_parameter("rotation"),
+                Keyframe(0, Number(15*_index)))
+            AnimationService.add_keyframe(
+                _layer.get_property_parameter("rotation"),
+                Keyframe(cls.DURATION, Number(90 - 15*_index)))
+            _layer.get_property_parameter("opacity").set_current_value(
+                Number(1 - .2*_index))
+        return _sequence
+
+    @classmethod
+    def build_tonemap_scene(cls) -> Sequence:
+        """Build a scene whose linear values exceed the display range."""
+        _sequence = cls.create_sequence("tonemap")
+        cls.add_solid_layer(_sequence, Color(4, 1, .25))
+        cls.add_solid_layer(_sequence, Color(.5, .5, .5, .5), .5)
+        return _sequence
+
+    @classmethod
+    def get_scenes(cls) -> list[ReferenceScene]:
+        """Return all the reference scenes, in a stable order.
+
+        Modifiers must be loaded beforehand, as each of them gets its
+        own scene.
+        """
+        _scenes = []
+        for _name_id in sorted(ModifierRepository.get_repository()):
+            _scenes.append(ReferenceScene(
+                f"modifier_{_name_id}",
+                lambda _name_id=_name_id:
+                    cls.build_modifier_scene(_name_id)))
+        for _image_format in ImageFormat:
+            if not _image_format.is_working_format():
+                continue
+            _scenes.append(ReferenceScene(
+                f"compositing_{_image_format.name.lower()}",
+                lambda _image_format=_image_format:
+                    cls.build_compositing_scene(_image_format)))
+        _scenes.append(ReferenceScene("tonemap", cls.build_tonemap_scene,
+                                      (0,)))
+        return _scenes
@@ -0,0 +1,101 @@
+"""
+Command line interface for the golden-image regression checks.
+
+The RegressionCommand class parses the arguments of the regression
+checks, loads the modifiers, and renders the reference scenes on a
+standalone moderngl context, forcing the software rasterizer of
+Mesa by default, such that goldens do not depend on the GPU. It
+either compares the frames with the golden ones, failing on any
+difference beyond the tolerance or any missing golden, or writes
+new goldens.
+"""
+
+from pathlib import Path
+import argparse
+import os
+
+from core.entities.gl_context import GLContext
+from core.services.modifier_service import ModifierService
+from regression.golden_runner import GoldenRunner
+from regression.reference_scenes import ReferenceScenes
+
+
+class RegressionCommand:
+    """Command line interface for the golden-image regression checks."""
+
+    DIRECTORY: Path = Path(__file__).parent
+
+    @classmethod
+    def get_parser(cls) -> argparse.ArgumentParser:
+        """Return the parser of the command arguments."""
+        _parser = argparse.ArgumentParser(
+            prog="python -m regression",
+            description="Compare renders of reference scenes with "
+                        "golden frames.")
+        _parser.add_argument("--update", action="store_true",
+                             help="write the goldens from the current "
+                                  "renders instead of comparing")
+        _parser.add_argument("--scene", type=str, default=None,
+                             help="only run scenes whose name contains "
+                                  "this text")
+        _parser.add_argument("--tolerance", type=float, default=2/255,
+                             help="largest accepted difference of a "
+                                  "pixel channel")
+        _parser.add_argument("--goldens", type=Path,
+                             default=cls.DIRECTORY / "goldens",
+                             help="directory of the golden frames")
+        _parser.add_argument("--output", type=Path,
+                             default=cls.DIRECTORY / "output",
+                             help="directory in which to write the "
+                                  "images of failed frames")
+        _parser.add_argument("--hardware", action="store_true",
+                             help="render on the GPU rather than with "
+                                  "the software rasterizer")
+        _parser.add_argument("--backend", type=str, default=None,
+                             help="moderngl backend, such as 'egl'")
+        return _parser
+
+    @classmethod
+    def run(cls, arguments: list[str]) -> int:
+        """Run the checks and return the exit code, 1 on failure."""
+        _arguments = cls.get_parser().parse_args(arguments)
+        if not _arguments.hardware:
+            # Read by Mesa when the context is created.
+            os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+        if _arguments.backend is not None:
+            GLContext.set_backend(_arguments.backend)
+
+        ModifierService.load_modifiers_from_directory()
+        _scenes = [_scene for _scene in ReferenceScenes.get_scenes()
+                   if _arguments.scene is None
+                   or _arguments.scene in _scene.get_name()]
+        if not _scenes:
+            print("No scene to run")
+            return 1
+        print(f"Rendering with '{GoldenRunner.get_renderer()}'")
+
+        if _arguments.update:
+            _count = GoldenRunner.update_goldens(_scenes,
+                                                 _arguments.goldens)
+            print(f"Wrote {_count} golden frames to '{_arguments.goldens}'")
+            return 0
+
+        if not GoldenRunner.has_goldens(_arguments.goldens):
+            print(f"FAILED: no goldens in '{_arguments.goldens}', "
+                  f"write them with --update")
+            return 1
+        _warning = GoldenRunner.check_renderer(_arguments.goldens)
+        if _warning is not None:
+            print(f"Warning: {_warning}")
+        _failures = GoldenRunner.compare_scenes(
+            _scenes, _arguments.goldens, _arguments.output,
+            _arguments.tolerance)
+        _frame_count = sum(len(_scene.get_frames()) for _scene in _scenes)
+        for _name, _failure in _failures.items():
+            print(f"FAILED {_name}: {_failure}")
+        if _failures:
+            print(f"{len(_failures)}/{_frame_count} frames differ, see "
+                  f"'{_arguments.output}'")
+            return 1
+        print(f"{_frame_count} frames match their goldens")
+        return 0
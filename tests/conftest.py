@@ -0,0 +1,44 @@
+"""
+Shared setup of the tests.
+
+The configuration is loaded from the root of the repository, and the
+modifiers are loaded once. Rendering tests run on standalone software
+contexts, created through EGL when no display is available, and are
+skipped when moderngl can't create one.
+"""
+
+from configparser import ConfigParser
+from pathlib import Path
+import os
+import sys
+
+import pytest
+
+ROOT_DIRECTORY: Path = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT_DIRECTORY))
+os.chdir(ROOT_DIRECTORY)
+# Read by Mesa when the contexts are created.
+os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+
+from utils.config import Config  # noqa: E402
+
+_config = ConfigParser()
+_config.read(ROOT_DIRECTORY / "config.cfg")
+Config.load(_config)
+
+
+@pytest.fixture(scope="session")
+def gl_context():
+    """Return the context of the main thread, or skip the test."""
+    pytest.importorskip("moderngl")
+    from core.entities.gl_context import GLContext
+    from core.services.modifier_service import ModifierService
+    if not os.environ.get("DISPLAY") and not GLContext.has_context():
+        GLContext.set_backend("egl")
+    try:
+        _context = GLContext.get_context()
+    except Exception as _error:
+        pytest.skip(f"No OpenGL context: {_error}")
+    ModifierService.load_modifiers_from_directory()
+    return _context
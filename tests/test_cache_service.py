@@ -0,0 +1,32 @@
+"""Tests of the caching of rendered frames."""
+
+import numpy as np
+
+from core.entities.image_format import ImageFormat
+from core.services.cache_service import CacheService
+from core.services.project_service import ProjectService
+from core.services.render_service import RenderService
+from regression.reference_scenes import ReferenceScenes
+
+
+def test_cached_images_are_not_rendered_again(gl_context, monkeypatch):
+    """Cached frames are returned as images, without rendering."""
+    _sequence_id = ProjectService.add_sequence_to_project(
+        ReferenceScenes.build_compositing_scene(ImageFormat.FLOAT32))
+    _image = CacheService.request_sequence_image(
+        _sequence_id, 10, output_format=ImageFormat.UINT8)
+    _texture = RenderService.render_sequence_frame(
+        ProjectService.get_sequence_by_id(_sequence_id), 10,
+        output_format=ImageFormat.UINT8)
+    _expected = RenderService.image_from_texture(_texture)
+    RenderService.release_texture(_texture)
+    assert np.array_equal(_image.get_data_array(),
+                          _expected.get_data_array())
+
+    def _render(*args, **kwargs):
+        raise AssertionError("The cached frame was rendered again.")
+    monkeypatch.setattr(RenderService, "render_sequence_frame", _render)
+    monkeypatch.setattr(RenderService, "texture_from_image", _render)
+    assert CacheService.request_sequence_image(
+        _sequence_id, 10, output_format=ImageFormat.UINT8) is _image
+    CacheService.invalidate_sequence(_sequence_id)
@@ -0,0 +1,103 @@
+"""Tests of the tracking of GPU resources."""
+
+import threading
+
+from core.entities.gl_context import GLContext
+from core.entities.gpu_resource_tracker import (GPUResourceLeakError,
+                                                GPUResourceTracker,
+                                                TrackedContext)
+from core.entities.image_format import ImageFormat
+from regression.golden_runner import GoldenRunner
+from regression.reference_scenes import ReferenceScene, ReferenceScenes
+
+
+def _render_in_thread(scene: ReferenceScene,
+                      frame: int,
+                      tracking: bool) -> tuple[bytes, bool]:
+    """Render a frame on the new context of a thread.
+
+    Return the bytes of the frame, and whether the context was
+    tracked.
+    """
+    _result = dict()
+
+    def _render():
+        _was_enabled = GPUResourceTracker.is_enabled()
+        GPUResourceTracker.set_enabled(tracking)
+        try:
+            _result["frame"] = GoldenRunner.render_frame(scene, frame)
+            _result["tracked"] = isinstance(GLContext.get_context(),
+                                            TrackedContext)
+        finally:
+            GPUResourceTracker.set_enabled(_was_enabled)
+    _thread = threading.Thread(target=_render)
+    _thread.start()
+    _thread.join()
+    return _result["frame"].tobytes(), _result["tracked"]
+
+
+def test_tracking_keeps_blended_pixels(gl_context):
+    """Tracked contexts render the same pixels as untracked ones."""
+    _scene = ReferenceScene(
+        "compositing",
+        lambda: ReferenceScenes.build_compositing_scene(ImageFormat.FLOAT32))
+    _tracked_bytes, _is_tracked = _render_in_thread(_scene, 10, True)
+    _bytes, _is_untracked = _render_in_thread(_scene, 10, False)
+    assert _is_tracked and not _is_untracked
+    assert _tracked_bytes == _bytes
+
+
+def test_tracked_context_sets_wrapped_attributes():
+    """Attributes set on a tracked context reach the wrapped one."""
+
+    class _Context:
+        blend_func = None
+
+    _context = _Context()
+    _tracked_context = TrackedContext(_context)
+    _tracked_context.blend_func = (1, 2)
+    assert _context.blend_func == (1, 2)
+    assert _tracked_context.get_wrapped_context() is _context
+
+
+def _run_tracked(function) -> Exception:
+    """Run a function on a thread with a strictly tracked context.
+
+    Return the exception it raised, if any.
+    """
+    _result = dict()
+
+    def _run():
+        _was_enabled = GPUResourceTracker.is_enabled()
+        _was_strict = GPUResourceTracker.is_strict()
+        GPUResourceTracker.set_enabled(True, strict=True)
+        try:
+            function()
+        except Exception as _error:
+            _result["error"] = _error
+        finally:
+            GPUResourceTracker.set_enabled(_was_enabled, _was_strict)
+    _thread = threading.Thread(target=_run)
+    _thread.start()
+    _thread.join()
+    return _result.get("error")
+
+
+def test_unreleased_pool_textures_leak(gl_context):
+    """Pool textures kept past the frame using them are leaks."""
+    def _keep_reused_texture():
+        _texture_pool = GLContext.get_texture_pool()
+        _texture_pool.release(_texture_pool.acquire(8, 4))
+        GPUResourceTracker.begin_frame()
+        _texture_pool.acquire(8, 4)
+        GPUResourceTracker.end_frame()
+    assert isinstance(_run_tracked(_keep_reused_texture),
+                      GPUResourceLeakError)
+
+
+def test_rendered_frames_do_not_leak(gl_context):
+    """Rendering and caching frames leaks nothing."""
+    _scene = ReferenceScene(
+        "compositing",
+        lambda: ReferenceScenes.build_compositing_scene(ImageFormat.FLOAT32))
+    assert _run_tracked(lambda: GoldenRunner.render_frame(_scene, 10)) is None
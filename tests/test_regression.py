@@ -0,0 +1,14 @@
+"""Tests of the rendered frames against the committed goldens."""
+
+from regression.regression_command import RegressionCommand
+
+
+def test_frames_match_goldens(gl_context, tmp_path):
+    """Every reference frame matches its golden."""
+    assert RegressionCommand.run(["--output", str(tmp_path)]) == 0
+
+
+def test_missing_goldens_fail(gl_context, tmp_path):
+    """Checking against a directory without goldens fails."""
+    assert RegressionCommand.run(["--goldens", str(tmp_path / "none"),
+                                  "--output", str(tmp_path)]) == 1
@@ -0,0 +1,23 @@
+"""Tests of the render plans of sequences."""
+
+from core.services.render_service import RenderService
+from data_types.color import Color
+from regression.reference_scenes import ReferenceScenes
+
+
+def test_plan_follows_layer_timing():
+    """The active layers of a plan follow the timing of layers."""
+    _sequence = ReferenceScenes.create_sequence("timing")
+    ReferenceScenes.add_solid_layer(_sequence, Color(0, 0, 0))
+    _layer = ReferenceScenes.add_solid_layer(_sequence, Color(1, 1, 1))
+    _layer.set_start_frame(20)
+    _render_plan = RenderService.get_render_plan(_sequence)
+    assert _render_plan.get_active_layer_ids(10) == [0]
+    assert _render_plan.get_active_layer_ids(30) == [0, 1]
+    assert _render_plan.get_active_layer_ids_over(10, 21) == [0, 1]
+    assert RenderService.get_render_plan(_sequence) is _render_plan
+
+    _layer.set_start_frame(5)
+    _render_plan = RenderService.get_render_plan(_sequence)
+    assert _render_plan.get_active_layer_ids(10) == [0, 1]
+    assert _render_plan.get_layer_plan(1).get_layer() is _layer
@@ -0,0 +1,30 @@
+"""Tests of the profiling of renders."""
+
+from core.entities.image_format import ImageFormat
+from core.entities.render_profiler import RenderProfiler
+from regression.golden_runner import GoldenRunner
+from regression.reference_scenes import ReferenceScene, ReferenceScenes
+
+
+def test_profiled_frames_reuse_queries(gl_context):
+    """Profiled frames report their steps, and reuse their queries."""
+    _scene = ReferenceScene(
+        "compositing",
+        lambda: ReferenceScenes.build_compositing_scene(ImageFormat.FLOAT32))
+    _was_enabled = RenderProfiler.is_enabled()
+    RenderProfiler.set_enabled(True)
+    RenderProfiler.clear()
+    try:
+        GoldenRunner.render_frame(_scene, 10)
+        _query_pool = list(RenderProfiler._get_query_pool())
+        GoldenRunner.render_frame(_scene, 20)
+    finally:
+        RenderProfiler.set_enabled(_was_enabled)
+
+    _reports = RenderProfiler.get_report()
+    assert len(_reports) == 2
+    assert _reports[0]["steps"]
+    assert all(_step["gpu_ms"] >= 0 for _step in _reports[0]["steps"])
+    assert _query_pool
+    assert ({id(_query) for _query in RenderProfiler._get_query_pool()}
+            == {id(_query) for _query in _query_pool})
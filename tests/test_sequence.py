@@ -0,0 +1,34 @@
+"""Tests of the revisions of sequences."""
+
+from core.services.modifier_service import ModifierService
+from data_types.color import Color
+from data_types.number import Number
+from regression.reference_scenes import ReferenceScenes
+
+
+def test_revisions_follow_layers(gl_context):
+    """Changes within layers update the revisions of the sequence."""
+    _sequence = ReferenceScenes.create_sequence("revisions")
+    _layer = ReferenceScenes.add_solid_layer(_sequence, Color(1, 1, 1))
+    _structure_revision = _sequence.get_structure_revision()
+    _render_revision = _sequence.get_render_revision()
+
+    _layer.get_property_parameter("opacity").set_current_value(Number(.5))
+    assert _sequence.get_structure_revision() == _structure_revision
+    assert _sequence.get_render_revision() > _render_revision
+    _render_revision = _sequence.get_render_revision()
+
+    _layer.set_end_frame(10)
+    assert _sequence.get_structure_revision() > _structure_revision
+    assert _sequence.get_render_revision() > _render_revision
+    _structure_revision = _sequence.get_structure_revision()
+    _render_revision = _sequence.get_render_revision()
+
+    _modifier = ModifierService.modifier_from_template("exposure")
+    ModifierService.add_modifier_to_layer(_modifier, _layer)
+    assert _sequence.get_structure_revision() > _structure_revision
+    _structure_revision = _sequence.get_structure_revision()
+    _render_revision = _sequence.get_render_revision()
+    _modifier.get_parameter_list()[0].update_revision()
+    assert _sequence.get_structure_revision() == _structure_revision
+    assert _sequence.get_render_revision() > _render_revision
@@ -0,0 +1,24 @@
+"""Tests of the pool of reusable textures."""
+
+import pytest
+
+from core.entities.texture_pool import TexturePool
+
+
+def test_released_textures_are_reused(gl_context):
+    """A released texture is handed out again for the same format."""
+    _texture_pool = TexturePool(gl_context)
+    _texture = _texture_pool.acquire(8, 4)
+    _texture_pool.release(_texture)
+    assert _texture_pool.acquire(8, 4) is _texture
+    assert _texture_pool.acquire(8, 4) is not _texture
+
+
+def test_releasing_twice_raises(gl_context):
+    """A texture can't be given back twice, nor handed out twice."""
+    _texture_pool = TexturePool(gl_context)
+    _texture = _texture_pool.acquire(8, 4)
+    _texture_pool.release(_texture)
+    with pytest.raises(ValueError):
+        _texture_pool.release(_texture)
+    assert _texture_pool.get_stats()["free_count"] == 1
@@ -0,0 +1,22 @@
+"""Tests of the tracing of the activity of the app."""
+
+from core.entities.keyframe import Keyframe
+from core.entities.parameter import Parameter
+from core.services.animation_service import AnimationService
+from data_types.number import Number
+from utils.config import Config
+from utils.trace import Trace
+
+
+def test_parameters_evaluate_without_config(monkeypatch):
+    """Tracing is disabled while the configuration isn't loaded."""
+    monkeypatch.delenv(Trace.ENVIRONMENT_VARIABLE, raising=False)
+    monkeypatch.delattr(Config, "trace")
+    monkeypatch.setattr(Trace, "_enabled", None)
+    _parameter = Parameter(data_type=Number)
+    AnimationService.add_keyframe(_parameter, Keyframe(0, Number(0)))
+    AnimationService.add_keyframe(_parameter, Keyframe(10, Number(1)))
+    assert AnimationService.get_value_at_frame(
+        _parameter, 5).get_raw_value() == .5
+    assert not Trace.is_enabled()
+    assert Trace._enabled is None
@@ -51,12 +51,19 @@ class ColorManagement:
                 values: Union[list[float], np.ndarray],
                 src_space: ColorSpace,
                 dest_space: ColorSpace) -> np.ndarray:
-        """Convert a color between different color spaces."""
+        """Convert colors between different color spaces.
+
+        Values are a single color or an array of colors, such as
+        (N, 4) or (H, W, 4), whose last axis holds 3 or 4 channels.
+        Colors get an opaque alpha if missing, and the result is a
+        new float32 array of 4 channels, of the same leading shape.
+        """
         _values = np.array(values, dtype=np.float32)
-        if _values.shape not in [(3,),(4,)]:
-            raise ValueError("Input values should be a 3D or 4D vector.")
-        if len(_values) == 3:
-            _values = np.append(_values, 1)
+        if _values.ndim == 0 or _values.shape[-1] not in (3, 4):
+            raise ValueError("Input values should be 3D or 4D vectors.")
+        if _values.shape[-1] == 3:
+            _values = np.concatenate(
+                (_values, np.ones_like(_values[..., :1])), axis=-1)
         if src_space == dest_space:
             return _values
         
@@ -138,140 +145,143 @@ class ColorManagement:
                                   f"{dest_space} is not implemented.")
 
     @staticmethod
-    def srgb_to_linear(in_color: np.ndarray) -> np.ndarray:
+    def _with_alpha(in_color: np.ndarray,
+                    *channels: np.ndarray) -> np.ndarray:
+        """Stack three color channels with the alpha of in_color."""
+        return np.stack((*channels, in_color[..., 3]),
+                        axis=-1).astype(np.float32, copy=False)
+
+    @classmethod
+    def _transform(cls,
+                   in_color: np.ndarray,
+                   matrix: np.ndarray) -> np.ndarray:
+        """Multiply the color channels by a 3x3 matrix."""
+        _out_color = np.matmul(in_color[..., :3], matrix.T,
+                               dtype=np.float32)
+        return cls._with_alpha(in_color, *np.moveaxis(_out_color, -1, 0))
+
+    @staticmethod
+    def _get_hue(in_color: np.ndarray,
+                 max_value: np.ndarray,
+                 delta: np.ndarray) -> np.ndarray:
+        """Return the hue in [0, 1[ of sRGB colors, 0 for grays."""
+        _red, _green, _blue = np.moveaxis(in_color[..., :3], -1, 0)
+        _delta = np.where(delta == 0, 1, delta)
+        _hue = np.where(max_value == _red, ((_green-_blue)/_delta) % 6,
+                        np.where(max_value == _green,
+                                 (_blue-_red)/_delta + 2,
+                                 (_red-_green)/_delta + 4))
+        return np.where(delta == 0, 0, _hue/6) % 1
+
+    @classmethod
+    def _from_hue(cls,
+                  in_color: np.ndarray,
+                  chroma: np.ndarray,
+                  min_value: np.ndarray) -> np.ndarray:
+        """Return sRGB colors from their hue, chroma and minimum."""
+        _x = chroma*(1-np.abs(((6*in_color[..., 0]) % 2)-1))
+        _zero = np.zeros_like(chroma)
+        _sextant = np.floor(in_color[..., 0]*6)
+        _conditions = [_sextant == _index for _index in range(5)]
+        _red = np.select(_conditions, [chroma, _x, _zero, _zero, _x],
+                         chroma)
+        _green = np.select(_conditions, [_x, chroma, chroma, _x, _zero],
+                           _zero)
+        _blue = np.select(_conditions, [_zero, _zero, _x, chroma, chroma],
+                          _x)
+        return cls._with_alpha(in_color, _red+min_value, _green+min_value,
+                               _blue+min_value)
+
+    @classmethod
+    def srgb_to_linear(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert sRGB to linear."""
-        _out_color = in_color[:3]
-        _filter = _out_color > .04045
-        _out_color[_filter] = ((_out_color[_filter]+.055)/1.055)**2.4
-        _out_color[~_filter] = _out_color[~_filter]/12.92
-        return np.append(_out_color, in_color[3])
+        _rgb = in_color[..., :3]
+        _out_color = np.where(
+            _rgb > .04045,
+            ((np.maximum(_rgb, .04045)+.055)/1.055)**2.4, _rgb/12.92)
+        return cls._with_alpha(in_color, *np.moveaxis(_out_color, -1, 0))
 
     @classmethod
     def linear_to_xyz(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert linear to XYZ."""
-        _out_color = cls.linear_to_xyz_matrix @ in_color[:3].reshape((3, 1))
-        return np.append(_out_color.reshape((3,)), in_color[3])
+        return cls._transform(in_color, cls.linear_to_xyz_matrix)
 
-    @staticmethod
-    def linear_to_srgb(in_color: np.ndarray) -> np.ndarray:
+    @classmethod
+    def linear_to_srgb(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert linear to sRGB."""
-        _out_color = in_color[:3]
-        _filter = _out_color > .0031308
-        _out_color[_filter] = 1.055*_out_color[_filter]**(1/2.4)-.055
-        _out_color[~_filter] = _out_color[~_filter]*12.92
-        return np.append(_out_color, in_color[3])
+        _rgb = in_color[..., :3]
+        _out_color = np.where(
+            _rgb > .0031308,
+            1.055*np.maximum(_rgb, .0031308)**(1/2.4)-.055, _rgb*12.92)
+        return cls._with_alpha(in_color, *np.moveaxis(_out_color, -1, 0))
 
     @classmethod
     def xyz_to_linear(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert XYZ to linear."""
-        _out_color = cls.xyz_to_linear_matrix @ in_color[:3].reshape((3, 1))
-        return np.append(_out_color.reshape((3,)), in_color[3])
-    
+        return cls._transform(in_color, cls.xyz_to_linear_matrix)
+
     @classmethod
     def srgb_to_hsl(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert sRGB to HSL."""
-        _min = np.min(in_color[:3])
-        _max = np.max(in_color[:3])
+        _min = np.min(in_color[..., :3], axis=-1)
+        _max = np.max(in_color[..., :3], axis=-1)
         _luminance = .5*(_min+_max)
         _delta = _max-_min
-        _saturation = 0 if _delta==0 else _delta/(1-abs(2*_luminance-1))
-        if _delta == 0:
-            _hue = 0
-        elif _max == in_color[0]:
-            _hue = (((in_color[1]-in_color[2])/_delta)%6)/6
-        elif _max == in_color[1]:
-            _hue = ((in_color[2]-in_color[0])/_delta+2)/6
-        elif _max == in_color[2]:
-            _hue = ((in_color[0]-in_color[1])/_delta+4)/6
-        _out = [_hue%1, _saturation, _luminance]
-        return np.append(_out, in_color[3])
-    
+        _divisor = 1-np.abs(2*_luminance-1)
+        _saturation = np.where(_delta == 0, 0,
+                               _delta/np.where(_divisor == 0, 1, _divisor))
+        return cls._with_alpha(in_color, cls._get_hue(in_color, _max, _delta),
+                               _saturation, _luminance)
+
     @classmethod
     def hsl_to_srgb(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert HSL to sRGB."""
-        _delta = in_color[1]*(1-abs(2*in_color[2]-1))
-        _x = _delta*(1-abs(((6*in_color[0])%2)-1))
-        _min = in_color[2]-_delta*.5
-        _sextant = int(np.floor(in_color[0]*6))
-        if _sextant == 0:
-            _out_color = np.array([_delta, _x, 0]) + _min
-        elif _sextant == 1:
-            _out_color = np.array([_x, _delta, 0]) + _min
-        elif _sextant == 2:
-            _out_color = np.array([0, _delta, _x]) + _min
-        elif _sextant == 3:
-            _out_color = np.array([0, _x, _delta]) + _min
-        elif _sextant == 4:
-            _out_color = np.array([_x, 0, _delta]) + _min
-        else:
-            _out_color = np.array([_delta, 0, _x]) + _min
-        return np.append(_out_color, in_color[3])
+        _delta = in_color[..., 1]*(1-np.abs(2*in_color[..., 2]-1))
+        return cls._from_hue(in_color, _delta, in_color[..., 2]-_delta*.5)
 
     @classmethod
     def srgb_to_hsv(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert sRGB to HSV."""
-        _min = np.min(in_color[:3])
-        _value = np.max(in_color[:3])
+        _min = np.min(in_color[..., :3], axis=-1)
+        _value = np.max(in_color[..., :3], axis=-1)
         _delta = _value-_min
-        _saturation = 0 if _value==0 else _delta/_value
-        if _delta == 0:
-            _hue = 0
-        elif _value == in_color[0]:
-            _hue = (((in_color[1]-in_color[2])/_delta)%6)/6
-        elif _value == in_color[1]:
-            _hue = ((in_color[2]-in_color[0])/_delta+2)/6
-        elif _value == in_color[2]:
-            _hue = ((in_color[0]-in_color[1])/_delta+4)/6
-        _out = [_hue%1, _saturation, _value]
-        return np.append(_out, in_color[3])
-    
+        _saturation = np.where(_value == 0, 0,
+                               _delta/np.where(_value == 0, 1, _value))
+        return cls._with_alpha(in_color,
+                               cls._get_hue(in_color, _value, _delta),
+                               _saturation, _value)
+
     @classmethod
     def hsv_to_srgb(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert HSV to sRGB."""
-        _delta = in_color[1]*in_color[2]
-        _x = _delta*(1-abs(((6*in_color[0])%2)-1))
-        _min = in_color[2]-_delta
-        _sextant = int(np.floor(in_color[0]*6))
-        if _sextant == 0:
-            _out_color = np.array([_delta, _x, 0]) + _min
-        elif _sextant == 1:
-            _out_color = np.array([_x, _delta, 0]) + _min
-        elif _sextant == 2:
-            _out_color = np.array([0, _delta, _x]) + _min
-        elif _sextant == 3:
-            _out_color = np.array([0, _x, _delta]) + _min
-        elif _sextant == 4:
-            _out_color = np.array([_x, 0, _delta]) + _min
-        else:
-            _out_color = np.array([_delta, 0, _x]) + _min
-        return np.append(_out_color, in_color[3])
+        _delta = in_color[..., 1]*in_color[..., 2]
+        return cls._from_hue(in_color, _delta, in_color[..., 2]-_delta)
 
     @classmethod
     def oklab_to_oklch(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert okLab to okLch."""
-        _chroma = np.sqrt(in_color[1]**2 + in_color[2]**2)
-        _hue = (np.atan2(in_color[2], in_color[1])/(2*np.pi)) % 1
-        return np.array([in_color[0], _chroma, _hue, in_color[3]])
+        _chroma = np.hypot(in_color[..., 1], in_color[..., 2])
+        _hue = (np.arctan2(in_color[..., 2],
+                           in_color[..., 1])/(2*np.pi)) % 1
+        return cls._with_alpha(in_color, in_color[..., 0], _chroma, _hue)
 
     @classmethod
     def oklch_to_oklab(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert okLch to okLab."""
-        _a = in_color[1] * np.cos(in_color[2]*2*np.pi)
-        _b = in_color[1] * np.sin(in_color[2]*2*np.pi)
-        return np.array([in_color[0], _a, _b, in_color[3]])
+        _a = in_color[..., 1] * np.cos(in_color[..., 2]*2*np.pi)
+        _b = in_color[..., 1] * np.sin(in_color[..., 2]*2*np.pi)
+        return cls._with_alpha(in_color, in_color[..., 0], _a, _b)
 
     @classmethod
     def oklab_to_linear(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert okLab to linear."""
-        _lms = cls.oklab_to_lms_matrix @ in_color[:3].reshape((3, 1))
-        _lms = _lms ** 3
-        _out_color = cls.lms_to_linear_matrix @ _lms
-        return np.append(_out_color.reshape((3,)), in_color[3])
-    
+        _lms = cls._transform(in_color, cls.oklab_to_lms_matrix)
+        _lms[..., :3] **= 3
+        return cls._transform(_lms, cls.lms_to_linear_matrix)
+
     @classmethod
     def linear_to_oklab(cls, in_color: np.ndarray) -> np.ndarray:
         """Convert linear to okLab."""
-        _lms = cls.linear_to_lms_matrix @ in_color[:3].reshape((3, 1))
-        _lms = _lms ** (1/3)
-        _out_color = cls.lms_to_oklab_matrix @ _lms
-        return np.append(_out_color.reshape((3,)), in_color[3])
\ No newline at end of file
+        _lms = cls._transform(in_color, cls.linear_to_lms_matrix)
+        _lms[..., :3] = np.cbrt(_lms[..., :3])
+        return cls._transform(_lms, cls.lms_to_oklab_matrix)
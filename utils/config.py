@@ -13,8 +13,12 @@ from configparser import ConfigParser
 class Config():
     """Holds the configuration."""
 
+    _sections: dict[str, dict[str, str]] = dict()
+
     @classmethod
     def load(cls, config: ConfigParser):
+        cls._sections = {_section: dict(config[_section])
+                         for _section in config.sections()}
         cls.store(config, "app", "title", str)
         cls.store(config, "app", "icon", str)
         cls.store(config, "app", "version_major", int)
@@ -38,6 +42,8 @@ class Config():
         cls.store(config, "viewer", "fit_padding", float)
         cls.store(config, "viewer", "zoom_around_cursor", bool)
         cls.store(config, "viewer", "zoom_sensitivity", float)
+        cls.store(config, "viewer", "refine_delay", int)
+        cls.store(config, "viewer", "draft_resolution", float)
         
         cls.store(config, "sequence", "default_title", str)
         cls.store(config, "sequence", "default_width", int)
@@ -69,6 +75,19 @@ class Config():
         cls.store(config, "input", "padding", str)
 
         cls.store(config, "render", "anti_aliasing_samples", int)
+        cls.store(config, "render", "texture_pool_size", int)
+        cls.store(config, "render", "readback_depth", int)
+        cls.store(config, "render", "profiling", bool)
+        cls.store(config, "render", "profiling_history", int)
+        cls.store(config, "render", "gpu_tracking", bool)
+        cls.store(config, "render", "gpu_tracking_strict", bool)
+
+        cls.store(config, "cache", "frame_cache_budget", int)
+        cls.store(config, "cache", "frame_cache_storage", str)
+
+        cls.store(config, "trace", "enabled", bool)
+        cls.store(config, "trace", "output", str)
+        cls.store(config, "trace", "max_events", int)
     
     @classmethod
     def store(cls,
@@ -86,4 +105,9 @@ class Config():
             func = config.getboolean
         elif type is float:
             func = config.getfloat
-        setattr(getattr(cls, section), name, func(section, name))
\ No newline at end of file
+        setattr(getattr(cls, section), name, func(section, name))
+
+    @classmethod
+    def get_sections(cls) -> dict[str, dict[str, str]]:
+        """Return the raw loaded values, such as to load them again."""
+        return cls._sections
\ No newline at end of file
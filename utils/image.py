@@ -1,18 +1,25 @@
 """
-Represents an RGBA float32 image.
+Represents an RGBA image.
 
-The Image class represents an RGBA float32 image, and stores
-its pixel data along with information such as dimensions.
+The Image class represents an RGBA image, and stores its pixel
+data along with information such as dimensions. Pixels are
+float32 by default, but may also be float16, or 8-bit values
+from 0 to 255.
 """
 
+from pathlib import Path
+import struct
+import zlib
+
 import numpy as np
 
 
 class Image:
-    """Represents an RGBA float32 image."""
+    """Represents an RGBA image."""
 
     _width: int
     _height: int
+    _dtype: np.dtype
     _data_bytes: bytes
     _data_array: np.ndarray
 
@@ -20,13 +27,17 @@ class Image:
                  width: int,
                  height: int,
                  data_bytes: bytes = None,
-                 data_array: np.ndarray = None):
+                 data_array: np.ndarray = None,
+                 dtype: type = np.float32):
         self._width = width
         self._height = height
         self._data_bytes = data_bytes
         self._data_array = data_array
+        if data_array is not None:
+            dtype = data_array.dtype
+        self._dtype = np.dtype(dtype)
         if data_array is None and data_bytes is None:
-            data_array = np.zeros((height, width, 4), dtype=np.float32)
+            self._data_array = np.zeros((height, width, 4), dtype=dtype)
 
     def get_width(self) -> int:
         """Return the image width."""
@@ -36,6 +47,10 @@ class Image:
         """Return the image height."""
         return self._height
 
+    def get_dtype(self) -> np.dtype:
+        """Return the numpy data type of the pixels."""
+        return self._dtype
+
     def get_data_bytes(self) -> bytes:
         """Return the image data in bytes."""
         if self._data_bytes is None:
@@ -46,6 +61,43 @@ class Image:
         """Return the image data as a numpy array."""
         if self._data_array is None:
             self._data_array = np.frombuffer(
-                self._data_bytes, dtype=np.float32).reshape(
+                self._data_bytes, dtype=self._dtype).reshape(
                     (self._height, self._width, 4))
         return self._data_array
+
+    def save_png(self, path: Path, flip_vertically: bool = False):
+        """Save the image as an 8-bit RGBA PNG file.
+
+        Values are clipped between 0 and 1, and are written as they
+        are, so the image should already be in a display color space.
+        8-bit images are written without conversion.
+        """
+        _array = self.get_data_array()
+        if flip_vertically:
+            _array = _array[::-1]
+        if self._dtype == np.uint8:
+            _pixels = _array
+        else:
+            _pixels = np.clip(np.round(_array.astype(np.float32) * 255),
+                              0, 255).astype(np.uint8)
+
+        # Each scanline starts with a filter type byte, 0 for none.
+        _scanlines = np.zeros((self._height, 1 + self._width*4),
+                              dtype=np.uint8)
+        _scanlines[:, 1:] = _pixels.reshape((self._height, self._width*4))
+
+        _header = struct.pack(">IIBBBBB", self._width, self._height,
+                              8, 6, 0, 0, 0)
+        with open(path, "wb") as _file:
+            _file.write(b"\x89PNG\r\n\x1a\n")
+            _file.write(self._png_chunk(b"IHDR", _header))
+            _file.write(self._png_chunk(
+                b"IDAT", zlib.compress(_scanlines.tobytes(), 6)))
+            _file.write(self._png_chunk(b"IEND", b""))
+
+    @staticmethod
+    def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+        """Return a PNG chunk with its length and checksum."""
+        _checksum = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF
+        return b"".join([struct.pack(">I", len(data)), chunk_type, data,
+                         struct.pack(">I", _checksum)])
@@ -7,13 +7,16 @@ to interpolate between values in various ways.
 
 import numpy as np
 
+from data_types.data_type import DataType
+
 
 class Interpolate:
     """Utilitary functions for interpolation.
 
     The handled data type can be anything, as long as
     it supports the additive binary operation +, and
-    scalar multiplication * by a float number.
+    scalar multiplication * by a float number. DataType
+    values are combined at once, into a single instance.
     """
 
     @staticmethod
@@ -24,6 +27,8 @@ class Interpolate:
         using interpolation factor 0 < t < 1.
         """
         _t = min(max(0, t), 1)
+        if isinstance(a, DataType):
+            return a.lerp(b, _t)
         return a*(1-_t) + b*_t
 
     @staticmethod
@@ -35,6 +40,10 @@ class Interpolate:
         using interpolation factor 0 < t < 1.
         """
         _t = min(max(0, t), 1)
+        if isinstance(v0, DataType):
+            return v0.weighted_sum((v0, v1, v2, v3),
+                                   ((1-_t)**3, 3*_t*(1-_t)**2,
+                                    3*_t**2*(1-_t), _t**3))
         return (v0*(1-_t)**3 + v1*(3*_t*(1-_t)**2)
                 + v2*(3*_t**2*(1-_t)) + v3*_t**3)
 
@@ -2,16 +2,24 @@
 
 from typing import Callable, Any
 
+from utils.trace import Trace
+
 
 class Notification:
     """A basic callback class for connecting signals to functions."""
 
     _blocked: bool
     _callbacks: list[Callable]
+    _name: str
 
     def __init__(self):
         self._callbacks = []
         self._blocked = False
+        self._name = None
+
+    def __set_name__(self, owner: type, name: str):
+        """Name the notifications declared as class attributes."""
+        self._name = f"{owner.__name__}.{name}"
 
     def connect(self, callback: Callable):
         """Connect this notification to a callback function."""
@@ -25,5 +33,12 @@ class Notification:
         """Emit the notification and execute callbacks."""
         if self._blocked:
             return
+        if Trace.is_enabled():
+            for _callback in self._callbacks:
+                with Trace.span(getattr(_callback, "__qualname__",
+                                        repr(_callback)),
+                                "signal", signal=self._name):
+                    _callback(*values)
+            return
         for _callback in self._callbacks:
             _callback(*values)
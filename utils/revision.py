@@ -0,0 +1,22 @@
+"""
+Utilitary class for generating revision numbers.
+
+The Revision class hands out strictly increasing numbers, shared
+across the whole app. An object stamped with a new revision each
+time it is modified can therefore be compared with any other one,
+and the maximum revision of a group of objects only grows when one
+of them is modified.
+"""
+
+import itertools
+
+
+class Revision:
+    """Utilitary class for generating revision numbers."""
+
+    _counter: itertools.count = itertools.count(1)
+
+    @classmethod
+    def next(cls) -> int:
+        """Return a new revision number."""
+        return next(cls._counter)
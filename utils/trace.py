@@ -0,0 +1,206 @@
+"""
+Timeline tracing of the activity of the app.
+
+The Trace class records spans of time, such as the stages of a render
+or the handling of a GUI signal, along with the thread they ran on,
+and writes them to a file in the Chrome trace event format, which
+Perfetto and chrome://tracing display as a timeline. Tracing is
+enabled by the 'trace' section of the configuration, or by the
+SCIMOTION_TRACE environment variable, set to 1 or to the path of the
+trace file. When tracing is disabled, a span only costs a check.
+"""
+
+from typing import Callable, ContextManager, Any
+from contextlib import nullcontext
+from collections import deque
+from pathlib import Path
+import multiprocessing
+import functools
+import threading
+import atexit
+import json
+import time
+import os
+
+from utils.config import Config
+
+
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    """A span of time, recorded when exited."""
+
+    _name: str
+    _category: str
+    _args: dict[str, Any]
+    _start: int
+
+    def __init__(self, name: str, category: str, args: dict[str, Any]):
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *_exception_info):
+        Trace.record(self._name, self._category, self._start,
+                     time.perf_counter_ns() - self._start, self._args)
+
+
+class Trace:
+    """Timeline tracing of the activity of the app."""
+
+    ENVIRONMENT_VARIABLE: str = "SCIMOTION_TRACE"
+
+    _enabled: bool = None
+    _path: Path = None
+    _events: deque = None
+    # deque(tuple[name, category, thread_id, start_ns, duration_ns,
+    #             args]), the duration being None for instant events
+    _thread_names: dict[int, str] = dict()
+    _exit_registered: bool = False
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Return whether spans are recorded.
+
+        Tracing stays disabled until the configuration is loaded,
+        unless it is enabled by the environment variable.
+        """
+        if cls._enabled is None:
+            _value = os.environ.get(cls.ENVIRONMENT_VARIABLE)
+            if _value is None:
+                if not hasattr(Config, "trace"):
+                    return False
+                cls.set_enabled(Config.trace.enabled)
+            elif _value.strip() in ("", "0", "1"):
+                cls.set_enabled(_value.strip() == "1")
+            else:
+                cls.set_enabled(True, _value)
+        return cls._enabled
+
+    @classmethod
+    def set_enabled(cls, enabled: bool = True, path: str = None):
+        """Enable or disable tracing.
+
+        Recorded events are written at exit, to the given path or to
+        the one of the configuration. Each child process writes its
+        own file, whose name ends with the process id.
+        """
+        if path is not None:
+            cls._path = Path(path)
+        if enabled:
+            if cls._events is None:
+                cls._events = deque(maxlen=Config.trace.max_events)
+            if not cls._exit_registered:
+                atexit.register(cls.write)
+                cls._exit_registered = True
+        cls._enabled = enabled
+
+    @classmethod
+    def span(cls,
+             name: str,
+             category: str = "app",
+             **args: Any) -> ContextManager:
+        """Return a context manager recording a span of time.
+
+        The keyword arguments are shown along with the span, and
+        should be cheap to compute, as they are given even when
+        tracing is disabled.
+        """
+        if not cls.is_enabled():
+            return _NO_SPAN
+        return _Span(name, category, args)
+
+    @classmethod
+    def traced(cls, category: str = "app") -> Callable:
+        """Return a decorator recording each call of a function.
+
+        The span is named after the qualified name of the function.
+        """
+        def _decorator(function: Callable) -> Callable:
+            _name = function.__qualname__
+
+            @functools.wraps(function)
+            def _wrapper(*args, **kwargs):
+                if not cls.is_enabled():
+                    return function(*args, **kwargs)
+                _start = time.perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    cls.record(_name, category, _start,
+                               time.perf_counter_ns() - _start)
+            return _wrapper
+        return _decorator
+
+    @classmethod
+    def instant(cls, name: str, category: str = "app", **args: Any):
+        """Record an event without duration, such as a cache miss."""
+        if cls.is_enabled():
+            cls.record(name, category, time.perf_counter_ns(), None, args)
+
+    @classmethod
+    def record(cls,
+               name: str,
+               category: str,
+               start: int,
+               duration: int,
+               args: dict[str, Any] = None):
+        """Record an event of the calling thread, times in nanoseconds."""
+        _thread_id = threading.get_ident()
+        if _thread_id not in cls._thread_names:
+            cls._thread_names[_thread_id] = threading.current_thread().name
+        cls._events.append((name, category, _thread_id, start, duration,
+                            args))
+
+    @classmethod
+    def get_path(cls) -> Path:
+        """Return the path of the trace file of this process."""
+        _path = cls._path
+        if _path is None:
+            _path = Path(Config.trace.output)
+        if multiprocessing.parent_process() is not None:
+            _path = _path.with_name(
+                f"{_path.stem}.{os.getpid()}{_path.suffix}")
+        return _path
+
+    @classmethod
+    def write(cls, path: Path = None):
+        """Write the recorded events to a Chrome trace event file.
+
+        Timestamps come from a monotonic clock shared by processes,
+        such that the files of several processes can be merged.
+        """
+        if not cls._events:
+            return
+        _process_id = os.getpid()
+        _trace_events = [{"name": "process_name", "ph": "M",
+                          "pid": _process_id, "tid": 0,
+                          "args": {"name": multiprocessing
+                                   .current_process().name}}]
+        for _thread_id, _thread_name in list(cls._thread_names.items()):
+            _trace_events.append({"name": "thread_name", "ph": "M",
+                                  "pid": _process_id, "tid": _thread_id,
+                                  "args": {"name": _thread_name}})
+        for (_name, _category, _thread_id, _start, _duration,
+             _args) in list(cls._events):
+            _event = {"name": _name, "cat": _category,
+                      "pid": _process_id, "tid": _thread_id,
+                      "ts": _start/1000}
+            if _duration is None:
+                _event["ph"] = "i"
+                _event["s"] = "t"
+            else:
+                _event["ph"] = "X"
+                _event["dur"] = _duration/1000
+            if _args:
+                _event["args"] = _args
+            _trace_events.append(_event)
+        _path = cls.get_path() if path is None else Path(path)
+        with open(_path, "w") as _file:
+            json.dump({"traceEvents": _trace_events,
+                       "displayTimeUnit": "ms"}, _file, default=str)
+        print(f"Wrote {len(_trace_events)} trace events to '{_path}'")